@@ -15,12 +15,13 @@ import functools
 import logging
 import re
 
-from oslo_utils import strutils
-
 from cinderclient._i18n import _
+from cinderclient import cache
 from cinderclient import exceptions
 from cinderclient import utils
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+
 LOG = logging.getLogger(__name__)
 
 
@@ -30,6 +31,9 @@ MAX_VERSION = "3.71"
 MIN_VERSION = "3.0"
 
 _SUBSTITUTIONS = {}
+# NOTE: maps (method name, major, minor) to the VersionedMethod wraps() calls
+# for that version, and is emptied whenever a substitution is added.
+_RESOLVED_SUBSTITUTIONS = {}
 
 _type_error_msg = "'%(other)s' should be an instance of '%(cls)s'"
 
@@ -46,21 +50,8 @@ class APIVersion(object):
         self.ver_minor = 0
 
         if version_str is not None:
-            match = re.match(r"^([1-9]\d*)\.([1-9]\d*|0|latest)$", version_str)
-            if match:
-                self.ver_major = int(match.group(1))
-                if match.group(2) == "latest":
-                    # NOTE(andreykurilin): Infinity allows to easily determine
-                    # latest version and doesn't require any additional checks
-                    # in comparison methods.
-                    self.ver_minor = float("inf")
-                else:
-                    self.ver_minor = int(match.group(2))
-            else:
-                msg = (_("Invalid format of client version '%s'. "
-                       "Expected format 'X.Y', where X is a major part and Y "
-                       "is a minor part of version.") % version_str)
-                raise exceptions.UnsupportedVersion(msg)
+            self.ver_major, self.ver_minor = _parse_version_string(
+                version_str)
 
     def __str__(self):
         """Debug/Logging representation of object."""
@@ -161,6 +152,27 @@ class APIVersion(object):
         return "%s" % self.ver_major
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_version_string(version_str):
+    """Return the (major, minor) parts of a version string.
+
+    The result is cached as the same few strings are parsed over and over,
+    by the wraps() decorators, by matches() and by shell arguments.
+    """
+    match = re.match(r"^([1-9]\d*)\.([1-9]\d*|0|latest)$", version_str)
+    if not match:
+        msg = (_("Invalid format of client version '%s'. "
+               "Expected format 'X.Y', where X is a major part and Y "
+               "is a minor part of version.") % version_str)
+        raise exceptions.UnsupportedVersion(msg)
+    if match.group(2) == "latest":
+        # NOTE(andreykurilin): Infinity allows to easily determine
+        # latest version and doesn't require any additional checks
+        # in comparison methods.
+        return int(match.group(1)), float("inf")
+    return int(match.group(1)), int(match.group(2))
+
+
 class VersionedMethod(object):
 
     def __init__(self, name, start_version, end_version, func):
@@ -233,6 +245,13 @@ def get_api_version(version_string):
 
 
 def _get_server_version_range(client):
+    version_cache = getattr(client, 'version_cache', None)
+    if not isinstance(version_cache, cache.VersionCache):
+        version_cache = None
+    cached = version_cache and version_cache.get()
+    if cached:
+        return APIVersion(cached[0]), APIVersion(cached[1])
+
     try:
         versions = client.services.server_api_version()
     except AttributeError:
@@ -250,6 +269,8 @@ def _get_server_version_range(client):
 
     for version in versions:
         if '3.' in version.version:
+            if version_cache:
+                version_cache.set(version.min_version, version.version)
             return APIVersion(version.min_version), APIVersion(version.version)
 
     # if we're still here, there's nothing we understand in the versions
@@ -384,6 +405,7 @@ def update_headers(headers, api_version):
 def add_substitution(versioned_method):
     _SUBSTITUTIONS.setdefault(versioned_method.name, [])
     _SUBSTITUTIONS[versioned_method.name].append(versioned_method)
+    _RESOLVED_SUBSTITUTIONS.clear()
 
 
 def get_substitutions(func_name, api_version=None):
@@ -394,6 +416,25 @@ def get_substitutions(func_name, api_version=None):
     return substitutions
 
 
+def get_substitution(func_name, api_version):
+    """Return the VersionedMethod to call for a version, or None.
+
+    This is the substitution with the highest start version among those
+    matching ``api_version``; it is resolved once per method and version.
+    """
+    key = (func_name, 0, 0)
+    if api_version:
+        key = (func_name, api_version.ver_major, api_version.ver_minor)
+    try:
+        return _RESOLVED_SUBSTITUTIONS[key]
+    except KeyError:
+        pass
+    methods = get_substitutions(func_name, api_version)
+    method = max(methods, key=lambda f: f.start_version) if methods else None
+    _RESOLVED_SUBSTITUTIONS[key] = method
+    return method
+
+
 def wraps(start_version, end_version=None):
     start_version = APIVersion(start_version)
     if end_version:
@@ -410,14 +451,12 @@ def wraps(start_version, end_version=None):
 
         @functools.wraps(func)
         def substitution(obj, *args, **kwargs):
-            methods = get_substitutions(name, obj.api_version)
+            method = get_substitution(name, obj.api_version)
 
-            if not methods:
+            if method is None:
                 raise exceptions.VersionNotFoundForAPIMethod(
                     obj.api_version.get_string(), name)
 
-            method = max(methods, key=lambda f: f.start_version)
-
             return method.func(obj, *args, **kwargs)
 
         if hasattr(func, 'arguments'):
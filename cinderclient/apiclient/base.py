@@ -25,13 +25,14 @@ import abc
 import copy
 
 from oslo_utils import encodeutils
-from oslo_utils import strutils
 from requests import Response
 
 
 from cinderclient.apiclient import exceptions
 from cinderclient import utils
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+
 
 def getid(obj):
     """Return id if argument is a Resource.
@@ -403,6 +404,10 @@ class Extension(HookableMixin):
         return "<Extension '%s'>" % self.name
 
 
+class SharedRequestIds(list):
+    """Request ids shared by all the resources of a listing page."""
+
+
 class RequestIdMixin(object):
     """Wrapper class to expose x-openstack-request-id to the caller."""
     def setup(self):
@@ -429,6 +434,9 @@ class RequestIdMixin(object):
             self._append_request_id(resp)
 
     def _append_request_id(self, resp):
+        if isinstance(self.x_openstack_request_ids, SharedRequestIds):
+            # Shared with the other resources of a page, copy on write.
+            self.x_openstack_request_ids = list(self.x_openstack_request_ids)
         if isinstance(resp, Response):
             # Extract 'x-openstack-request-id' from headers if
             # response is a Response object.
@@ -447,27 +455,43 @@ class Resource(RequestIdMixin):
 
     HUMAN_ID = False
     NAME_ATTR = 'name'
+    # NOTE: compact resources keep their attributes in _info only, instead
+    # of also copying them into __dict__.
+    _compact = False
 
-    def __init__(self, manager, info, loaded=False, resp=None):
+    def __init__(self, manager, info, loaded=False, resp=None,
+                 compact=False, request_ids=None):
         """Populate and bind to a manager.
 
         :param manager: BaseManager object
         :param info: dictionary representing resource attributes
         :param loaded: prevent lazy-loading if set to True
         :param resp: Response or list of Response objects
+        :param compact: store the attributes in ``info`` only, which halves
+                        the memory used by large listings
+        :param request_ids: :class:`SharedRequestIds` to reference instead
+                            of allocating a new list
         """
         self.manager = manager
         self._info = info
+        if compact:
+            self._compact = True
         self._add_details(info)
         self._loaded = loaded
         if resp and hasattr(resp, "headers"):
             self._checksum = resp.headers.get("Etag")
-        self.setup()
+        if request_ids is not None:
+            self.x_openstack_request_ids = request_ids
+        else:
+            self.setup()
         self.append_request_ids(resp)
 
     def __repr__(self):
+        keys = self.__dict__.keys()
+        if self._compact:
+            keys = set(keys).union(self._info)
         reprkeys = sorted(k
-                          for k in self.__dict__.keys()
+                          for k in keys
                           if k[0] != '_' and
                           k not in ['manager', 'x_openstack_request_ids'])
         info = ", ".join("%s=%s" % (k, getattr(self, k)) for k in reprkeys)
@@ -477,11 +501,16 @@ class Resource(RequestIdMixin):
     def human_id(self):
         """Human-readable ID which can be used for bash completion.
         """
-        if self.NAME_ATTR in self.__dict__ and self.HUMAN_ID:
+        if self.HUMAN_ID and (self.NAME_ATTR in self.__dict__ or
+                              self._compact and self.NAME_ATTR in self._info):
             return strutils.to_slug(getattr(self, self.NAME_ATTR))
         return None
 
     def _add_details(self, info):
+        if self._compact:
+            if info is not self._info:
+                self._info.update(info)
+            return
         for (k, v) in info.items():
             try:
                 setattr(self, k, v)
@@ -493,6 +522,8 @@ class Resource(RequestIdMixin):
             self._info[k] = v
 
     def __getattr__(self, k):
+        if self._compact and k in self._info:
+            return self._info[k]
         if k not in self.__dict__ or k not in self._info:
             # NOTE(bcwaldon): disallow lazy-loading if already loaded once
             if not self.is_loaded():
@@ -19,11 +19,19 @@
 Base utilities to build API operation managers and objects on top of.
 """
 import abc
+from concurrent import futures
 import contextlib
+import copy
+import functools
 import hashlib
+import inspect
+import json
 import os
+import queue
+import threading
 
 from cinderclient.apiclient import base as common_base
+from cinderclient import cache
 from cinderclient import exceptions
 from cinderclient import utils
 
@@ -35,6 +43,14 @@ SORT_KEY_VALUES = ('id', 'status', 'size', 'availability_zone', 'name',
 SORT_MANAGEABLE_KEY_VALUES = ('size', 'reference')
 # Mapping of client keys to actual sort keys
 SORT_KEY_MAPPINGS = {'name': 'display_name'}
+# Defaults for offset-sharded parallel listings
+DEFAULT_PARALLEL_PAGE_SIZE = 1000
+DEFAULT_PARALLEL_WORKERS = 4
+# Microversion adding 'with_count' to volume, snapshot and backup listings
+WITH_COUNT_VERSION = '3.45'
+# Two matches are enough to tell a unique name from an ambiguous one.
+FIND_LIMIT = 2
+RESOURCE_FILTERS_VERSION = '3.33'
 # Additional sort keys for resources
 SORT_KEY_ADD_VALUES = {
     'backups': ('data_timestamp', ),
@@ -45,6 +61,90 @@ SORT_KEY_ADD_VALUES = {
 Resource = common_base.Resource
 
 
+class ListPage(common_base.ListWithMeta):
+    """A single page of a resource listing.
+
+    :param count: total number of resources, when requested with
+                  ``with_count``
+    :param next_url: link to the next page, if any
+    """
+
+    def __init__(self, values, resp, count=None, next_url=None):
+        super(ListPage, self).__init__(values, resp)
+        self.count = count
+        self.next_url = next_url
+
+
+class PagePrefetcher(object):
+    """Iterate over listing pages while fetching the next ones in background.
+
+    A worker thread consumes ``pages`` and keeps up to ``size`` of them
+    ready, so the requests for the next pages overlap with the processing
+    of the current one. Call :meth:`cancel` to stop the worker early.
+    """
+
+    _END = object()
+
+    def __init__(self, pages, size):
+        self._queue = queue.Queue(maxsize=max(int(size), 1))
+        self._cancelled = threading.Event()
+        self._done = False
+        # NOTE: the worker must not reference self, so that dropping the
+        # iterator cancels the prefetch through __del__.
+        self._thread = threading.Thread(
+            target=self._fetch, args=(pages, self._queue, self._cancelled),
+            daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def _fetch(cls, pages, page_queue, cancelled):
+        def put(item):
+            while not cancelled.is_set():
+                try:
+                    page_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except Exception as e:
+            put((None, e))
+            return
+        finally:
+            pages.close()
+        put((cls._END, None))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        page, error = self._queue.get()
+        if error is not None:
+            self._done = True
+            raise error
+        if page is self._END:
+            self._done = True
+            raise StopIteration
+        return page
+
+    def cancel(self):
+        """Stop fetching pages.
+
+        Pages already fetched, or being fetched, are discarded.
+        """
+        self._done = True
+        self._cancelled.set()
+
+    def __del__(self):
+        self._cancelled.set()
+
+
 def getid(obj):
     """
     Abstracts the common pattern of allowing both an object or an object's ID
@@ -53,6 +153,78 @@ def getid(obj):
     return getattr(obj, 'id', obj)
 
 
+def _get_catalog_cache(obj):
+    manager = obj if isinstance(obj, Manager) else obj.manager
+    return manager.catalog_cache if isinstance(manager, Manager) else None
+
+
+def _copy_result(result):
+    """Copy resources and lists of resources, callers may modify them."""
+    if isinstance(result, common_base.Resource):
+        # NOTE: copy.deepcopy() would copy the manager, and could trigger
+        # a lazy load through Resource.__getattr__.
+        copied = result.__class__.__new__(result.__class__)
+        copied.__dict__ = dict(
+            (key, value if key == 'manager' else copy.deepcopy(value))
+            for key, value in result.__dict__.items())
+        return copied
+    if isinstance(result, common_base.ListWithMeta):
+        copied = common_base.ListWithMeta(
+            [_copy_result(item) for item in result], None)
+        copied.append_request_ids(result.request_ids)
+        return copied
+    return copy.deepcopy(result)
+
+
+def cached(resource_type):
+    """Cache the results of a read method of a manager, per arguments.
+
+    Results are only cached when the client has a
+    :class:`cinderclient.cache.CatalogCache`, errors are never cached. Each
+    caller gets its own copy of the resources.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            catalog_cache = self.catalog_cache
+            if catalog_cache is None:
+                return func(self, *args, **kwargs)
+            # NOTE: computed first, as some methods modify their arguments.
+            api_version = self.api_version
+            if api_version is not None:
+                api_version = (api_version.ver_major, api_version.ver_minor)
+            key = (func.__name__, api_version,
+                   json.dumps([args, kwargs], sort_keys=True,
+                              default=lambda obj: str(getid(obj))))
+            hit, result = catalog_cache.get(resource_type, key)
+            if not hit:
+                result = func(self, *args, **kwargs)
+                catalog_cache.set(resource_type, key, _copy_result(result))
+                return result
+            return _copy_result(result)
+        return wrapper
+    return decorator
+
+
+def invalidates(*resource_types):
+    """Drop the cached results of resource types changed by a method.
+
+    The method can belong to a manager or to a resource.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                # NOTE: even a failed request may have changed something.
+                catalog_cache = _get_catalog_cache(self)
+                if catalog_cache is not None:
+                    catalog_cache.refresh(*resource_types)
+        return wrapper
+    return decorator
+
+
 class Manager(common_base.HookableMixin):
     """
     Managers interact with a particular type of API (servers, flavors, images,
@@ -67,72 +239,216 @@ class Manager(common_base.HookableMixin):
     def api_version(self):
         return self.api.api_version
 
+    @property
+    def name_cache(self):
+        """The :class:`cinderclient.cache.NameCache` of the client, if any."""
+        name_cache = getattr(self.api, 'name_cache', None)
+        if isinstance(name_cache, cache.NameCache) and self.resource_class:
+            return name_cache
+        return None
+
+    @property
+    def catalog_cache(self):
+        """The :class:`cinderclient.cache.CatalogCache` of the client."""
+        catalog_cache = getattr(self.api, 'catalog_cache', None)
+        if isinstance(catalog_cache, cache.CatalogCache):
+            return catalog_cache
+        return None
+
+    def _cache_names(self, resources):
+        name_cache = self.name_cache
+        if name_cache is not None:
+            name_cache.add(self.resource_class.__name__.lower(), resources,
+                           name_attr=self.resource_class.NAME_ATTR)
+
     def _list(self, url, response_key, obj_class=None, body=None,
-              limit=None, items=None):
-        resp = None
+              limit=None, items=None, fields=None, raw=False):
+        pages = self._list_pages(url, response_key, obj_class=obj_class,
+                                 body=body, limit=limit, fields=fields,
+                                 raw=raw)
+        first_page = next(pages)
         if items is None:
             items = []
-        if body:
-            resp, body = self.api.client.post(url, body=body)
-        else:
-            resp, body = self.api.client.get(url)
-
+        items.extend(first_page)
+        for page in pages:
+            items.extend(page)
+
+        result = common_base.ListWithMeta(items, None)
+        result.append_request_ids(first_page.request_ids)
+        # If we use '--with-count' to get the resource count, the result is
+        # the tuple (resources, count).
+        if first_page.count is not None:
+            return result, first_page.count
+        return result
+
+    def _list_pages(self, url, response_key, obj_class=None, body=None,
+                    limit=None, fields=None, raw=False):
+        """Iterate over the pages of a listing as they are received.
+
+        The 'next' links returned by the server are followed one page at a
+        time, so only the current page is held in memory.
+
+        :param fields: keys to keep in each record, the other ones are
+                       dropped as soon as the page is decoded
+        :param raw: return the records as dicts instead of resources
+        :returns: generator of :class:`ListPage`
+        """
         if obj_class is None:
             obj_class = self.resource_class
 
-        data = body[response_key]
-        # NOTE(ja): keystone returns values as list as {'values': [ ... ]}
-        #           unlike other services which just return the list...
-        if isinstance(data, dict):
-            try:
-                data = data['values']
-            except KeyError:
-                pass
+        remaining = int(limit) if limit else None
+        while True:
+            if body:
+                resp, resp_body = self.api.client.post(url, body=body)
+            else:
+                resp, resp_body = self.api.client.get(url)
 
-        items_new = [obj_class(self, res, loaded=True)
-                     for res in data if res]
-        if limit:
-            limit = int(limit)
-            margin = limit - len(items)
-            if margin <= len(items_new):
-                # If the limit is reached, return the items.
-                items = items + items_new[:margin]
-                if "count" in body:
-                    return common_base.ListWithMeta(items, resp), body['count']
-                else:
-                    return common_base.ListWithMeta(items, resp)
+            data = resp_body[response_key]
+            # NOTE(ja): keystone returns values as list as {'values': [ ... ]}
+            #           unlike other services which just return the list...
+            if isinstance(data, dict):
+                try:
+                    data = data['values']
+                except KeyError:
+                    pass
+
+            data = [res for res in data if res]
+            if fields is not None:
+                data = [self._project(res, fields) for res in data]
+
+            request_ids = None
+            if raw:
+                items = data
             else:
-                items = items + items_new
-        else:
-            items = items + items_new
-
-        # It is possible that the length of the list we request is longer
-        # than osapi_max_limit, so we have to retrieve multiple times to
-        # get the complete list.
-        next = None
-        link_name = response_key + '_links'
-        if link_name in body:
-            links = body[link_name]
-            if links:
-                for link in links:
-                    if 'rel' in link and 'next' == link['rel']:
-                        next = link['href']
-                        break
-            if next:
-                # As long as the 'next' link is not empty, keep requesting it
-                # till there is no more items.
-                items = self._list(next, response_key, obj_class, None,
-                                   limit, items)
-                # If we use '--with-count' to get the resource count,
-                # the _list function will return the tuple result with
-                # (resources, count).
-                # So here, we must check the items' type then to do return.
-                if isinstance(items, tuple):
-                    items = items[0]
-        if "count" in body:
-            return common_base.ListWithMeta(items, resp), body['count']
-        else:
-            return common_base.ListWithMeta(items, resp)
+                # NOTE: compact resources all reference the request ids of
+                # their page instead of holding a list each.
+                compact = getattr(self.api, 'compact_resources',
+                                  False) is True
+                if compact:
+                    request_ids = common_base.SharedRequestIds()
+                items = [obj_class(self, res, loaded=True, compact=compact,
+                                   request_ids=request_ids)
+                         for res in data]
+
+            # It is possible that the length of the list we request is longer
+            # than osapi_max_limit, so we have to retrieve multiple times to
+            # get the complete list.
+            next_url = None
+            for link in resp_body.get(response_key + '_links') or []:
+                if 'rel' in link and 'next' == link['rel']:
+                    next_url = link['href']
+                    break
+
+            if remaining is not None:
+                if remaining <= len(items):
+                    # If the limit is reached, stop requesting pages.
+                    items = items[:remaining]
+                    next_url = None
+                remaining -= len(items)
+
+            page = ListPage(items, resp, count=resp_body.get('count'),
+                            next_url=next_url)
+            if request_ids is not None:
+                request_ids.extend(page.request_ids)
+            # NOTE: don't keep the decoded body alive while the page is
+            # consumed, projected records no longer reference it.
+            del resp_body, data
+            yield page
+            if not next_url:
+                break
+            url = next_url
+            body = None
+
+    @staticmethod
+    def _project(info, fields):
+        return {key: info[key] for key in fields if key in info}
+
+    def _iter(self, url, response_key, obj_class=None, limit=None,
+              pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over the resources, or the pages, of a listing.
+
+        :param prefetch: number of pages to fetch ahead in background, see
+                         :class:`PagePrefetcher`
+        """
+        list_pages = self._list_pages(url, response_key, obj_class=obj_class,
+                                      limit=limit, fields=fields, raw=raw)
+        if prefetch:
+            list_pages = PagePrefetcher(list_pages, prefetch)
+        if pages:
+            return list_pages
+        return self._iter_items(list_pages)
+
+    def _parallel_list(self, resource_type, detailed=True, search_opts=None,
+                       sort=None, page_size=None, workers=None,
+                       with_count=False, fields=None, raw=False):
+        """List resources by fetching offset ranges concurrently.
+
+        The first page is requested with ``with_count`` to learn the total
+        number of resources, the remaining pages are then requested in
+        parallel using ``offset`` and reassembled in order. When the total
+        is not known, the 'next' links of the first page are followed
+        instead.
+
+        Since pages are requested independently, resources created or
+        deleted during the listing may be missed or returned twice; use a
+        stable ``sort`` such as ``id`` on busy clouds.
+
+        :param with_count: whether the resource supports ``with_count``
+        """
+        page_size = int(page_size or DEFAULT_PARALLEL_PAGE_SIZE)
+        workers = int(workers or DEFAULT_PARALLEL_WORKERS)
+        search_opts = dict(search_opts or {})
+        if with_count and self.api_version.matches(WITH_COUNT_VERSION):
+            search_opts['with_count'] = True
+
+        url = self._build_list_url(resource_type, detailed=detailed,
+                                   search_opts=search_opts,
+                                   limit=page_size, sort=sort)
+        pages = self._list_pages(url, resource_type, fields=fields, raw=raw)
+        first_page = next(pages)
+        items = common_base.ListWithMeta(first_page, None)
+        items.append_request_ids(first_page.request_ids)
+
+        if first_page.count is None or not first_page.next_url:
+            # Fall back to marker based paging.
+            for page in pages:
+                items.extend(page)
+                items.append_request_ids(page.request_ids)
+            return items
+        pages.close()
+
+        search_opts.pop('with_count', None)
+        # The server may cap the page size below the requested one.
+        page_size = len(first_page)
+
+        def fetch(offset):
+            url = self._build_list_url(resource_type, detailed=detailed,
+                                       search_opts=search_opts,
+                                       limit=page_size, sort=sort,
+                                       offset=offset)
+            page_pages = self._list_pages(url, resource_type, fields=fields,
+                                          raw=raw)
+            try:
+                return next(page_pages)
+            finally:
+                page_pages.close()
+
+        offsets = range(page_size, first_page.count, page_size)
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for page in executor.map(fetch, offsets):
+                items.extend(page)
+                items.append_request_ids(page.request_ids)
+        return items
+
+    @staticmethod
+    def _iter_items(pages):
+        try:
+            for page in pages:
+                for item in page:
+                    yield item
+        finally:
+            if isinstance(pages, PagePrefetcher):
+                pages.cancel()
 
     def _build_list_url(self, resource_type, detailed=True, search_opts=None,
                         marker=None, limit=None, sort=None, offset=None):
@@ -311,6 +627,13 @@ class Manager(common_base.HookableMixin):
 
     def _delete(self, url):
         resp, body = self.api.client.delete(url)
+        name_cache = self.name_cache
+        # Only a /<collection>/<id> URL deletes the resource itself, e.g. not
+        # /volumes/<id>/metadata/<key>.
+        segments = url.split('?')[0].strip('/').split('/')
+        if name_cache is not None and len(segments) == 2:
+            name_cache.discard(self.resource_class.__name__.lower(),
+                               segments[1])
         return common_base.TupleWithMeta((resp, body), resp)
 
     def _update(self, url, body, response_key=None, **kwargs):
@@ -360,6 +683,9 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
     """
     Like a `Manager`, but with additional `find()`/`findall()` methods.
     """
+    # Name of the resource in the resource filters API (3.33), the
+    # attributes the server can filter on are pushed down by findall().
+    filter_resource = None
 
     @abc.abstractmethod
     def list(self):
@@ -369,10 +695,15 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
         """
         Find a single item with attributes matching ``**kwargs``.
 
+        A lookup by name only asks the server for up to two matches when the
+        manager's ``list()`` supports ``limit``.
+
         This isn't very efficient for search options which require the
         Python side filtering(e.g. 'human_id')
         """
-        matches = self.findall(**kwargs)
+        matches = self._find_by_name(**kwargs)
+        if matches is None:
+            matches = self.findall(**kwargs)
         num_matches = len(matches)
         if num_matches == 0:
             msg = "No %s matching %s." % (self.resource_class.__name__, kwargs)
@@ -381,16 +712,45 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
             raise exceptions.NoUniqueMatch
         else:
             matches[0].append_request_ids(matches.request_ids)
+            if list(kwargs) == [self.resource_class.NAME_ATTR]:
+                # NOTE: only names proven unique are cached, listings and
+                # creates can't tell, see cinderclient.cache.NameCache.
+                self._cache_names(matches)
             return matches[0]
 
-    def findall(self, **kwargs):
-        """
-        Find all items with attributes matching ``**kwargs``.
+    def _find_by_name(self, **kwargs):
+        """Look for a name with a listing of at most ``FIND_LIMIT`` items.
 
-        This isn't very efficient for search options which require the
-        Python side filtering(e.g. 'human_id')
+        :returns: the matches, or None when the limited listing can't tell
+                  whether the name is unique and a full findall() is needed.
         """
+        if len(kwargs) != 1 or not ('name' in kwargs or
+                                    'display_name' in kwargs):
+            return None
+        if 'limit' not in inspect.signature(self.list).parameters:
+            return None
 
+        listing = self.list(search_opts=self._find_search_opts(kwargs),
+                            limit=FIND_LIMIT)
+        matches = self._filter_matches(listing, kwargs)
+        # The server filter may not be an exact match (e.g. the resource
+        # filters configured as "name~"), so a full listing is only
+        # conclusive when the client side filtering kept every item.
+        if len(listing) == FIND_LIMIT and len(matches) < FIND_LIMIT:
+            return None
+        return matches
+
+    def _get_server_filters(self):
+        if self.filter_resource is None:
+            return frozenset()
+        api_version = self.api_version
+        if (api_version is None or
+                not api_version.matches(RESOURCE_FILTERS_VERSION)):
+            return frozenset()
+        return self.api.resource_filters.get_filters(self.filter_resource)
+
+    @staticmethod
+    def _find_search_opts(kwargs):
         # Want to search for all tenants here so that when attempting to delete
         # that a user like admin doesn't get a failure when trying to delete
         # another tenant's volume by name.
@@ -402,16 +762,40 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
             search_opts['name'] = kwargs['name']
         elif 'display_name' in kwargs:
             search_opts['display_name'] = kwargs['display_name']
+        return search_opts
 
-        found = common_base.ListWithMeta([], None)
+    def findall(self, **kwargs):
+        """
+        Find all items with attributes matching ``**kwargs``.
+
+        The attributes that the server accepts as filters (see
+        :meth:`ResourceFilterManager.get_filters`) are passed as search
+        options, all of them are then matched again on the client side.
+
+        This isn't very efficient for search options which require the
+        Python side filtering(e.g. 'human_id')
+        """
         # list_volume is used for group query, it's not resource's property.
         list_volume = kwargs.pop('list_volume', False)
-        searches = kwargs.items()
+        search_opts = self._find_search_opts(kwargs)
+        server_filters = self._get_server_filters()
+        for attr, value in kwargs.items():
+            # NOTE: only scalar values are sent, the server doesn't compare
+            # booleans or structures the way Python does.
+            if (attr in server_filters and isinstance(value, (str, int))
+                    and not isinstance(value, bool)):
+                search_opts.setdefault(attr, value)
+
         if list_volume:
             listing = self.list(search_opts=search_opts,
                                 list_volume=list_volume)
         else:
             listing = self.list(search_opts=search_opts)
+        return self._filter_matches(listing, kwargs)
+
+    @staticmethod
+    def _filter_matches(listing, searches):
+        found = common_base.ListWithMeta([], None)
         found.append_request_ids(listing.request_ids)
         # Not all resources attributes support filters on server side
         # (e.g. 'human_id' doesn't), so when doing findall some client
@@ -419,7 +803,7 @@ class ManagerWithFind(Manager, metaclass=abc.ABCMeta):
         for obj in listing:
             try:
                 if all(getattr(obj, attr) == value
-                       for (attr, value) in searches):
+                       for (attr, value) in searches.items()):
                     found.append(obj)
             except AttributeError:
                 continue
@@ -0,0 +1,473 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Client side caches, persisted under ``~/.cache/cinderclient`` or kept in
+memory."""
+
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_CACHE_DIR = '~/.cache/cinderclient'
+# Seconds during which a cached name to ID mapping is used.
+DEFAULT_NAME_CACHE_TTL = 300
+# Seconds during which an identity service discovery result is reused.
+DEFAULT_DISCOVERY_CACHE_TTL = 3600
+# A cached token is only reused while it is valid at least this long.
+TOKEN_EXPIRY_MARGIN = 300
+# Seconds during which the microversions supported by an endpoint are reused.
+DEFAULT_VERSION_CACHE_TTL = 3600
+# Number of GET responses kept for revalidation.
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+# Seconds during which rarely changing resources, e.g. volume types, are
+# reused.
+DEFAULT_CATALOG_CACHE_TTL = 300
+
+
+def get_cache_dir(cache_dir=None):
+    return os.path.expanduser(
+        cache_dir or os.environ.get('CINDERCLIENT_UUID_CACHE_DIR') or
+        DEFAULT_CACHE_DIR)
+
+
+def _write_json(path, data, dir_mode=0o750):
+    """Atomically replace ``path``, errors are ignored.
+
+    The file is created readable by its owner only.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), dir_mode, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        # NOTE: a cache that can't be written must never fail a command.
+        pass
+
+
+@contextlib.contextmanager
+def _file_lock(path, dir_mode=0o750):
+    """Hold an exclusive lock on ``path``.lock, between processes.
+
+    Used around read-modify-write cycles of files shared by concurrent CLI
+    runs. Without fcntl, e.g. on Windows, or when the lock file can't be
+    created, nothing is locked.
+    """
+    lock_file = None
+    if fcntl is not None:
+        try:
+            os.makedirs(os.path.dirname(path), dir_mode, exist_ok=True)
+            lock_file = open(path + '.lock', 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except OSError:
+            # NOTE: a cache that can't be locked must never fail a command.
+            if lock_file is not None:
+                lock_file.close()
+            lock_file = None
+    try:
+        yield
+    finally:
+        if lock_file is not None:
+            # Closing the file releases the lock.
+            lock_file.close()
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def load_manifest(name, key):
+    """Return the value stored as ``name`` if it was stored with ``key``.
+
+    ``key`` must be made of JSON types, e.g. the modification times of the
+    files the value was computed from.
+    """
+    data = _read_json(os.path.join(get_cache_dir(), '%s.json' % name))
+    if data.get('key') == key:
+        return data.get('value')
+    return None
+
+
+def store_manifest(name, key, value):
+    _write_json(os.path.join(get_cache_dir(), '%s.json' % name),
+                {'key': key, 'value': value})
+
+
+class NameCache(object):
+    """Persistent index of resource names to IDs.
+
+    One file is kept per endpoint and project, the scope is a string such as
+    ``"<endpoint> <project id>"`` or a callable returning it, so that it can
+    be computed after authentication.
+
+    The index is only filled with the names that a lookup by name proved
+    unique, see :meth:`cinderclient.base.ManagerWithFind.find`, as listings
+    and creates can't tell whether other resources have the same name. An
+    entry is dropped when its resource is deleted or not found, and
+    :func:`cinderclient.utils.find_resource` validates the cached ID with a
+    GET before using it.
+    """
+
+    def __init__(self, scope, ttl=None, cache_dir=None):
+        self.scope = scope
+        self.ttl = DEFAULT_NAME_CACHE_TTL if ttl is None else ttl
+        self.cache_dir = get_cache_dir(cache_dir)
+        self._path = None
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        if self._path is None:
+            scope = self.scope() if callable(self.scope) else self.scope
+            uniqifier = hashlib.sha1(                            # nosec
+                scope.encode('utf-8')).hexdigest()
+            self._path = os.path.join(self.cache_dir,
+                                      'names-%s.json' % uniqifier)
+        return self._path
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = _read_json(self.path)
+        return self._entries
+
+    def get(self, resource_type, name):
+        """Return the cached ID of a name, or None."""
+        with self._lock:
+            entry = self._load().get(resource_type, {}).get(name)
+        if entry and time.time() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def add(self, resource_type, resources, name_attr='name'):
+        """Index the names of ``resources``, which must be unique.
+
+        Names that are seen on several of the resources are dropped.
+        """
+        ids = {}
+        for resource in resources:
+            info = getattr(resource, '_info', None) or {}
+            name = info.get(name_attr)
+            resource_id = info.get('id')
+            if not name or resource_id is None:
+                continue
+            ids.setdefault(name, set()).add(str(resource_id))
+        if not ids:
+            return
+
+        now = time.time()
+
+        def update(entries):
+            index = entries.setdefault(resource_type, {})
+            for name, name_ids in ids.items():
+                if len(name_ids) > 1:
+                    index.pop(name, None)
+                else:
+                    index[name] = [next(iter(name_ids)), now]
+            self._expire(index, now)
+            return True
+
+        self._update(update)
+
+    def discard(self, resource_type, resource_id):
+        """Drop the names cached for a resource ID."""
+        resource_id = str(resource_id)
+
+        def update(entries):
+            index = entries.get(resource_type, {})
+            names = [name for name, entry in index.items()
+                     if entry[0] == resource_id]
+            for name in names:
+                del index[name]
+            return bool(names)
+
+        self._update(update)
+
+    def clear(self):
+        def update(entries):
+            entries.clear()
+            return True
+
+        self._update(update)
+
+    def _update(self, update):
+        """Apply ``update(entries)`` to the entries on disk and save them.
+
+        The file is read again under a lock, so that the entries written by
+        concurrent processes since it was loaded are kept. ``update`` returns
+        whether anything changed.
+        """
+        with self._lock, _file_lock(self.path):
+            self._entries = _read_json(self.path)
+            if update(self._entries):
+                _write_json(self.path, self._entries)
+
+    def _expire(self, index, now):
+        for name in [name for name, entry in index.items()
+                     if now - entry[1] >= self.ttl]:
+            del index[name]
+
+
+class AuthCache(object):
+    """Identity service discovery results and tokens shared by CLI runs.
+
+    Discovery results are kept per auth URL and tokens, with their service
+    catalog, per set of auth options as identified by the auth plugin
+    ``get_cache_id()``, so a change of auth URL, user, project or password
+    never reuses a token. A token is reused until shortly before it expires.
+
+    Files live in a directory only accessible by the user and are replaced
+    atomically, so that concurrent processes never read a partial file. Files
+    that are owned by another user or accessible by others are ignored.
+    """
+
+    def __init__(self, cache_dir=None, discovery_ttl=None):
+        self.cache_dir = os.path.join(get_cache_dir(cache_dir), 'auth')
+        self.discovery_ttl = (DEFAULT_DISCOVERY_CACHE_TTL
+                              if discovery_ttl is None else discovery_ttl)
+        # Auth states read or written by this process, by path.
+        self._states = {}
+
+    def _path(self, kind, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, '%s-%s.json' % (kind, digest))
+
+    def _read(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {}
+        geteuid = getattr(os, 'geteuid', None)
+        if stat.st_mode & 0o077 or (geteuid and stat.st_uid != geteuid()):
+            return {}
+        return _read_json(path)
+
+    def _write(self, path, data):
+        _write_json(path, data, dir_mode=0o700)
+
+    def get_discovery(self, auth_url):
+        """Return the cached (v2 URL, v3 URL) of an auth URL, or None."""
+        data = self._read(self._path('discovery', auth_url))
+        if time.time() - data.get('time', 0) < self.discovery_ttl:
+            return data.get('v2'), data.get('v3')
+        return None
+
+    def set_discovery(self, auth_url, v2_auth_url, v3_auth_url):
+        self._write(self._path('discovery', auth_url),
+                    {'v2': v2_auth_url, 'v3': v3_auth_url,
+                     'time': time.time()})
+
+    def load_auth(self, auth):
+        """Install the cached token of an identity plugin.
+
+        :returns: whether a token valid for at least ``TOKEN_EXPIRY_MARGIN``
+                  seconds was installed.
+        """
+        cache_id = auth.get_cache_id()
+        if not cache_id:
+            return False
+        path = self._path('token', cache_id)
+        state = self._read(path).get('auth_state')
+        if not state:
+            return False
+        try:
+            auth.set_auth_state(state)
+        except Exception:
+            # NOTE: a corrupted cache must never fail a command.
+            auth.auth_ref = None
+        if (auth.auth_ref is None or
+                auth.auth_ref.will_expire_soon(TOKEN_EXPIRY_MARGIN)):
+            auth.auth_ref = None
+            return False
+        self._states[path] = state
+        return True
+
+    def save_auth(self, auth):
+        """Store the current token of an identity plugin, if any."""
+        cache_id = auth.get_cache_id()
+        state = cache_id and auth.get_auth_state()
+        if not state:
+            return
+        path = self._path('token', cache_id)
+        if self._states.get(path) != state:
+            self._write(path, {'auth_state': state})
+            self._states[path] = state
+
+
+class VersionCache(object):
+    """Microversion range supported by an API endpoint.
+
+    The ranges of every endpoint are kept in one file, the endpoint is a
+    string or a callable returning it. An entry should be discarded when the
+    server rejects a microversion, e.g. after it was downgraded.
+    """
+
+    def __init__(self, endpoint, ttl=None, cache_dir=None):
+        self.endpoint = endpoint
+        self.ttl = DEFAULT_VERSION_CACHE_TTL if ttl is None else ttl
+        self.path = os.path.join(get_cache_dir(cache_dir), 'versions.json')
+
+    def _get_endpoint(self):
+        return self.endpoint() if callable(self.endpoint) else self.endpoint
+
+    def get(self):
+        """Return the cached (min version, max version) strings, or None."""
+        entry = _read_json(self.path).get(self._get_endpoint())
+        if (isinstance(entry, list) and len(entry) == 3 and
+                time.time() - entry[2] < self.ttl):
+            return entry[0], entry[1]
+        return None
+
+    def set(self, min_version, max_version):
+        now = time.time()
+        with _file_lock(self.path):
+            entries = dict((endpoint, entry) for endpoint, entry
+                           in _read_json(self.path).items()
+                           if isinstance(entry, list) and len(entry) == 3 and
+                           now - entry[2] < self.ttl)
+            entries[self._get_endpoint()] = [min_version, max_version, now]
+            _write_json(self.path, entries)
+
+    def discard(self):
+        with _file_lock(self.path):
+            entries = _read_json(self.path)
+            if entries.pop(self._get_endpoint(), None) is not None:
+                _write_json(self.path, entries)
+
+
+class ResponseCache(object):
+    """Bodies of GET responses, revalidated with their ETag.
+
+    The transports key the entries by URL, microversion and project, send
+    the ETag of a cached body in ``If-None-Match`` and reuse the body when
+    the server answers ``304 Not Modified``, so a cached body is never
+    served without the server confirming it. Entries are kept in memory and
+    the least recently used ones are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = (DEFAULT_RESPONSE_CACHE_SIZE if max_entries is None
+                            else max_entries)
+        self._entries = collections.OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    def get_etag(self, key):
+        """Return the ETag of the body cached for ``key``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_body(self, key):
+        """Return a copy of the body cached for ``key``, once revalidated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._stats['hits'] += 1
+        return json.loads(entry[1])
+
+    def set(self, key, etag, body):
+        """Cache the body of a response, or forget it if it has no ETag."""
+        # NOTE: bodies are stored serialized, callers may modify theirs.
+        data = json.dumps(body) if etag else None
+        with self._lock:
+            self._stats['misses'] += 1
+            if data is None:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (etag, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Return the number of bodies reused, fetched and evicted."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+class CatalogCache(object):
+    """Results of the read methods of rarely changing resources.
+
+    Volume types, QoS specs, availability zones, extensions, resource
+    filters and pools are read once per ``ttl`` seconds by a client, see
+    :func:`cinderclient.base.cached`. The results of a resource type are
+    dropped when the client changes resources of that type, or when
+    :meth:`refresh` is called. ``ttl`` is a number of seconds, or a dict
+    mapping resource types, e.g. ``volume_types``, to seconds. Results are
+    cached per microversion, and callers get copies they may modify.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = DEFAULT_CATALOG_CACHE_TTL if ttl is None else ttl
+        self._entries = {}
+        self._stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    def get_ttl(self, resource_type):
+        if isinstance(self.ttl, dict):
+            return self.ttl.get(resource_type, DEFAULT_CATALOG_CACHE_TTL)
+        return self.ttl
+
+    def get(self, resource_type, key):
+        """Return (True, result) if a result is cached, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(resource_type, {}).get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._stats['hits'] += 1
+                return True, entry[0]
+            self._stats['misses'] += 1
+            return False, None
+
+    def set(self, resource_type, key, result):
+        expires = time.monotonic() + self.get_ttl(resource_type)
+        with self._lock:
+            self._entries.setdefault(resource_type, {})[key] = (result,
+                                                                expires)
+
+    def refresh(self, *resource_types):
+        """Drop the cached results of some resource types, or of all."""
+        with self._lock:
+            if not resource_types:
+                self._entries.clear()
+            for resource_type in resource_types:
+                self._entries.pop(resource_type, None)
+
+    def get_stats(self):
+        """Return the number of results reused and fetched."""
+        with self._lock:
+            return dict(self._stats)
@@ -16,8 +16,10 @@
 #    under the License.
 """OpenStack Client interface. Handles the REST calls and responses."""
 
+import functools
 import glob
 import hashlib
+import importlib.metadata
 import importlib.util
 import itertools
 import json
@@ -25,6 +27,8 @@ import logging
 import os
 import pkgutil
 import re
+import sys
+import threading
 from time import sleep
 import urllib
 from urllib import parse as urlparse
@@ -32,28 +36,39 @@ from urllib import parse as urlparse
 from keystoneauth1 import access
 from keystoneauth1 import adapter
 from keystoneauth1 import discover
-from keystoneauth1.identity import base
 from oslo_utils import encodeutils
 from oslo_utils import importutils
-from oslo_utils import strutils
 import requests
 
 from cinderclient._i18n import _
 from cinderclient import api_versions
+from cinderclient import cache
 from cinderclient import exceptions
 import cinderclient.extension
+from cinderclient import retry
+from cinderclient import utils
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+# NOTE: keystoneauth1.identity imports stevedore, which the client only
+# needs for the service catalog.
+identity_base = utils.lazy_import('keystoneauth1.identity.base')
 
-try:
-    osprofiler_web = importutils.try_import("osprofiler.web")
-except Exception:
-    pass
+
+# NOTE: these optional modules are slow to import, they are imported on first
+# use by _import_optional() and replace the placeholder.
+_NOT_IMPORTED = object()
+osprofiler_web = _NOT_IMPORTED
+aiohttp = _NOT_IMPORTED
 
 
 _VALID_VERSIONS = ['v3']
 V3_SERVICE_TYPE = 'volumev3'
 SERVICE_TYPES = {'3': V3_SERVICE_TYPE}
 REQ_ID_HEADER = 'X-OpenStack-Request-ID'
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_ASYNC_CONNECTION_LIMIT = 100
+EXTENSION_ENTRY_POINT_GROUP = 'cinderclient.extension'
 
 # tell keystoneclient that we can ignore the /v1|v2/{project_id} component of
 # the service catalog when doing discovery lookups
@@ -61,6 +76,16 @@ for svc in ('volume', 'volumev3'):
     discover.add_catalog_discover_hack(svc, re.compile(r'/v[12]/\w+/?$'), '/')
 
 
+def _import_optional(name, module):
+    """Import an optional module global of this module, None if missing."""
+    if globals()[name] is _NOT_IMPORTED:
+        try:
+            globals()[name] = importutils.try_import(module)
+        except Exception:
+            globals()[name] = None
+    return globals()[name]
+
+
 def get_server_version(url, insecure=False, cacert=None, cert=None):
     """Queries the server via the naked endpoint and gets version info.
 
@@ -168,8 +193,51 @@ def get_volume_api_from_url(url):
     raise exceptions.UnsupportedVersion(msg)
 
 
+def _discard_server_versions(http_client):
+    """Forget the cached microversions of a server that rejected one."""
+    if http_client.version_cache is not None:
+        http_client.version_cache.discard()
+
+
+def _send_request(http_client, url, method, **kwargs):
+    """Send a request, revalidating the cached body of a GET request.
+
+    See cinderclient.cache.ResponseCache.
+    """
+    response_cache = http_client.response_cache
+    if method != 'GET' or response_cache is None:
+        return http_client.request(url, method, **kwargs)
+    key = http_client._get_response_cache_key(url, kwargs.get('headers'))
+    etag = response_cache.get_etag(key)
+    if etag:
+        kwargs['headers'] = dict(kwargs.get('headers') or {},
+                                 **{'If-None-Match': etag})
+    resp, body = http_client.request(url, method, **kwargs)
+    if etag and resp.status_code == 304:
+        cached_body = response_cache.get_body(key)
+        if cached_body is not None:
+            return resp, cached_body
+        # The entry was evicted by another thread meanwhile.
+        del kwargs['headers']['If-None-Match']
+        resp, body = http_client.request(url, method, **kwargs)
+    response_cache.set(key, resp.headers.get('ETag'), body)
+    return resp, body
+
+
+def _wait_for_rate_limit(rate_limiter, method, url, endpoint=None):
+    """Sleep until a request is within the rate limits."""
+    delay = rate_limiter.reserve(method, url, endpoint=endpoint)
+    if delay:
+        sleep(delay)
+
+
 class SessionClient(adapter.LegacyJsonAdapter):
 
+    # Set by the v3 Client, see cinderclient.cache.VersionCache.
+    version_cache = None
+    # Set by the v3 Client, see cinderclient.cache.ResponseCache.
+    response_cache = None
+
     def __init__(self, *args, **kwargs):
         apiver = kwargs.pop('api_version', None) or api_versions.APIVersion()
         self.http_log_debug = kwargs.pop('http_log_debug', False)
@@ -178,6 +246,9 @@ class SessionClient(adapter.LegacyJsonAdapter):
         if apiver.ver_minor != 0:
             kwargs['default_microversion'] = apiver.get_string()
         self.retries = kwargs.pop('retries', 0)
+        self.retry_policy = (kwargs.pop('retry_policy', None) or
+                             retry.RetryPolicy(self.retries))
+        self.rate_limiter = kwargs.pop('rate_limiter', None)
         self._logger = logging.getLogger(__name__)
         super(SessionClient, self).__init__(*args, **kwargs)
 
@@ -207,14 +278,26 @@ class SessionClient(adapter.LegacyJsonAdapter):
         attempts = 0
         while True:
             attempts += 1
+            if self.rate_limiter is not None:
+                _wait_for_rate_limit(self.rate_limiter, method, url,
+                                     endpoint=self.get_endpoint)
             try:
-                return self.request(url, method, **kwargs)
-            except exceptions.OverLimit as overlim:
-                if attempts > self.retries or overlim.retry_after < 1:
+                return _send_request(self, url, method, **kwargs)
+            except exceptions.NotAcceptable:
+                _discard_server_versions(self)
+                raise
+            except retry.RETRYABLE_ERRORS as e:
+                delay = self.retry_policy.get_delay(method, attempts, e)
+                if delay is None:
                     raise
-                msg = "Retrying after %s seconds." % overlim.retry_after
-                self._logger.debug(msg)
-                sleep(overlim.retry_after)
+            self._logger.debug("Failed attempt(%s of %s), retrying in %.2f "
+                               "seconds", attempts, self.retries, delay)
+            sleep(delay)
+
+    def _get_response_cache_key(self, url, headers):
+        microversion = (headers or {}).get('OpenStack-API-Version',
+                                           self.default_microversion)
+        return url, microversion, self.get_project_id()
 
     def get(self, url, **kwargs):
         return self._cs_request(url, 'GET', **kwargs)
@@ -258,7 +341,7 @@ class SessionClient(adapter.LegacyJsonAdapter):
         # NOTE(jamielennox): This is ugly and should be deprecated.
         auth = self.auth or self.session.auth
 
-        if isinstance(auth, base.BaseIdentityPlugin):
+        if isinstance(auth, identity_base.BaseIdentityPlugin):
             return auth.get_access(self.session).service_catalog
 
         raise AttributeError('There is no service catalog for this type of '
@@ -283,6 +366,11 @@ class SessionClient(adapter.LegacyJsonAdapter):
 
 class HTTPClient(object):
 
+    # Set by the v3 Client, see cinderclient.cache.VersionCache.
+    version_cache = None
+    # Set by the v3 Client, see cinderclient.cache.ResponseCache.
+    response_cache = None
+
     SENSITIVE_HEADERS = ('X-Auth-Token', 'X-Subject-Token',)
     USER_AGENT = 'python-cinderclient'
 
@@ -295,7 +383,9 @@ class HTTPClient(object):
                  http_log_debug=False, cacert=None, cert=None,
                  auth_system='keystone', auth_plugin=None, api_version=None,
                  logger=None, user_domain_name='Default',
-                 project_domain_name='Default', global_request_id=None):
+                 project_domain_name='Default', global_request_id=None,
+                 pool_connections=None, pool_maxsize=None, keep_alive=True,
+                 retry_policy=None, rate_limiter=None):
         self.user = user
         self.password = password
         self.projectid = projectid
@@ -321,10 +411,16 @@ class HTTPClient(object):
         self.os_endpoint = os_endpoint.rstrip('/') \
             if os_endpoint else os_endpoint
         self.retries = int(retries or 0)
+        self.retry_policy = retry_policy or retry.RetryPolicy(self.retries)
+        self.rate_limiter = rate_limiter
         self.http_log_debug = http_log_debug
 
         self.management_url = self.os_endpoint or None
         self.auth_token = None
+        # NOTE: the client may be shared by threads, e.g. those of
+        # PagePrefetcher and parallel_list(), which must not authenticate
+        # concurrently.
+        self._auth_lock = threading.RLock()
         self.proxy_token = proxy_token
         self.proxy_tenant_id = proxy_tenant_id
         self.timeout = timeout
@@ -344,6 +440,17 @@ class HTTPClient(object):
 
         self._logger = logger or logging.getLogger(__name__)
 
+        # NOTE: keep one requests.Session per client so that the underlying
+        # urllib3 pools are reused and each call doesn't pay for a new TCP
+        # and TLS handshake.
+        self.keep_alive = keep_alive
+        self.http = requests.Session()
+        http_adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections or DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or DEFAULT_POOL_MAXSIZE)
+        self.http.mount('http://', http_adapter)
+        self.http.mount('https://', http_adapter)
+
     def _safe_header(self, name, value):
         if name in HTTPClient.SENSITIVE_HEADERS:
             encoded = value.encode('utf-8')
@@ -389,7 +496,7 @@ class HTTPClient(object):
         kwargs['headers']['User-Agent'] = self.USER_AGENT
         kwargs['headers']['Accept'] = 'application/json'
 
-        if osprofiler_web:
+        if _import_optional('osprofiler_web', 'osprofiler.web'):
             kwargs['headers'].update(osprofiler_web.get_trace_id_headers())
 
         if 'body' in kwargs:
@@ -400,10 +507,13 @@ class HTTPClient(object):
         if self.global_request_id:
             kwargs['headers'].setdefault(REQ_ID_HEADER, self.global_request_id)
 
+        if not self.keep_alive:
+            kwargs['headers']['Connection'] = 'close'
+
         if self.timeout:
             kwargs.setdefault('timeout', self.timeout)
         self.http_log_req((url, method,), kwargs)
-        resp = requests.request(
+        resp = self.http.request(
             method,
             url,
             verify=self.verify_cert,
@@ -423,62 +533,109 @@ class HTTPClient(object):
 
         return resp, body
 
+    def get_pool_stats(self):
+        """Return connection pool statistics for this client.
+
+        :returns: dict with the number of ``requests`` sent, the number of
+                  ``handshakes`` (new connections) performed, the
+                  ``reuse_ratio`` of requests served by an already open
+                  connection and the number of ``open_connections`` kept in
+                  the pools.
+        """
+        num_requests = 0
+        num_connections = 0
+        open_connections = 0
+        for http_adapter in set(self.http.adapters.values()):
+            pools = http_adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+                if pool.pool is not None:
+                    open_connections += sum(
+                        1 for conn in list(pool.pool.queue)
+                        if getattr(conn, 'sock', None) is not None)
+
+        reuse_ratio = 0.0
+        if num_requests:
+            reuse_ratio = float(num_requests - num_connections) / num_requests
+        return {'requests': num_requests,
+                'handshakes': num_connections,
+                'reuse_ratio': max(reuse_ratio, 0.0),
+                'open_connections': open_connections}
+
+    def close(self):
+        """Close all pooled connections held by this client."""
+        self.http.close()
+
     def _cs_request(self, url, method, **kwargs):
         auth_attempts = 0
         attempts = 0
-        backoff = 1
+        # The rate limits apply to the URL relative to the endpoint.
+        path = url
         while True:
             attempts += 1
-            if not self.management_url or not self.auth_token:
-                self.authenticate()
-            kwargs.setdefault('headers', {})['X-Auth-Token'] = self.auth_token
+            if self.rate_limiter is not None:
+                _wait_for_rate_limit(self.rate_limiter, method, path,
+                                     endpoint=self.management_url)
+            management_url, auth_token = self._get_credentials()
+            kwargs.setdefault('headers', {})['X-Auth-Token'] = auth_token
             if self.projectid:
                 kwargs['headers']['X-Auth-Project-Id'] = self.projectid
             try:
-                if not url.startswith(self.management_url):
-                    url = self.management_url + url
-                resp, body = self.request(url, method, **kwargs)
+                if not url.startswith(management_url):
+                    url = management_url + url
+                resp, body = _send_request(self, url, method, **kwargs)
                 return resp, body
-            except exceptions.BadRequest:
-                if attempts > self.retries:
-                    raise
+            except exceptions.NotAcceptable:
+                _discard_server_versions(self)
+                raise
             except exceptions.Unauthorized:
                 if auth_attempts > 0:
                     raise
                 self._logger.debug("Unauthorized, reauthenticating.")
-                self.management_url = self.auth_token = None
+                self._discard_token(auth_token)
                 # First reauth. Discount this attempt.
                 attempts -= 1
                 auth_attempts += 1
                 continue
-            except exceptions.OverLimit as overlim:
-                if attempts > self.retries or overlim.retry_after < 1:
-                    raise
-                msg = "Retrying after %s seconds." % overlim.retry_after
-                self._logger.debug(msg)
-                sleep(overlim.retry_after)
-                continue
-            except exceptions.ClientException as e:
-                if attempts > self.retries:
-                    raise
-                if 500 <= e.code <= 599:
-                    pass
-                else:
-                    raise
             except requests.exceptions.ConnectionError as e:
                 self._logger.debug("Connection error: %s" % e)
-                if attempts > self.retries:
+                delay = self.retry_policy.get_delay(method, attempts, e)
+                if delay is None:
                     msg = 'Unable to establish connection: %s' % e
                     raise exceptions.ConnectionError(msg)
-            except requests.exceptions.Timeout as e:
-                self._logger.debug("Timeout error: %s" % e)
-                if attempts > self.retries:
+            except retry.RETRYABLE_ERRORS as e:
+                delay = self.retry_policy.get_delay(method, attempts, e)
+                if delay is None:
                     raise
             self._logger.debug(
-                "Failed attempt(%s of %s), retrying in %s seconds" %
-                (attempts, self.retries, backoff))
-            sleep(backoff)
-            backoff *= 2
+                "Failed attempt(%s of %s), retrying in %.2f seconds" %
+                (attempts, self.retries, delay))
+            sleep(delay)
+
+    def _get_credentials(self):
+        """Return the management URL and token, authenticating if needed."""
+        with self._auth_lock:
+            if not self.management_url or not self.auth_token:
+                self.authenticate()
+            return self.management_url, self.auth_token
+
+    def _discard_token(self, auth_token):
+        """Drop a rejected token, unless another thread already replaced it.
+        """
+        with self._auth_lock:
+            if self.auth_token == auth_token:
+                self.management_url = self.auth_token = None
+
+    def _get_response_cache_key(self, url, headers):
+        # NOTE: the URL includes the endpoint, the microversion is set by
+        # request().
+        microversion = (self.api_version.get_string()
+                        if self.api_version else None)
+        return url, microversion, self.tenant_id or self.projectid
 
     def get(self, url, **kwargs):
         return self._cs_request(url, 'GET', **kwargs)
@@ -695,6 +852,175 @@ class HTTPClient(object):
         return self._extract_service_catalog(url, resp, body)
 
 
+class AsyncHTTPClient(object):
+    """Asynchronous transport built on top of a synchronous one.
+
+    Authentication, endpoint lookup and TLS settings are taken from the
+    wrapped :class:`SessionClient` or :class:`HTTPClient`, while the API
+    requests themselves are sent with ``aiohttp`` so that many of them can
+    be in flight on a single event loop.
+    """
+
+    USER_AGENT = 'python-cinderclient'
+
+    # NOTE: asyncio and ssl are imported by the methods that need them, so
+    # that importing this module stays cheap for the synchronous clients.
+
+    def __init__(self, http_client, api_version=None,
+                 connection_limit=None):
+        if _import_optional('aiohttp', 'aiohttp') is None:
+            raise ImportError(_("The aiohttp library is required to use "
+                                "the asynchronous client."))
+        self.http_client = http_client
+        self.api_version = api_version or api_versions.APIVersion()
+        self.connection_limit = (connection_limit or
+                                 DEFAULT_ASYNC_CONNECTION_LIMIT)
+        self.retries = int(getattr(http_client, 'retries', 0) or 0)
+        # NOTE: the retry budget is shared with the synchronous transport.
+        self.retry_policy = (getattr(http_client, 'retry_policy', None) or
+                             retry.RetryPolicy(self.retries))
+        self.rate_limiter = getattr(http_client, 'rate_limiter', None)
+        self._session = None
+        self._logger = logging.getLogger(__name__)
+
+    def _get_tls_settings(self):
+        if isinstance(self.http_client, SessionClient):
+            session = self.http_client.session
+            return session.verify, session.cert, session.timeout
+        return (self.http_client.verify_cert, self.http_client.cert,
+                self.http_client.timeout)
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            import ssl
+            verify, cert, timeout = self._get_tls_settings()
+            if verify is False:
+                ssl_context = False
+            else:
+                cafile = verify if isinstance(verify, str) else None
+                ssl_context = ssl.create_default_context(cafile=cafile)
+                if cert:
+                    if isinstance(cert, (tuple, list)):
+                        ssl_context.load_cert_chain(*cert)
+                    else:
+                        ssl_context.load_cert_chain(cert)
+            connector = aiohttp.TCPConnector(limit=self.connection_limit,
+                                             ssl=ssl_context)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=timeout))
+        return self._session
+
+    def _get_endpoint_and_headers(self):
+        http_client = self.http_client
+        headers = {'User-Agent': self.USER_AGENT,
+                   'Accept': 'application/json'}
+        if isinstance(http_client, SessionClient):
+            endpoint = http_client.get_endpoint()
+            headers.update(http_client.session.get_auth_headers(
+                auth=http_client.auth) or {})
+        else:
+            endpoint, headers['X-Auth-Token'] = http_client._get_credentials()
+            if http_client.projectid:
+                headers['X-Auth-Project-Id'] = http_client.projectid
+        if http_client.global_request_id:
+            headers[REQ_ID_HEADER] = http_client.global_request_id
+        api_versions.update_headers(headers, self.api_version)
+        return endpoint.rstrip('/'), headers
+
+    def _invalidate(self, headers):
+        if isinstance(self.http_client, SessionClient):
+            self.http_client.invalidate()
+        else:
+            self.http_client._discard_token(headers.get('X-Auth-Token'))
+
+    @staticmethod
+    def _get_base_url(endpoint):
+        m = re.search('(.+)/v[1-3].*', endpoint)
+        if m:
+            return '%s/' % m.group(1)
+        return '/'.join(endpoint.split('/')[:3]) + '/'
+
+    async def request(self, url, method, base_url=False, **kwargs):
+        import asyncio
+
+        auth_attempts = 0
+        attempts = 0
+        while True:
+            attempts += 1
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(
+                    method, url,
+                    endpoint=lambda: self._get_endpoint_and_headers()[0])
+                if delay:
+                    await asyncio.sleep(delay)
+            endpoint, headers = self._get_endpoint_and_headers()
+            if base_url:
+                full_url = self._get_base_url(endpoint) + url
+            elif url.startswith(endpoint):
+                full_url = url
+            else:
+                full_url = endpoint + url
+            try:
+                return await self._send(full_url, method, headers, **kwargs)
+            except exceptions.Unauthorized:
+                if auth_attempts > 0:
+                    raise
+                self._logger.debug("Unauthorized, reauthenticating.")
+                self._invalidate(headers)
+                attempts -= 1
+                auth_attempts += 1
+                continue
+            except retry.RETRYABLE_ERRORS as e:
+                delay = self.retry_policy.get_delay(method, attempts, e)
+                if delay is None:
+                    raise
+            self._logger.debug("Failed attempt(%s of %s), retrying in %.2f "
+                               "seconds", attempts, self.retries, delay)
+            await asyncio.sleep(delay)
+
+    async def _send(self, url, method, headers, **kwargs):
+        headers = dict(headers, **kwargs.pop('headers', {}))
+        data = None
+        if 'body' in kwargs:
+            headers['Content-Type'] = 'application/json'
+            data = json.dumps(kwargs.pop('body'))
+
+        try:
+            async with self._get_session().request(
+                    method, url, headers=headers, data=data) as r:
+                content = await r.read()
+                resp = requests.Response()
+                resp.status_code = r.status
+                resp.reason = r.reason
+                resp.url = url
+                resp.headers = requests.structures.CaseInsensitiveDict(
+                    r.headers)
+                resp.encoding = r.charset or 'utf-8'
+                resp._content = content
+        except aiohttp.ClientConnectionError as e:
+            msg = 'Unable to establish connection: %s' % e
+            raise exceptions.ConnectionError(msg)
+
+        body = None
+        if resp.text:
+            try:
+                body = json.loads(resp.text)
+            except ValueError as e:
+                self._logger.debug("Load http response text error: %s", e)
+
+        if resp.status_code >= 400:
+            raise exceptions.from_response(resp, body)
+
+        return resp, body
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
 def _construct_http_client(username=None, password=None, project_id=None,
                            auth_url=None, insecure=False, timeout=None,
                            proxy_tenant_id=None, proxy_token=None,
@@ -707,7 +1033,9 @@ def _construct_http_client(username=None, password=None, project_id=None,
                            cacert=None, cert=None, tenant_id=None,
                            session=None,
                            auth=None, api_version=None,
-                           **kwargs):
+                           pool_connections=None, pool_maxsize=None,
+                           keep_alive=True, retry_policy=None,
+                           rate_limiter=None, **kwargs):
 
     if session:
         kwargs.setdefault('user_agent', 'python-cinderclient')
@@ -720,6 +1048,8 @@ def _construct_http_client(username=None, password=None, project_id=None,
                              service_name=service_name,
                              region_name=region_name,
                              retries=retries,
+                             retry_policy=retry_policy,
+                             rate_limiter=rate_limiter,
                              api_version=api_version,
                              http_log_debug=http_log_debug,
                              **kwargs)
@@ -749,7 +1079,12 @@ def _construct_http_client(username=None, password=None, project_id=None,
                           auth_system=auth_system,
                           auth_plugin=auth_plugin,
                           logger=logger,
-                          api_version=api_version
+                          api_version=api_version,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          keep_alive=keep_alive,
+                          retry_policy=retry_policy,
+                          rate_limiter=rate_limiter
                           )
 
 
@@ -779,18 +1114,97 @@ def get_client_class(version):
     return importutils.import_class(client_path)
 
 
-def discover_extensions(version):
+def discover_extensions(version, use_manifest=False):
+    """Return the extensions of an API version.
+
+    Extensions are ``*cinderclient_ext`` modules on ``sys.path``, modules
+    registered in the ``cinderclient.extension`` entry point group and the
+    ``contrib`` modules of the version. Finding them needs a scan of
+    ``sys.path``, so what each extension provides can be kept in a manifest
+    which is reused while the ``sys.path`` directories and the extension
+    files are unchanged, and the extension modules are then only loaded when
+    needed.
+
+    :param use_manifest: whether to use the manifest in the cache directory,
+                         as the shell does. It is also used when
+                         ``env[CINDERCLIENT_UUID_CACHE_DIR]`` configures the
+                         cache directory.
+    """
+    use_manifest = (use_manifest or
+                    bool(utils.env('CINDERCLIENT_UUID_CACHE_DIR')))
+    if use_manifest:
+        manifest_name = 'extensions-v%s' % version.replace('.', '_')
+        key = _get_extension_manifest_key(version)
+        manifest = cache.load_manifest(manifest_name, key)
+        if manifest is not None and _extension_files_unchanged(manifest):
+            return [cinderclient.extension.LazyExtension(
+                entry['name'], functools.partial(_load_extension, entry),
+                entry)
+                for entry in manifest]
+
     extensions = []
+    manifest = []
     for name, module in itertools.chain(
             _discover_via_python_path(),
+            _discover_via_entry_points(),
             _discover_via_contrib_path(version)):
 
         extension = cinderclient.extension.Extension(name, module)
         extensions.append(extension)
+        manifest.append(_summarize_extension(extension))
 
+    if use_manifest:
+        # NOTE: store_manifest() ignores the errors, e.g. of a read-only
+        # home directory.
+        cache.store_manifest(manifest_name, key, manifest)
     return extensions
 
 
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def _get_extension_manifest_key(version):
+    # NOTE: adding or removing a module or distribution changes the
+    # modification time of its sys.path directory.
+    contrib_path = _get_contrib_path(version)
+    return [[path, _get_mtime(path)]
+            for path in sys.path + [contrib_path]]
+
+
+def _extension_files_unchanged(manifest):
+    return all(_get_mtime(entry['path']) == entry['mtime']
+               for entry in manifest)
+
+
+def _summarize_extension(extension):
+    module = extension.module
+    path = getattr(module, '__file__', None)
+    return {
+        'name': extension.name,
+        'module': module.__name__,
+        'path': path,
+        'mtime': _get_mtime(path),
+        # contrib modules are executed from their file, not imported.
+        'imported': sys.modules.get(module.__name__) is module,
+        'commands': sorted(attr for attr in dir(module)
+                           if attr.startswith('do_')),
+        'hooks': [hook for hook
+                  in cinderclient.extension.Extension.SUPPORTED_HOOKS
+                  if hook in module.__dict__],
+        'manager': extension.manager_class is not None,
+    }
+
+
+def _load_extension(entry):
+    if entry['imported']:
+        return importlib.import_module(entry['module'])
+    return load_module(entry['name'], entry['path'])
+
+
 def _discover_via_python_path():
     for (module_loader, name, ispkg) in pkgutil.iter_modules():
         if name.endswith('cinderclient_ext'):
@@ -800,6 +1214,17 @@ def _discover_via_python_path():
             yield name, module
 
 
+def _discover_via_entry_points():
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=EXTENSION_ENTRY_POINT_GROUP)
+    else:
+        entry_points = entry_points.get(EXTENSION_ENTRY_POINT_GROUP, [])
+    for entry_point in entry_points:
+        module = importlib.import_module(entry_point.value.split(':')[0])
+        yield entry_point.name, module
+
+
 def load_module(name, path):
     module_spec = importlib.util.spec_from_file_location(
         name, path
@@ -809,10 +1234,14 @@ def load_module(name, path):
     return module
 
 
-def _discover_via_contrib_path(version):
+def _get_contrib_path(version):
     module_path = os.path.dirname(os.path.abspath(__file__))
     version_str = "v%s" % version.replace('.', '_')
-    ext_path = os.path.join(module_path, version_str, 'contrib')
+    return os.path.join(module_path, version_str, 'contrib')
+
+
+def _discover_via_contrib_path(version):
+    ext_path = _get_contrib_path(version)
     ext_glob = os.path.join(ext_path, "*.py")
 
     for ext_path in glob.iglob(ext_glob):
@@ -195,6 +195,29 @@ class NotAcceptable(ClientException):
     message = "Not Acceptable"
 
 
+def _get_retry_after(resp):
+    """Return the seconds to wait given by the Retry-After header, or 0.
+
+    A malformed header also gives 0, so that the retry policy falls back to
+    its own backoff.
+    """
+    if (resp is not None) and resp.headers:
+        utc_now = timeutils.utcnow()
+        value = resp.headers.get('Retry-After', '0')
+        try:
+            value = datetime.strptime(value, '%a, %d %b %Y %H:%M:%S %Z')
+            if value > utc_now:
+                return (value - utc_now).seconds
+            return 0
+        except ValueError:
+            pass
+        try:
+            return int(value)
+        except ValueError:
+            return 0
+    return 0
+
+
 class OverLimit(ClientException):
     """
     HTTP 413 - Over limit: you're over the API limits for this time period.
@@ -207,21 +230,15 @@ class OverLimit(ClientException):
         super(OverLimit, self).__init__(code, message=message,
                                         details=details, request_id=request_id,
                                         response=response)
-        self.retry_after = 0
-        self._get_rate_limit(response)
-
-    def _get_rate_limit(self, resp):
-        if (resp is not None) and resp.headers:
-            utc_now = timeutils.utcnow()
-            value = resp.headers.get('Retry-After', '0')
-            try:
-                value = datetime.strptime(value, '%a, %d %b %Y %H:%M:%S %Z')
-                if value > utc_now:
-                    self.retry_after = ((value - utc_now).seconds)
-                else:
-                    self.retry_after = 0
-            except ValueError:
-                self.retry_after = int(value)
+        self.retry_after = _get_retry_after(response)
+
+
+class TooManyRequests(OverLimit):
+    """
+    HTTP 429 - Too many requests: you're over the API rate limit.
+    """
+    http_status = 429
+    message = "Too many requests"
 
 
 # NotImplemented is a python keyword.
@@ -233,6 +250,22 @@ class HTTPNotImplemented(ClientException):
     message = "Not Implemented"
 
 
+class ServiceUnavailable(ClientException):
+    """
+    HTTP 503 - Service unavailable: the server is temporarily unable to
+    handle the request.
+    """
+    http_status = 503
+    message = "Service Unavailable"
+
+    def __init__(self, code, message=None, details=None,
+                 request_id=None, response=None):
+        super(ServiceUnavailable, self).__init__(
+            code, message=message, details=details, request_id=request_id,
+            response=response)
+        self.retry_after = _get_retry_after(response)
+
+
 # In Python 2.4 Exception is old-style and thus doesn't have a __subclasses__()
 # so we can do this:
 #     _code_map = dict((c.http_status, c)
@@ -242,7 +275,9 @@ class HTTPNotImplemented(ClientException):
 _code_map = dict((c.http_status, c) for c in [BadRequest, Unauthorized,
                                               Forbidden, NotFound,
                                               NotAcceptable,
-                                              OverLimit, HTTPNotImplemented])
+                                              OverLimit, TooManyRequests,
+                                              HTTPNotImplemented,
+                                              ServiceUnavailable])
 
 
 def from_response(response, body):
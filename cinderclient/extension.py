@@ -36,5 +36,53 @@ class Extension(common_base.HookableMixin):
             elif utils.safe_issubclass(attr_value, base.Manager):
                 self.manager_class = attr_value
 
+    def has_attr(self, name):
+        """Whether the extension module defines ``name``."""
+        return hasattr(self.module, name)
+
     def __repr__(self):
         return "<Extension '%s'>" % self.name
+
+
+class LazyExtension(Extension):
+    """Extension whose module is loaded when it is first needed.
+
+    ``summary`` describes the module without loading it: its ``commands``
+    (``do_*`` functions), its ``hooks`` and whether it has a ``manager``.
+    Modules with hooks are loaded right away, since hooks run before the
+    commands are parsed.
+    """
+
+    def __init__(self, name, load_module, summary):
+        self.name = name
+        self.summary = summary
+        self._load_module = load_module
+        self._module = None
+        self._manager_class = None
+        self._parsed = False
+        if summary.get('hooks'):
+            self._parse_extension_module()
+
+    def _parse_extension_module(self):
+        if not self._parsed:
+            self._parsed = True
+            super(LazyExtension, self)._parse_extension_module()
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = self._load_module()
+        return self._module
+
+    @property
+    def manager_class(self):
+        if self.summary.get('manager'):
+            self._parse_extension_module()
+        return self._manager_class
+
+    @manager_class.setter
+    def manager_class(self, manager_class):
+        self._manager_class = manager_class
+
+    def has_attr(self, name):
+        return name in self.summary.get('commands', ())
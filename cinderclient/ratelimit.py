@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Client side pacing of the requests sent to the Volume API."""
+
+import logging
+import re
+import threading
+import time
+from urllib import parse
+
+LOG = logging.getLogger(__name__)
+
+# Seconds per unit of the rate limits returned by the server.
+UNITS = {'SECOND': 1, 'MINUTE': 60, 'HOUR': 3600, 'DAY': 86400}
+
+
+class _Bucket(object):
+    """Token bucket of one rate limit."""
+
+    def __init__(self, verb, regex, value, unit, remaining):
+        if unit.upper() not in UNITS:
+            raise ValueError("Unknown rate limit unit %r, expected one of "
+                             "%s." % (unit, ', '.join(UNITS)))
+        value = float(value)
+        if value <= 0:
+            raise ValueError("Rate limit value must be positive, got %r."
+                             % value)
+        self.verb = verb.upper()
+        self.regex = re.compile(regex)
+        self.capacity = value
+        self.rate = value / UNITS[unit.upper()]
+        self.tokens = float(value if remaining is None
+                            else min(value, remaining))
+        self.updated = time.monotonic()
+
+    def matches(self, method, url):
+        return (self.verb in ('*', method) and
+                self.regex.match(url) is not None)
+
+    def reserve(self, now):
+        """Take a token, return the seconds until it is available."""
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+
+def _relative_url(url, endpoint):
+    """Return an absolute URL relative to the endpoint, e.g. a next link."""
+    if '://' not in url:
+        return url
+    parsed = parse.urlsplit(url)
+    path = parsed.path + ('?' + parsed.query if parsed.query else '')
+    if callable(endpoint):
+        endpoint = endpoint()
+    prefix = parse.urlsplit(endpoint).path.rstrip('/') if endpoint else ''
+    if prefix and (path == prefix or
+                   path.startswith((prefix + '/', prefix + '?'))):
+        path = path[len(prefix):]
+    return path if path.startswith('/') else '/' + path
+
+
+class RateLimiter(object):
+    """Pace the requests of a client to stay within rate limits.
+
+    Each limit is a token bucket of ``value`` requests per ``unit`` for the
+    requests whose method is ``verb`` and whose URL, relative to the
+    endpoint, matches ``regex``. A request waits until every limit it
+    matches has a token, and queued requests are served in order, so that
+    bulk operations run at the highest rate that is not rejected with
+    ``413 Over Limit``::
+
+        >>> limiter = RateLimiter.from_limits(cs.limits.get())
+        >>> cs = Client(..., rate_limiter=limiter)
+
+    or, with limits set by hand::
+
+        >>> limiter = RateLimiter()
+        >>> limiter.add_limit('POST', '^/volumes', 10, 'MINUTE')
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._stats = {'requests': 0, 'delayed': 0, 'delay': 0.0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_limits(cls, limits):
+        """Build a limiter from the rate limits returned by the server.
+
+        Limits with an unknown unit are skipped with a warning.
+
+        :param limits: :class:`cinderclient.v3.limits.Limits`
+        """
+        limiter = cls()
+        for rate in limits.rate:
+            try:
+                limiter.add_limit(rate.verb, rate.regex, rate.value,
+                                  rate.unit, remaining=rate.remain)
+            except ValueError as e:
+                LOG.warning("Ignoring the rate limit of %(verb)s %(regex)s: "
+                            "%(error)s", {'verb': rate.verb,
+                                          'regex': rate.regex, 'error': e})
+        return limiter
+
+    def add_limit(self, verb, regex, value, unit='MINUTE', remaining=None):
+        """Allow ``value`` requests per ``unit``.
+
+        :param verb: HTTP method of the requests, or '*' for all of them
+        :param regex: regular expression matching the start of the URLs
+        :param unit: SECOND, MINUTE, HOUR or DAY
+        :param remaining: requests allowed right away, ``value`` by default
+        :raises ValueError: if ``unit`` is unknown or ``value`` isn't
+                            positive
+        """
+        bucket = _Bucket(verb, regex, value, unit, remaining)
+        with self._lock:
+            self._buckets.append(bucket)
+
+    def reserve(self, method, url, endpoint=None):
+        """Count a request, return the seconds to wait before sending it.
+
+        :param endpoint: the endpoint of the client, or a callable returning
+                         it, which is stripped from absolute URLs
+        """
+        method = method.upper()
+        url = _relative_url(url, endpoint)
+        with self._lock:
+            now = time.monotonic()
+            delay = max([bucket.reserve(now) for bucket in self._buckets
+                         if bucket.matches(method, url)] or [0])
+            self._stats['requests'] += 1
+            if delay:
+                self._stats['delayed'] += 1
+                self._stats['delay'] += delay
+        return delay
+
+    def get_stats(self):
+        """Return the number of requests, of delayed ones and the delay."""
+        with self._lock:
+            return dict(self._stats)
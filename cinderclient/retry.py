@@ -0,0 +1,142 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Retry policy shared by the HTTP transports."""
+
+import random
+import threading
+import time
+
+from keystoneauth1 import exceptions as ksa_exceptions
+import requests
+
+from cinderclient import exceptions
+
+# Methods that can be sent again when it is unknown whether the server
+# processed them.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# Statuses whose Retry-After header tells when the request, which was not
+# processed, can be sent again.
+RETRY_AFTER_STATUSES = frozenset([413, 429, 503])
+
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError,
+                     requests.exceptions.Timeout,
+                     ksa_exceptions.ConnectionError,
+                     exceptions.ConnectionError)
+
+# Errors the transports ask the policy about.
+RETRYABLE_ERRORS = CONNECTION_ERRORS + (exceptions.ClientException,)
+
+
+class RetryBudget(object):
+    """Token bucket limiting the rate of retries of a client.
+
+    Each retry takes a token, and tokens are added back at ``refill_rate``
+    per second up to ``capacity``, so that a partial outage doesn't turn
+    into a retry storm.
+    """
+
+    def __init__(self, capacity=10, refill_rate=1.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def withdraw(self):
+        """Take a token, return False if there is none left."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens +
+                               (now - self._updated) * self.refill_rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """Decide whether and when a failed request is sent again.
+
+    Requests are retried up to ``retries`` times:
+
+    * after the delay of the Retry-After header of a 413, 429 or 503
+      response, whatever the method, as the server did not process them
+    * after an exponential backoff with full jitter, for the server errors,
+      connection errors and timeouts of the ``retry_methods``, which are the
+      idempotent methods by default
+
+    Each retry takes a token from ``budget``, no retry is made when it is
+    empty. The policy is shared by the transports of one client, and counts
+    the retries in :meth:`get_stats`.
+    """
+
+    def __init__(self, retries=0, base_delay=1, max_delay=30,
+                 retry_methods=IDEMPOTENT_METHODS, budget=None):
+        self.retries = int(retries or 0)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.budget = budget if budget is not None else RetryBudget()
+        self._stats = {'retries': 0, 'retries_exhausted': 0,
+                       'budget_exhausted': 0}
+        self._lock = threading.Lock()
+
+    def get_delay(self, method, attempt, error):
+        """Return the seconds to wait before retrying, or None to give up.
+
+        :param method: HTTP method of the request
+        :param attempt: number of times the request was sent
+        :param error: exception raised by the last attempt
+        """
+        delay = self._get_delay(method.upper(), attempt, error)
+        if delay is None:
+            return None
+        if attempt > self.retries:
+            if self.retries:
+                self._count('retries_exhausted')
+            return None
+        if not self.budget.withdraw():
+            self._count('budget_exhausted')
+            return None
+        self._count('retries')
+        return delay
+
+    def _get_delay(self, method, attempt, error):
+        if isinstance(error, exceptions.ClientException):
+            retry_after = getattr(error, 'retry_after', 0)
+            if error.code in RETRY_AFTER_STATUSES and retry_after >= 1:
+                return retry_after
+            if not 500 <= error.code <= 599 or error.code == 501:
+                return None
+        elif not isinstance(error, CONNECTION_ERRORS):
+            return None
+        if method not in self.retry_methods:
+            return None
+        return random.uniform(0, min(self.max_delay,
+                                     self.base_delay * 2 ** (attempt - 1)))
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self):
+        """Return the number of retries made and of retries refused.
+
+        ``retries_exhausted`` counts the requests that failed after all
+        their retries, ``budget_exhausted`` those that were not retried
+        because the retry budget was empty.
+        """
+        with self._lock:
+            return dict(self._stats)
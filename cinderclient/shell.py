@@ -20,7 +20,9 @@ Command-line interface to the OpenStack Cinder API.
 import argparse
 import collections
 import getpass
+import importlib.util
 import logging
+import shlex
 import sys
 from urllib import parse as urlparse
 
@@ -36,14 +38,19 @@ import requests
 import cinderclient
 from cinderclient._i18n import _
 from cinderclient import api_versions
+from cinderclient import cache
 from cinderclient import client
 from cinderclient import exceptions as exc
 from cinderclient import utils
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+
+# NOTE: osprofiler is slow to import, it is only imported when --profile is
+# used.
 try:
-    osprofiler_profiler = importutils.try_import("osprofiler.profiler")
+    osprofiler_available = importlib.util.find_spec('osprofiler') is not None
 except Exception:
-    pass
+    osprofiler_available = False
 
 
 DEFAULT_MAJOR_OS_VOLUME_API_VERSION = "3"
@@ -134,6 +141,8 @@ class OpenStackCinderShell(object):
         self.ks_logger = None
         self.client_logger = None
         self.extensions = []
+        self.auth_cache = None
+        self.cached_token = False
 
     def get_base_parser(self):
         parser = CinderClientArgumentParser(
@@ -223,10 +232,43 @@ class OpenStackCinderShell(object):
                             default=0,
                             help=_('Number of retries.'))
 
+        parser.add_argument('--os-name-cache-ttl',
+                            metavar='<seconds>',
+                            type=int,
+                            default=utils.env('CINDERCLIENT_NAME_CACHE_TTL',
+                                              default=0),
+                            help=_('Look names up in a local name to ID '
+                                   'cache whose entries are valid this many '
+                                   'seconds, 0 disables it. '
+                                   'Default=env[CINDERCLIENT_NAME_CACHE_TTL] '
+                                   'or 0.'))
+
+        parser.add_argument('--os-version-cache-ttl',
+                            metavar='<seconds>',
+                            type=int,
+                            default=utils.env('CINDERCLIENT_VERSION_CACHE_TTL',
+                                              default=0),
+                            help=_('Reuse the microversions supported by the '
+                                   'endpoint, as found by a previous run, '
+                                   'during this many seconds, 0 disables it. '
+                                   'Default='
+                                   'env[CINDERCLIENT_VERSION_CACHE_TTL] '
+                                   'or 0.'))
+
+        parser.add_argument('--os-auth-cache',
+                            action='store_true',
+                            default=utils.env('CINDERCLIENT_AUTH_CACHE',
+                                              default=False),
+                            help=_('Reuse the identity service discovery '
+                                   'result and token of previous runs, '
+                                   'cached in a private file until shortly '
+                                   'before the token expires. '
+                                   'Default=env[CINDERCLIENT_AUTH_CACHE].'))
+
         parser.set_defaults(func=self.do_help)
         parser.set_defaults(command='')
 
-        if osprofiler_profiler:
+        if osprofiler_available:
             parser.add_argument('--profile',
                                 metavar='HMAC_KEY',
                                 default=utils.env('OS_PROFILE'),
@@ -354,14 +396,23 @@ class OpenStackCinderShell(object):
         subparsers = parser.add_subparsers(metavar='<subcommand>')
 
         actions_module = importutils.import_module(V3_SHELL)
-
-        self._find_actions(subparsers, actions_module, version, do_help,
-                           input_args)
-        self._find_actions(subparsers, self, version, do_help, input_args)
-
-        for extension in self.extensions:
-            self._find_actions(subparsers, extension.module, version, do_help,
-                               input_args)
+        actions_modules = [actions_module, self]
+
+        # NOTE: only the invoked command needs a parser, all of them are
+        # built for help and bash completion, or when the command is unknown
+        # so that argparse reports it as usual.
+        action = None
+        if not do_help and input_args:
+            action = self._find_action(actions_modules, input_args[0],
+                                       version, self.extensions)
+        if action:
+            self._add_action_parser(subparsers, version, do_help, input_args,
+                                    *action)
+        else:
+            for module in actions_modules + [extension.module for extension
+                                             in self.extensions]:
+                self._find_actions(subparsers, module, version, do_help,
+                                   input_args)
 
         self._add_bash_completion_subparser(subparsers)
 
@@ -392,53 +443,88 @@ class OpenStackCinderShell(object):
     def _find_actions(self, subparsers, actions_module, version,
                       do_help, input_args):
         for attr in (a for a in dir(actions_module) if a.startswith('do_')):
-            # I prefer to be hyphen-separated instead of underscores.
-            command = attr[3:].replace('_', '-')
-            callback = getattr(actions_module, attr)
-            desc = callback.__doc__ or ''
+            action = self._get_action(actions_module, attr, version, do_help)
+            if action:
+                self._add_action_parser(subparsers, version, do_help,
+                                        input_args, *action)
+
+    def _find_action(self, actions_modules, command, version,
+                     extensions=()):
+        """Look a single command up, without walking every module.
+
+        Returns the action of the last module defining it, as registering
+        all commands would, or None. Only the extension modules defining the
+        command are loaded.
+        """
+        if '_' in command or command in ('help', 'bash-completion'):
+            return None
+        attr = 'do_%s' % command.replace('-', '_')
+        action = None
+        actions_modules = actions_modules + [extension.module for extension
+                                             in extensions
+                                             if extension.has_attr(attr)]
+        for module in actions_modules:
+            if hasattr(module, attr):
+                action = self._get_action(module, attr, version,
+                                          False) or action
+        return action
+
+    def _get_action(self, actions_module, attr, version, do_help):
+        """Return (command, callback, description, help) of a do_* function.
+
+        Returns None if no substitution of a versioned function matches the
+        version.
+        """
+        # I prefer to be hyphen-separated instead of underscores.
+        command = attr[3:].replace('_', '-')
+        callback = getattr(actions_module, attr)
+        desc = callback.__doc__ or ''
+        action_help = desc.strip().split('\n')[0]
+        if hasattr(callback, "versioned"):
+            additional_msg = ""
+            subs = api_versions.get_substitutions(
+                utils.get_function_name(callback))
+            if do_help:
+                additional_msg = self._build_versioned_help_message(
+                    subs[0].start_version, subs[-1].end_version)
+                if version.is_latest():
+                    additional_msg += HINT_HELP_MSG
+            subs = [versioned_method for versioned_method in subs
+                    if version.matches(versioned_method.start_version,
+                                       versioned_method.end_version)]
+            if not subs:
+                # There is no proper versioned method.
+                return None
+            # Use the "latest" substitution.
+            callback = subs[-1].func
+            desc = callback.__doc__ or desc
             action_help = desc.strip().split('\n')[0]
-            if hasattr(callback, "versioned"):
-                additional_msg = ""
-                subs = api_versions.get_substitutions(
-                    utils.get_function_name(callback))
-                if do_help:
-                    additional_msg = self._build_versioned_help_message(
-                        subs[0].start_version, subs[-1].end_version)
-                    if version.is_latest():
-                        additional_msg += HINT_HELP_MSG
-                subs = [versioned_method for versioned_method in subs
-                        if version.matches(versioned_method.start_version,
-                                           versioned_method.end_version)]
-                if not subs:
-                    # There is no proper versioned method.
-                    continue
-                # Use the "latest" substitution.
-                callback = subs[-1].func
-                desc = callback.__doc__ or desc
-                action_help = desc.strip().split('\n')[0]
-                action_help += additional_msg
-
-            exclusive_args = getattr(callback, 'exclusive_args', {})
-            arguments = getattr(callback, 'arguments', [])
-
-            subparser = subparsers.add_parser(
-                command,
-                help=action_help,
-                description=desc,
-                add_help=False,
-                formatter_class=OpenStackHelpFormatter)
-
-            subparser.add_argument('-h', '--help',
-                                   action='help',
-                                   help=argparse.SUPPRESS,)
-
-            self.subcommands[command] = subparser
-            self._add_subparser_args(subparser, arguments, version, do_help,
-                                     input_args, command)
-            self._add_subparser_exclusive_args(subparser, exclusive_args,
-                                               version, do_help, input_args,
-                                               command)
-            subparser.set_defaults(func=callback)
+            action_help += additional_msg
+        return command, callback, desc, action_help
+
+    def _add_action_parser(self, subparsers, version, do_help, input_args,
+                           command, callback, desc, action_help):
+        exclusive_args = getattr(callback, 'exclusive_args', {})
+        arguments = getattr(callback, 'arguments', [])
+
+        subparser = subparsers.add_parser(
+            command,
+            help=action_help,
+            description=desc,
+            add_help=False,
+            formatter_class=OpenStackHelpFormatter)
+
+        subparser.add_argument('-h', '--help',
+                               action='help',
+                               help=argparse.SUPPRESS,)
+
+        self.subcommands[command] = subparser
+        self._add_subparser_args(subparser, arguments, version, do_help,
+                                 input_args, command)
+        self._add_subparser_exclusive_args(subparser, exclusive_args,
+                                           version, do_help, input_args,
+                                           command)
+        subparser.set_defaults(func=callback)
 
     def _add_subparser_args(self, subparser, arguments, version, do_help,
                             input_args, command):
@@ -578,7 +664,8 @@ class OpenStackCinderShell(object):
 
         # build available subcommands based on version
         major_version_string = "%s" % api_version.ver_major
-        self.extensions = client.discover_extensions(major_version_string)
+        self.extensions = client.discover_extensions(major_version_string,
+                                                     use_manifest=True)
         self._run_extension_hooks('__pre_parse_args__')
 
         subcommand_parser = self.get_subcommand_parser(api_version,
@@ -700,6 +787,8 @@ class OpenStackCinderShell(object):
                 "through --os-auth-url or env[OS_AUTH_URL].")
 
         if not auth_session:
+            if strutils.bool_from_string(options.os_auth_cache):
+                self.auth_cache = cache.AuthCache()
             auth_session = self._get_keystone_session()
 
         # collect_timing is a keystone session option
@@ -726,6 +815,12 @@ class OpenStackCinderShell(object):
             auth_plugin=auth_plugin,
             session=auth_session,
             logger=self.ks_logger if auth_session else self.client_logger)
+        if options.os_name_cache_ttl > 0:
+            client_args.update(name_cache=True,
+                               name_cache_ttl=options.os_name_cache_ttl)
+        if options.os_version_cache_ttl > 0:
+            client_args.update(version_cache=True,
+                               version_cache_ttl=options.os_version_cache_ttl)
 
         self.cs = client.Client(
             api_version, os_username,
@@ -733,7 +828,9 @@ class OpenStackCinderShell(object):
             **client_args)
 
         try:
-            if not utils.isunauthenticated(args.func):
+            # NOTE: authenticate() always fetches a new token, a cached one
+            # was already checked to be valid long enough.
+            if not (utils.isunauthenticated(args.func) or self.cached_token):
                 self.cs.authenticate()
         except exc.Unauthorized:
             raise exc.CommandError("OpenStack credentials are not valid.")
@@ -775,12 +872,17 @@ class OpenStackCinderShell(object):
         # FIXME: the endpoint_api_version[0] can ONLY be '3' now, so the
         # above line should probably be ripped out and this condition removed
         if endpoint_api_version[0] == '3':
-            disc_client = client.Client(API_MIN_VERSION,
-                                        os_username,
-                                        os_password,
-                                        os_project_name,
-                                        os_auth_url,
-                                        **client_args)
+            if self.cs.version_cache and self.cs.version_cache.get():
+                # The supported microversions are known, no need to query
+                # them with a client at the minimum microversion.
+                disc_client = self.cs
+            else:
+                disc_client = client.Client(API_MIN_VERSION,
+                                            os_username,
+                                            os_password,
+                                            os_project_name,
+                                            os_auth_url,
+                                            **client_args)
             self.cs, discovered_version = self._discover_client(
                 disc_client,
                 api_version,
@@ -795,8 +897,10 @@ class OpenStackCinderShell(object):
             if discovered_version < api_version:
                 self.downgrade_warning(api_version, discovered_version)
 
-        profile = osprofiler_profiler and options.profile
+        profile = osprofiler_available and options.profile
         if profile:
+            osprofiler_profiler = importutils.import_module(
+                'osprofiler.profiler')
             osprofiler_profiler.init(options.profile)
 
         try:
@@ -811,6 +915,9 @@ class OpenStackCinderShell(object):
             if getattr(args, 'collect_timing', False) is True:
                 self._print_timings(auth_session)
 
+            if self.auth_cache and auth_session.auth:
+                self.auth_cache.save_auth(auth_session.auth)
+
     def _print_timings(self, session):
         timings = session.get_timings()
         utils.print_list(
@@ -840,9 +947,7 @@ class OpenStackCinderShell(object):
         if not os_service_type:
             os_service_type = self._discover_service_type(discovered_version)
 
-        API_MIN_VERSION = api_versions.APIVersion(api_versions.MIN_VERSION)
-
-        if (discovered_version != API_MIN_VERSION or
+        if (discovered_version != current_client.api_version or
                 os_service_type != 'volume' or
                 os_endpoint_type != DEFAULT_CINDER_ENDPOINT_TYPE):
             client_args['service_type'] = os_service_type
@@ -906,6 +1011,114 @@ class OpenStackCinderShell(object):
         else:
             self.parser.print_help()
 
+    @utils.arg('file', metavar='<file>', nargs='?', default='-',
+               help='File to read the commands from, one per line. '
+                    'Default=standard input.')
+    @utils.arg('--stop-on-error', action='store_true', default=False,
+               help='Stop at the first command that fails. '
+                    'Default=run all commands.')
+    def do_batch(self, cs, args):
+        """Runs subcommands read from a file.
+
+        The commands are run with one authenticated client, global options
+        apply to all of them. Blank lines and lines starting with '#' are
+        ignored.
+        """
+        if args.file == '-':
+            lines = sys.stdin.readlines()
+        else:
+            with open(args.file) as f:
+                lines = f.readlines()
+        failed = 0
+        count = 0
+        for lineno, line in enumerate(lines, 1):
+            succeeded = self._run_command_line(cs, line, lineno=lineno)
+            if succeeded is None:
+                continue
+            count += 1
+            if not succeeded:
+                failed += 1
+                if args.stop_on_error:
+                    break
+        if failed:
+            raise exc.CommandError(_("%(failed)s of %(count)s commands "
+                                     "failed.") % {'failed': failed,
+                                                   'count': count})
+
+    def do_shell(self, cs, args):
+        """Runs subcommands interactively.
+
+        The commands are run with one authenticated client, global options
+        apply to all of them. Type 'exit' or Ctrl-D to quit.
+        """
+        try:
+            # Enables line editing and history in input().
+            import readline  # noqa: F401
+        except ImportError:
+            pass
+        while True:
+            try:
+                line = input('cinder> ')
+            except EOFError:
+                print()
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+            if line.strip() in ('exit', 'quit'):
+                break
+            try:
+                self._run_command_line(cs, line)
+            except KeyboardInterrupt:
+                print("... command interrupted", file=sys.stderr)
+
+    def _run_command_line(self, cs, line, lineno=None):
+        """Run one subcommand of a batch or interactive shell.
+
+        Errors are reported on stderr. Returns whether the command succeeded,
+        or None for blank and comment lines.
+        """
+        try:
+            argv = shlex.split(line)
+            if not argv or argv[0].startswith('#'):
+                return None
+            self._run_command(cs, argv)
+        except SystemExit as e:
+            # argparse exits after printing usage or help.
+            return not e.code
+        except Exception as e:
+            logger.debug(e, exc_info=1)
+            if lineno is None:
+                print("ERROR: %s" % e, file=sys.stderr)
+            else:
+                print("ERROR (line %s): %s" % (lineno, e), file=sys.stderr)
+            return False
+        return True
+
+    def _run_command(self, cs, argv):
+        if argv[0] in ('batch', 'shell'):
+            raise exc.CommandError(_("'%s' cannot be run from a batch or "
+                                     "shell.") % argv[0])
+        for filter in FILTER_CHECK:
+            if filter in argv:
+                self.check_duplicate_filters(argv, filter)
+                break
+        do_help = ('help' in argv) or ('--help' in argv) or ('-h' in argv)
+
+        # NOTE: the commands are parsed for the negotiated microversion,
+        # the one they are sent with.
+        self.parser = self.get_subcommand_parser(cs.api_version, do_help,
+                                                 argv)
+        args = self.parser.parse_args(self._delimit_metadata_args(argv))
+        self._run_extension_hooks('__post_parse_args__', args)
+
+        if args.func == self.do_help:
+            self.do_help(args)
+        elif args.func == self.do_bash_completion:
+            self.do_bash_completion(args)
+        else:
+            args.func(cs, args)
+
     def get_v2_auth(self, v2_auth_url):
 
         username = self.options.os_username
@@ -991,9 +1204,18 @@ class OpenStackCinderShell(object):
 
         ks_session = session.Session(verify=verify, cert=cert)
         # discover the supported keystone versions using the given url
-        (v2_auth_url, v3_auth_url) = self._discover_auth_versions(
-            session=ks_session,
-            auth_url=self.options.os_auth_url)
+        auth_url = self.options.os_auth_url
+        discovered = (self.auth_cache and
+                      self.auth_cache.get_discovery(auth_url))
+        if discovered:
+            (v2_auth_url, v3_auth_url) = discovered
+        else:
+            (v2_auth_url, v3_auth_url) = self._discover_auth_versions(
+                session=ks_session,
+                auth_url=auth_url)
+            if self.auth_cache:
+                self.auth_cache.set_discovery(auth_url, v2_auth_url,
+                                              v3_auth_url)
 
         username = self.options.os_username or None
         user_domain_name = self.options.os_user_domain_name or None
@@ -1021,6 +1243,8 @@ class OpenStackCinderShell(object):
                                    'to authenticate with using the given '
                                    'auth_url.')
 
+        if self.auth_cache:
+            self.cached_token = self.auth_cache.load_auth(auth)
         ks_session.auth = auth
         return ks_session
 
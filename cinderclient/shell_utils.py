@@ -12,13 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import argparse
+from concurrent import futures
 import sys
 import time
 
-import prettytable
-
 from cinderclient import exceptions
 from cinderclient import utils
+from cinderclient import waiter
 
 _quota_resources = ['volumes', 'snapshots', 'gigabytes',
                     'backups', 'backup_gigabytes',
@@ -30,6 +31,13 @@ def _print(pt, order):
     print(pt.get_string(sortby=order))
 
 
+def _pretty_table(field_names):
+    # NOTE: prettytable is only imported when something is printed.
+    import prettytable
+
+    return prettytable.PrettyTable(field_names, caching=False)
+
+
 def _pretty_format_dict(data_dict):
     formatted_data = []
 
@@ -87,7 +95,7 @@ def print_list(objs, fields, exclude_unavailable=False, formatters=None,
     for f in removed_fields:
         fields.remove(f)
 
-    pt = prettytable.PrettyTable((f for f in fields), caching=False)
+    pt = _pretty_table(f for f in fields)
     pt.align = 'l'
     for row in rows:
         count = 0
@@ -106,7 +114,7 @@ def print_list(objs, fields, exclude_unavailable=False, formatters=None,
 
 
 def print_dict(d, property="Property", formatters=None):
-    pt = prettytable.PrettyTable([property, 'Value'], caching=False)
+    pt = _pretty_table([property, 'Value'])
     pt.align = 'l'
     formatters = formatters or {}
 
@@ -161,6 +169,47 @@ def poll_for_status(poll_fn, obj_id, action, final_ok_states,
             time.sleep(poll_period)
 
 
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            "'%s' is not a positive integer." % value)
+    return number
+
+
+# NOTE: shared by the commands acting on several entities, which run their
+# actions with for_each().
+parallel_arg = utils.arg(
+    '--parallel', metavar='<count>', type=_positive_int, default=1,
+    help='Number of entities acted upon concurrently. Default=1.')
+
+
+def for_each(func, items, parallel=1):
+    """Call func(item) for each item, up to ``parallel`` calls at a time.
+
+    Yields (item, exception) tuples in the order of ``items``, as soon as
+    the call for an item and those for the items before it returned. The
+    exception is None when the call succeeded.
+    """
+    def call(item):
+        try:
+            func(item)
+        except Exception as e:
+            return item, e
+        return item, None
+
+    if parallel <= 1 or len(items) <= 1:
+        for item in items:
+            yield call(item)
+        return
+    workers = min(parallel, len(items))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(call, items)
+
+
 def find_volume_snapshot(cs, snapshot):
     """Gets a volume snapshot by name or ID."""
     return utils.find_resource(cs.volume_snapshots, snapshot)
@@ -225,7 +274,8 @@ def translate_keys(collection, convert):
     for item in collection:
         keys = item.__dict__
         for from_key, to_key in convert:
-            if from_key in keys and to_key not in keys:
+            if (from_key in keys or from_key in item._info) and \
+                    to_key not in keys and to_key not in item._info:
                 setattr(item, to_key, item._info[from_key])
 
 
@@ -386,34 +436,20 @@ def print_associations_list(associations):
     print_list(associations, ['Association_Type', 'Name', 'ID'])
 
 
-def _poll_for_status(poll_fn, obj_id, info, action, final_ok_states,
-                     timeout_period, global_request_id=None, messages=None,
-                     poll_period=2, status_field="status"):
-    """Block while an action is being performed."""
-    time_elapsed = 0
-    while True:
-        time.sleep(poll_period)
-        time_elapsed += poll_period
-        obj = poll_fn(obj_id)
-        status = getattr(obj, status_field)
-        info[status_field] = status
-        if status:
-            status = status.lower()
-
-        if status in final_ok_states:
-            break
-        elif status == "error":
-            print_dict(info)
-            if global_request_id:
-                search_opts = {
-                    'request_id': global_request_id
-                    }
-                message_list = messages.list(search_opts=search_opts)
-                try:
-                    fault_msg = message_list[0].user_message
-                except IndexError:
-                    fault_msg = "Unknown error. Operation failed."
-                raise exceptions.ResourceInErrorState(obj, fault_msg)
-        elif time_elapsed == timeout_period:
-            print_dict(info)
-            raise exceptions.TimeoutException(obj, action)
+def wait_for_status(manager, resource, info, action, final_ok_states,
+                    timeout_period, global_request_id=None, messages=None,
+                    status_field="status"):
+    """Block while an action is being performed, see waiter.Waiter."""
+    result = waiter.Waiter(
+        manager, ready_states=final_ok_states, status_field=status_field,
+        messages=messages, request_id=global_request_id).wait(
+            [resource], timeout=float(timeout_period))[0]
+    obj = result.resource or resource
+    info[status_field] = getattr(obj, status_field, info.get(status_field))
+    if result.state == waiter.ERROR:
+        print_dict(info)
+        raise exceptions.ResourceInErrorState(
+            obj, result.message or "Unknown error. Operation failed.")
+    elif result.state == waiter.TIMEOUT:
+        print_dict(info)
+        raise exceptions.TimeoutException(obj, action)
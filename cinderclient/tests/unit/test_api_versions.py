@@ -99,6 +99,21 @@ class APIVersionTestCase(utils.TestCase):
         self.assertRaises(ValueError,
                           api_versions.APIVersion().get_string)
 
+    @mock.patch('cinderclient.api_versions.re.match',
+                wraps=api_versions.re.match)
+    def test_version_string_parsed_once(self, mock_match):
+        api_versions._parse_version_string.cache_clear()
+
+        v1 = api_versions.APIVersion("3.42")
+        v2 = api_versions.APIVersion("3.42")
+
+        self.assertEqual(1, mock_match.call_count)
+        self.assertEqual(v1, v2)
+        self.assertIsNot(v1, v2)
+        # Objects are not shared, changing one doesn't change the others.
+        v1.ver_minor = 43
+        self.assertEqual("3.42", api_versions.APIVersion("3.42").get_string())
+
 
 class ManagerTest(utils.TestCase):
     def test_api_version(self):
@@ -130,6 +145,35 @@ class ManagerTest(utils.TestCase):
         self.assertRaises(exceptions.VersionNotFoundForAPIMethod,
                           manager.return_api_version)
 
+    @mock.patch('cinderclient.api_versions.get_substitutions',
+                wraps=api_versions.get_substitutions)
+    def test_api_version_resolved_once(self, mock_get_substitutions):
+        api_versions._RESOLVED_SUBSTITUTIONS.clear()
+        api = client.Client(api_version=api_versions.APIVersion('3.3'))
+        manager = test_utils.FakeManagerWithApi(api)
+
+        self.assertEqual('3.2', manager.return_api_version())
+        self.assertEqual('3.2', manager.return_api_version())
+
+        mock_get_substitutions.assert_called_once_with(
+            'cinderclient.tests.unit.test_utils.FakeManagerWithApi.'
+            'return_api_version', api.api_version)
+
+    def test_api_version_resolution_reset(self):
+        api = client.Client(api_version=api_versions.APIVersion('3.3'))
+        manager = test_utils.FakeManagerWithApi(api)
+        self.assertEqual('3.2', manager.return_api_version())
+        name = ('cinderclient.tests.unit.test_utils.FakeManagerWithApi.'
+                'return_api_version')
+        self.addCleanup(api_versions._RESOLVED_SUBSTITUTIONS.clear)
+        self.addCleanup(api_versions._SUBSTITUTIONS[name].pop)
+
+        api_versions.add_substitution(api_versions.VersionedMethod(
+            name, api_versions.APIVersion('3.3'),
+            api_versions.APIVersion('3.latest'), lambda obj: '3.3'))
+
+        self.assertEqual('3.3', manager.return_api_version())
+
 
 class UpdateHeadersTestCase(utils.TestCase):
     def test_api_version_is_null(self):
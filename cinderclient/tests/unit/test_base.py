@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import tracemalloc
 from unittest import mock
+from urllib import parse
 
 import requests
 
@@ -23,6 +26,7 @@ from cinderclient import exceptions
 from cinderclient.tests.unit import test_utils
 from cinderclient.tests.unit import utils
 from cinderclient.tests.unit.v3 import fakes
+from cinderclient.tests.unit.v3 import fakes_base
 from cinderclient.v3 import client
 from cinderclient.v3 import volumes
 
@@ -94,6 +98,44 @@ class BaseTest(utils.TestCase):
                           cs.volumes.find,
                           vegetable='carrot')
 
+    def _find_api(self, *names):
+        api = mock.Mock(api_version=api_versions.APIVersion('3.0'))
+        api.client.get.return_value = (
+            mock.sentinel.resp,
+            {'volumes': [{'id': str(i), 'name': name}
+                         for i, name in enumerate(names)]})
+        return api
+
+    def test_find_by_name_limited(self):
+        api = self._find_api('vol')
+        vol = volumes.VolumeManager(api).find(name='vol')
+        self.assertEqual('0', vol.id)
+        api.client.get.assert_called_once_with(
+            '/volumes/detail?all_tenants=1&limit=2&name=vol')
+
+    def test_find_by_name_ambiguous(self):
+        api = self._find_api('vol', 'vol')
+        self.assertRaises(exceptions.NoUniqueMatch,
+                          volumes.VolumeManager(api).find, name='vol')
+        self.assertEqual(1, api.client.get.call_count)
+
+    def test_find_by_name_inexact_server_filter(self):
+        # The server returned two items but only one is an exact match, a
+        # full listing is needed to tell whether the name is unique.
+        api = self._find_api('vol', 'vol2')
+        vol = volumes.VolumeManager(api).find(name='vol')
+        self.assertEqual('0', vol.id)
+        api.client.get.assert_has_calls([
+            mock.call('/volumes/detail?all_tenants=1&limit=2&name=vol'),
+            mock.call('/volumes/detail?all_tenants=1&name=vol')])
+
+    def test_find_by_other_attribute_not_limited(self):
+        api = self._find_api('vol')
+        vol = volumes.VolumeManager(api).find(id='0')
+        self.assertEqual('vol', vol.name)
+        api.client.get.assert_called_once_with(
+            '/volumes/detail?all_tenants=1')
+
     def test_to_dict(self):
         r1 = base.Resource(None, {'id': 1, 'name': 'hi'})
         self.assertEqual({'id': 1, 'name': 'hi'}, r1.to_dict())
@@ -141,6 +183,321 @@ class BaseTest(utils.TestCase):
         result = [r.name for r in res]
         self.assertListEqual(['1', '2', '3'], result)
 
+    def test__list_with_limit_across_pages(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '1'}, {'name': '2'}],
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u2}]}),
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '3'}, {'name': '4'}],
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u3}]}),
+        ]
+        manager = test_utils.FakeManager(api)
+        res = manager._list(mock.sentinel.url, 'resp_keys', limit=3)
+        self.assertEqual(2, api.client.get.call_count)
+        self.assertListEqual(['1', '2', '3'], [r.name for r in res])
+
+    def test__list_with_count(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '1'}], 'count': 2,
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u2}]}),
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '2'}], 'count': 2}),
+        ]
+        manager = test_utils.FakeManager(api)
+        res, count = manager._list(mock.sentinel.url, 'resp_keys')
+        self.assertEqual(2, count)
+        self.assertListEqual(['1', '2'], [r.name for r in res])
+
+    def test__list_many_pages(self):
+        # Pages are followed iteratively, deep listings must not recurse.
+        pages = 5000
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': str(i)}],
+              'resp_keys_links': [{'rel': 'next', 'href': i + 1}]
+              if i + 1 < pages else []})
+            for i in range(pages)]
+        manager = test_utils.FakeManager(api)
+        res = manager._list(0, 'resp_keys')
+        self.assertEqual(pages, len(res))
+
+    def test__iter_is_lazy(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '1'}, {'name': '2'}],
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u2}]}),
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '3'}]}),
+        ]
+        manager = test_utils.FakeManager(api)
+        res = manager._iter(mock.sentinel.url, 'resp_keys')
+        self.assertFalse(api.client.get.called)
+        self.assertEqual('1', next(res).name)
+        self.assertEqual('2', next(res).name)
+        api.client.get.assert_called_once_with(mock.sentinel.url)
+        self.assertEqual('3', next(res).name)
+        self.assertRaises(StopIteration, next, res)
+        self.assertEqual(2, api.client.get.call_count)
+
+    def test__iter_pages(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (create_response_obj_with_header(),
+             {'resp_keys': [{'name': '1'}, {'name': '2'}], 'count': 3,
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u2}]}),
+            (create_response_obj_with_header(),
+             {'resp_keys': [{'name': '3'}], 'count': 3}),
+        ]
+        manager = test_utils.FakeManager(api)
+        pages = list(manager._iter(mock.sentinel.url, 'resp_keys',
+                                   pages=True))
+        self.assertEqual(2, len(pages))
+        self.assertIsInstance(pages[0], base.ListPage)
+        self.assertEqual(['1', '2'], [r.name for r in pages[0]])
+        self.assertEqual(mock.sentinel.u2, pages[0].next_url)
+        self.assertEqual(3, pages[0].count)
+        self.assertEqual([REQUEST_ID], pages[0].request_ids)
+        self.assertEqual(['3'], [r.name for r in pages[1]])
+        self.assertIsNone(pages[1].next_url)
+
+    def _paged_api(self, pages):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': str(i)}],
+              'resp_keys_links': [{'rel': 'next', 'href': i + 1}]
+              if i + 1 < pages else []})
+            for i in range(pages)]
+        return api
+
+    def test__iter_prefetch(self):
+        api = self._paged_api(10)
+        manager = test_utils.FakeManager(api)
+        res = manager._iter(0, 'resp_keys', prefetch=2)
+        self.assertEqual([str(i) for i in range(10)], [r.name for r in res])
+        self.assertEqual(10, api.client.get.call_count)
+
+    def test__iter_prefetch_pages(self):
+        api = self._paged_api(3)
+        manager = test_utils.FakeManager(api)
+        pages = manager._iter(0, 'resp_keys', pages=True, prefetch=1)
+        self.assertIsInstance(pages, base.PagePrefetcher)
+        self.assertEqual([['0'], ['1'], ['2']],
+                         [[r.name for r in page] for page in pages])
+        self.assertRaises(StopIteration, next, pages)
+
+    def test__iter_prefetch_is_bounded(self):
+        api = self._paged_api(10)
+        fetched = threading.Semaphore(0)
+        get = api.client.get.side_effect
+
+        def fetch(url):
+            try:
+                return next(get)
+            finally:
+                fetched.release()
+
+        api.client.get.side_effect = fetch
+        manager = test_utils.FakeManager(api)
+        pages = manager._iter(0, 'resp_keys', pages=True, prefetch=2)
+        # Two pages fit in the buffer and the worker holds a third one.
+        for i in range(3):
+            self.assertTrue(fetched.acquire(timeout=5))
+        self.assertFalse(fetched.acquire(timeout=0.3))
+        self.assertEqual(3, api.client.get.call_count)
+        pages.cancel()
+        self.assertRaises(StopIteration, next, pages)
+        pages._thread.join(5)
+        self.assertFalse(pages._thread.is_alive())
+        self.assertEqual(3, api.client.get.call_count)
+
+    def test__iter_prefetch_error(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'name': '1'}],
+              'resp_keys_links': [{'rel': 'next', 'href': 1}]}),
+            exceptions.ClientException(500),
+        ]
+        manager = test_utils.FakeManager(api)
+        res = manager._iter(0, 'resp_keys', prefetch=2)
+        self.assertEqual('1', next(res).name)
+        self.assertRaises(exceptions.ClientException, next, res)
+
+    def test__iter_prefetch_close(self):
+        api = self._paged_api(10)
+        manager = test_utils.FakeManager(api)
+        res = manager._iter(0, 'resp_keys', prefetch=1)
+        self.assertEqual('0', next(res).name)
+        with mock.patch.object(base.PagePrefetcher, 'cancel') as cancel:
+            res.close()
+        cancel.assert_called_once_with()
+
+    def _sharded_api(self, version, total=10, max_limit=3):
+        api = mock.Mock(api_version=api_versions.APIVersion(version))
+        vols = [{'id': str(i)} for i in range(total)]
+
+        def get(url):
+            query = dict(parse.parse_qsl(parse.urlsplit(url).query))
+            if 'marker' in query:
+                start = int(query['marker']) + 1
+            else:
+                start = int(query.get('offset', 0))
+            limit = min(int(query.get('limit', max_limit)), max_limit)
+            body = {'volumes': vols[start:start + limit]}
+            if start + limit < total:
+                body['volumes_links'] = [{
+                    'rel': 'next',
+                    'href': '/volumes/detail?limit=%s&marker=%s' % (
+                        query.get('limit', max_limit), start + limit - 1)}]
+            if query.get('with_count'):
+                body['count'] = total
+            return mock.sentinel.resp, body
+
+        api.client.get.side_effect = get
+        return api
+
+    def test_parallel_list(self):
+        api = self._sharded_api('3.45')
+        manager = volumes.VolumeManager(api)
+        res = manager.parallel_list(page_size=5, workers=3)
+        self.assertEqual([str(i) for i in range(10)], [v.id for v in res])
+        urls = sorted(c[0][0] for c in api.client.get.call_args_list)
+        self.assertEqual(['/volumes/detail?limit=3&offset=3',
+                          '/volumes/detail?limit=3&offset=6',
+                          '/volumes/detail?limit=3&offset=9',
+                          '/volumes/detail?limit=5&with_count=True'], urls)
+
+    def test_parallel_list_without_count(self):
+        api = self._sharded_api('3.44')
+        manager = volumes.VolumeManager(api)
+        res = manager.parallel_list(page_size=3)
+        self.assertEqual([str(i) for i in range(10)], [v.id for v in res])
+        api.client.get.assert_has_calls([
+            mock.call('/volumes/detail?limit=3'),
+            mock.call('/volumes/detail?limit=3&marker=2'),
+            mock.call('/volumes/detail?limit=3&marker=5'),
+            mock.call('/volumes/detail?limit=3&marker=8')])
+
+    def test_parallel_list_single_page(self):
+        api = self._sharded_api('3.45', total=2)
+        manager = volumes.VolumeManager(api)
+        res = manager.parallel_list()
+        self.assertEqual(['0', '1'], [v.id for v in res])
+        api.client.get.assert_called_once_with(
+            '/volumes/detail?limit=1000&with_count=True')
+
+    def test__list_raw(self):
+        api = mock.Mock()
+        api.client.get.side_effect = [
+            (mock.sentinel.resp,
+             {'resp_keys': [{'id': '1', 'size': 1, 'status': 'error'}, {}],
+              'resp_keys_links': [{'rel': 'next', 'href': mock.sentinel.u2}]}),
+            (mock.sentinel.resp,
+             {'resp_keys': [{'id': '2', 'size': 2, 'status': 'available'}]}),
+        ]
+        manager = test_utils.FakeManager(api)
+        res = manager._list(mock.sentinel.url, 'resp_keys',
+                            fields=['id', 'status', 'project'], raw=True)
+        self.assertEqual([{'id': '1', 'status': 'error'},
+                          {'id': '2', 'status': 'available'}], res)
+
+    def test__iter_raw(self):
+        api = mock.Mock()
+        api.client.get.return_value = (mock.sentinel.resp,
+                                       {'resp_keys': [{'id': '1'}]})
+        manager = test_utils.FakeManager(api)
+        res = manager._iter(mock.sentinel.url, 'resp_keys', raw=True)
+        self.assertEqual([{'id': '1'}], list(res))
+
+    def test_parallel_list_raw(self):
+        api = self._sharded_api('3.45')
+        manager = volumes.VolumeManager(api)
+        res = manager.parallel_list(page_size=5, fields=['id'], raw=True)
+        self.assertEqual([{'id': str(i)} for i in range(10)], res)
+
+    def test_compact_resource(self):
+        class HumanResource(base.Resource):
+            HUMAN_ID = True
+
+        r = HumanResource(None, {'id': 1, 'name': 'My Vol'}, loaded=True,
+                          compact=True)
+        self.assertNotIn('name', r.__dict__)
+        self.assertEqual('My Vol', r.name)
+        self.assertEqual('my-vol', r.human_id)
+        self.assertEqual({'id': 1, 'name': 'My Vol'}, r.to_dict())
+        self.assertRaises(AttributeError, getattr, r, 'size')
+        r.name = 'renamed'
+        self.assertEqual('renamed', r.name)
+
+    def test_compact_resource_repr(self):
+        r = base.Resource(None, dict(foo="bar", baz="spam"), compact=True)
+        self.assertEqual("<Resource baz=spam, foo=bar>", repr(r))
+
+    def test_compact_resource_equal(self):
+        info = {'id': 1, 'name': 'hello'}
+        self.assertEqual(base.Resource(None, dict(info)),
+                         base.Resource(None, dict(info), compact=True))
+
+    def test_compact_resource_lazy_load(self):
+        manager = mock.Mock()
+        manager.get.return_value = base.Resource(None, {'id': 1, 'size': 2})
+        r = base.Resource(manager, {'id': 1}, compact=True)
+        self.assertEqual(2, r.size)
+        manager.get.assert_called_once_with(1)
+
+    def test__list_compact(self):
+        api = mock.Mock(compact_resources=True)
+        api.client.get.return_value = (
+            create_response_obj_with_header(),
+            {'resp_keys': [{'name': '1'}, {'name': '2'}]})
+        manager = test_utils.FakeManager(api)
+        res = manager._list(mock.sentinel.url, 'resp_keys',
+                            obj_class=base.Resource)
+        self.assertEqual(['1', '2'], [r.name for r in res])
+        self.assertTrue(all(r._compact for r in res))
+        self.assertIs(res[0].request_ids, res[1].request_ids)
+        self.assertEqual([REQUEST_ID], res[0].request_ids)
+
+        # Appending to the request ids of one resource must not change the
+        # other resources of the page.
+        res[0].append_request_ids('req-2')
+        self.assertEqual([REQUEST_ID, 'req-2'], res[0].request_ids)
+        self.assertEqual([REQUEST_ID], res[1].request_ids)
+
+    def test__list_not_compact(self):
+        api = mock.Mock()
+        api.client.get.return_value = (mock.sentinel.resp,
+                                       {'resp_keys': [{'name': '1'}]})
+        manager = test_utils.FakeManager(api)
+        res = manager._list(mock.sentinel.url, 'resp_keys',
+                            obj_class=base.Resource)
+        self.assertFalse(res[0]._compact)
+        self.assertIn('name', res[0].__dict__)
+
+    def test_compact_resource_memory(self):
+        info = fakes_base._stub_volume()
+
+        def allocated(**kwargs):
+            request_ids = common_base.SharedRequestIds()
+            tracemalloc.start()
+            try:
+                resources = [  # noqa: F841
+                    volumes.Volume(None, dict(info), loaded=True,
+                                   request_ids=request_ids, **kwargs)
+                    for i in range(100)]
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(allocated(compact=True), allocated() * 0.75)
+
 
 class ListWithMetaTest(utils.TestCase):
     def test_list_with_meta(self):
@@ -0,0 +1,525 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import json
+import os
+from unittest import mock
+
+import fixtures
+from keystoneauth1 import fixture as ks_fixture
+from keystoneauth1.identity import v3 as v3_auth
+
+from cinderclient import api_versions
+from cinderclient import base
+from cinderclient import cache
+from cinderclient import client as base_client
+from cinderclient import exceptions
+from cinderclient.tests.unit import utils
+from cinderclient.tests.unit.v3 import fakes
+from cinderclient import utils as cinderclient_utils
+from cinderclient.v3 import client
+from cinderclient.v3 import volumes
+
+
+def _volume(volume_id, name):
+    return volumes.Volume(None, {'id': volume_id, 'name': name}, loaded=True)
+
+
+class NameCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(NameCacheTest, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cache = cache.NameCache('http://cinder/v3 project',
+                                     cache_dir=self.cache_dir)
+
+    def test_add_and_get(self):
+        self.cache.add('volume', [_volume('1', 'a'), _volume('2', 'b')])
+        self.assertEqual('1', self.cache.get('volume', 'a'))
+        self.assertEqual('2', self.cache.get('volume', 'b'))
+        self.assertIsNone(self.cache.get('volume', 'c'))
+        self.assertIsNone(self.cache.get('snapshot', 'a'))
+
+    def test_persisted(self):
+        self.cache.add('volume', [_volume('1', 'a')])
+        other = cache.NameCache('http://cinder/v3 project',
+                                cache_dir=self.cache_dir)
+        self.assertEqual('1', other.get('volume', 'a'))
+
+    def test_scoped(self):
+        self.cache.add('volume', [_volume('1', 'a')])
+        other = cache.NameCache(lambda: 'http://cinder/v3 other',
+                                cache_dir=self.cache_dir)
+        self.assertIsNone(other.get('volume', 'a'))
+        self.assertNotEqual(self.cache.path, other.path)
+
+    def test_ttl(self):
+        self.cache.ttl = 10
+        with mock.patch('time.time', return_value=100):
+            self.cache.add('volume', [_volume('1', 'a')])
+        with mock.patch('time.time', return_value=109):
+            self.assertEqual('1', self.cache.get('volume', 'a'))
+        with mock.patch('time.time', return_value=110):
+            self.assertIsNone(self.cache.get('volume', 'a'))
+
+    def test_ambiguous_name_not_cached(self):
+        self.cache.add('volume', [_volume('1', 'a'), _volume('2', 'a')])
+        self.assertIsNone(self.cache.get('volume', 'a'))
+
+    def test_add_replaces(self):
+        self.cache.add('volume', [_volume('1', 'a')])
+        self.cache.add('volume', [_volume('2', 'a')])
+        self.assertEqual('2', self.cache.get('volume', 'a'))
+
+    def test_discard(self):
+        self.cache.add('volume', [_volume('1', 'a'), _volume('2', 'b')])
+        self.cache.discard('volume', '1')
+        self.assertIsNone(self.cache.get('volume', 'a'))
+        self.assertEqual('2', self.cache.get('volume', 'b'))
+
+    def test_corrupted_file(self):
+        os.makedirs(os.path.dirname(self.cache.path), exist_ok=True)
+        with open(self.cache.path, 'w') as f:
+            f.write('not json')
+        self.assertIsNone(self.cache.get('volume', 'a'))
+        self.cache.add('volume', [_volume('1', 'a')])
+        self.assertEqual('1', self.cache.get('volume', 'a'))
+
+    def test_unwritable_directory(self):
+        name_cache = cache.NameCache('scope', cache_dir='/proc/no/such/dir')
+        name_cache.add('volume', [_volume('1', 'a')])
+        self.assertEqual('1', name_cache.get('volume', 'a'))
+
+    def test_concurrent_updates_merged(self):
+        other = cache.NameCache('http://cinder/v3 project',
+                                cache_dir=self.cache_dir)
+        self.cache.add('volume', [_volume('1', 'a'), _volume('2', 'b')])
+        self.assertEqual('1', other.get('volume', 'a'))
+        # Both instances loaded the file, then update it in turn.
+        self.cache.add('volume', [_volume('3', 'c')])
+        other.add('volume', [_volume('4', 'd')])
+        other.discard('volume', '1')
+        reader = cache.NameCache('http://cinder/v3 project',
+                                 cache_dir=self.cache_dir)
+        self.assertIsNone(reader.get('volume', 'a'))
+        self.assertEqual(['2', '3', '4'],
+                         [reader.get('volume', name) for name in 'bcd'])
+
+    @mock.patch.object(cache, 'fcntl')
+    def test_file_locked(self, mock_fcntl):
+        self.cache.add('volume', [_volume('1', 'a')])
+        mock_fcntl.flock.assert_called_once_with(mock.ANY,
+                                                 mock_fcntl.LOCK_EX)
+        self.assertEqual(self.cache.path + '.lock',
+                         mock_fcntl.flock.call_args[0][0].name)
+
+    @mock.patch.object(cache, 'fcntl', None)
+    def test_without_fcntl(self):
+        self.cache.add('volume', [_volume('1', 'a')])
+        self.assertEqual('1', self.cache.get('volume', 'a'))
+
+
+class ManagerNameCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(ManagerNameCacheTest, self).setUp()
+        self.cs = fakes.FakeClient()
+        self.cs.name_cache = cache.NameCache(
+            'scope', cache_dir=self.useFixture(fixtures.TempDir()).path)
+
+    def test_filled_by_find(self):
+        self.cs.volumes.find(name='sample-volume')
+        self.assertEqual('1234',
+                         self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_not_filled_by_listing_or_create(self):
+        self.cs.volumes.list()
+        self.cs.volumes.create(1)
+        self.assertIsNone(self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_not_filled_by_other_lookups(self):
+        self.cs.volumes.find(name='sample-volume', status='available')
+        self.assertIsNone(self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_discarded_on_delete(self):
+        self.cs.volumes.find(name='sample-volume')
+        self.cs.volumes.delete('1234')
+        self.assertIsNone(self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_not_discarded_on_subresource_delete(self):
+        self.cs.name_cache.add('volume', [_volume('key1', 'other')])
+        self.cs.volumes.delete_metadata('1234', ['key1'])
+        self.assertEqual('key1', self.cs.name_cache.get('volume', 'other'))
+
+    def test_duplicate_names_on_several_pages(self):
+        pages = [
+            {'volumes': [{'id': '1', 'name': 'db'}],
+             'volumes_links': [{'rel': 'next',
+                                'href': '/volumes/detail?marker=1'}]},
+            {'volumes': [{'id': '2', 'name': 'db'}]}]
+        self.cs.client.get_volumes_detail = mock.Mock(
+            side_effect=lambda **kw: (200, {}, pages[1 if kw.get('marker')
+                                                     else 0]))
+        self.cs.volumes.list()
+        self.assertRaises(exceptions.CommandError,
+                          cinderclient_utils.find_resource,
+                          self.cs.volumes, 'db')
+        self.assertIsNone(self.cs.name_cache.get('volume', 'db'))
+
+    def test_find_resource_uses_cache(self):
+        cinderclient_utils.find_resource(self.cs.volumes, 'sample-volume')
+        self.cs.client.callstack = []
+        vol = cinderclient_utils.find_resource(self.cs.volumes,
+                                               'sample-volume')
+        self.assertEqual(1234, vol.id)
+        self.assertEqual([('GET', '/volumes/1234', None)],
+                         [c[:3] for c in self.cs.client.callstack])
+
+    def test_find_resource_stale_entry(self):
+        self.cs.name_cache.add('volume', [_volume('5678', 'sample-volume')])
+        self.cs.client.get_volumes_5678 = mock.Mock(
+            side_effect=exceptions.NotFound(404))
+        vol = cinderclient_utils.find_resource(self.cs.volumes,
+                                               'sample-volume')
+        self.assertEqual(1234, vol.id)
+        self.cs.client.get_volumes_5678.assert_called_once_with()
+        # The lookup refreshed the entry.
+        self.assertEqual('1234',
+                         self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_find_resource_renamed(self):
+        self.cs.name_cache.add('volume', [_volume('1234', 'old-name')])
+        self.assertRaises(exceptions.CommandError,
+                          cinderclient_utils.find_resource,
+                          self.cs.volumes, 'old-name')
+        self.assertIsNone(self.cs.name_cache.get('volume', 'old-name'))
+
+    def test_manager_without_cache(self):
+        self.cs.name_cache = None
+        self.assertIsNone(self.cs.volumes.name_cache)
+        self.assertIsNone(base.Manager(mock.Mock()).name_cache)
+
+    def test_client_option(self):
+        cs = client.Client('user', 'password', 'project', 'http://auth/v3',
+                           name_cache=True, name_cache_ttl=60)
+        self.assertEqual(60, cs.name_cache.ttl)
+        cs.client.management_url = 'http://cinder/v3/project'
+        self.assertEqual('http://cinder/v3/project project',
+                         cs._get_cache_scope())
+        self.assertIsNone(client.Client().name_cache)
+
+
+class AuthCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(AuthCacheTest, self).setUp()
+        self.cache = cache.AuthCache(
+            cache_dir=self.useFixture(fixtures.TempDir()).path)
+
+    def _auth(self, password='password'):
+        return v3_auth.Password('http://keystone/v3', username='user',
+                                password=password, project_name='project',
+                                user_domain_id='default',
+                                project_domain_id='default')
+
+    def _authenticated(self, expires_in=3600, **kwargs):
+        auth = self._auth(**kwargs)
+        token = ks_fixture.V3Token()
+        token.expires = token.issued + datetime.timedelta(seconds=expires_in)
+        token.set_project_scope()
+        auth.set_auth_state(json.dumps({'auth_token': 'token-id',
+                                        'body': token}))
+        return auth
+
+    def test_discovery(self):
+        self.assertIsNone(self.cache.get_discovery('http://keystone'))
+        self.cache.set_discovery('http://keystone', None, 'http://keystone/v3')
+        self.assertEqual((None, 'http://keystone/v3'),
+                         self.cache.get_discovery('http://keystone'))
+        self.assertIsNone(self.cache.get_discovery('http://other'))
+        self.cache.discovery_ttl = 0
+        self.assertIsNone(self.cache.get_discovery('http://keystone'))
+
+    def test_token_reused(self):
+        self.cache.save_auth(self._authenticated())
+        auth = self._auth()
+        self.assertTrue(self.cache.load_auth(auth))
+        self.assertEqual('token-id', auth.auth_ref.auth_token)
+
+    def test_token_scoped_to_auth_options(self):
+        self.cache.save_auth(self._authenticated())
+        auth = self._auth(password='other')
+        self.assertFalse(self.cache.load_auth(auth))
+        self.assertIsNone(auth.auth_ref)
+
+    def test_token_expiring_soon(self):
+        self.cache.save_auth(self._authenticated(
+            expires_in=cache.TOKEN_EXPIRY_MARGIN - 10))
+        auth = self._auth()
+        self.assertFalse(self.cache.load_auth(auth))
+        self.assertIsNone(auth.auth_ref)
+
+    def test_private_files(self):
+        auth = self._authenticated()
+        self.cache.save_auth(auth)
+        path = self.cache._path('token', auth.get_cache_id())
+        self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+        self.assertEqual(0o700, os.stat(self.cache.cache_dir).st_mode & 0o777)
+
+        os.chmod(path, 0o644)
+        self.assertFalse(cache.AuthCache(
+            cache_dir=os.path.dirname(self.cache.cache_dir)).load_auth(
+                self._auth()))
+
+    def test_corrupted_file(self):
+        auth = self._auth()
+        path = self.cache._path('token', auth.get_cache_id())
+        os.makedirs(self.cache.cache_dir, 0o700)
+        with open(path, 'w') as f:
+            f.write('{"auth_state": "not json"}')
+        os.chmod(path, 0o600)
+        self.assertFalse(self.cache.load_auth(auth))
+
+
+class VersionCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(VersionCacheTest, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cache = cache.VersionCache('http://cinder/v3',
+                                        cache_dir=self.cache_dir)
+
+    def test_set_and_get(self):
+        self.assertIsNone(self.cache.get())
+        self.cache.set('3.0', '3.70')
+        self.assertEqual(('3.0', '3.70'), self.cache.get())
+        other = cache.VersionCache(lambda: 'http://other/v3',
+                                   cache_dir=self.cache_dir)
+        self.assertIsNone(other.get())
+        other.set('3.0', '3.60')
+        self.assertEqual(('3.0', '3.70'), self.cache.get())
+
+    def test_ttl(self):
+        self.cache.ttl = 10
+        with mock.patch('time.time', return_value=100):
+            self.cache.set('3.0', '3.70')
+        with mock.patch('time.time', return_value=110):
+            self.assertIsNone(self.cache.get())
+
+    def test_discard(self):
+        self.cache.set('3.0', '3.70')
+        self.cache.discard()
+        self.assertIsNone(self.cache.get())
+
+    def test_discover_version(self):
+        cs = mock.Mock(version_cache=self.cache)
+        cs.services.server_api_version.return_value = [
+            mock.Mock(version='3.50', min_version='3.0')]
+        for _ in range(2):
+            self.assertEqual(
+                api_versions.APIVersion('3.50'),
+                api_versions.discover_version(
+                    cs, api_versions.APIVersion('3.latest')))
+        cs.services.server_api_version.assert_called_once_with()
+
+    def test_discarded_when_not_acceptable(self):
+        self.cache.set('3.0', '3.70')
+        http_client = base_client.SessionClient(session=mock.Mock())
+        http_client.version_cache = self.cache
+        with mock.patch.object(http_client, 'request',
+                               side_effect=exceptions.NotAcceptable(406)):
+            self.assertRaises(exceptions.NotAcceptable, http_client.get,
+                              '/volumes')
+        self.assertIsNone(self.cache.get())
+
+    def test_client_option(self):
+        cs = client.Client('user', 'password', 'project', 'http://auth/v3',
+                           version_cache=True, version_cache_ttl=60)
+        self.assertEqual(60, cs.version_cache.ttl)
+        self.assertIs(cs.version_cache, cs.client.version_cache)
+        cs.client.management_url = 'http://cinder/v3/project'
+        self.assertEqual('http://cinder/v3/project', cs._get_endpoint())
+        self.assertIsNone(client.Client().version_cache)
+
+
+class ResponseCacheTest(utils.TestCase):
+
+    def test_lru(self):
+        response_cache = cache.ResponseCache(max_entries=2)
+        response_cache.set('a', '"1"', {'id': 'a'})
+        response_cache.set('b', '"2"', {'id': 'b'})
+        self.assertEqual('"1"', response_cache.get_etag('a'))
+        response_cache.set('c', '"3"', {'id': 'c'})
+
+        self.assertIsNone(response_cache.get_etag('b'))
+        self.assertEqual({'id': 'a'}, response_cache.get_body('a'))
+        # Responses without ETag are not cached.
+        response_cache.set('a', None, {'id': 'a'})
+        self.assertIsNone(response_cache.get_etag('a'))
+        self.assertEqual({'hits': 1, 'misses': 4, 'evictions': 1,
+                          'entries': 1}, response_cache.get_stats())
+
+    @mock.patch('requests.Session.request')
+    def test_conditional_get(self, mock_request):
+        body = '{"volume": {"id": "1234", "status": "available"}}'
+        mock_request.side_effect = [
+            utils.TestResponse({'status_code': 200, 'text': body,
+                                'headers': {'ETag': '"v1"'}}),
+            utils.TestResponse({'status_code': 304, 'text': '',
+                                'headers': {'ETag': '"v1"'}})]
+        cs = client.Client('user', 'password', 'project', 'http://auth/v3',
+                           response_cache=True)
+        cs.client.management_url = 'http://cinder/v3/project'
+        cs.client.auth_token = 'token'
+
+        volume = cs.volumes.get('1234')
+        volume.status = 'changed'
+        volume.get()
+
+        self.assertEqual('available', volume.status)
+        self.assertNotIn('If-None-Match',
+                         mock_request.call_args_list[0][1]['headers'])
+        self.assertEqual('"v1"',
+                         mock_request.call_args[1]['headers']['If-None-Match'])
+        self.assertEqual(1, cs.response_cache.get_stats()['hits'])
+
+    @mock.patch('requests.Session.request')
+    def test_other_microversion(self, mock_request):
+        mock_request.return_value = utils.TestResponse(
+            {'status_code': 200, 'text': '{}', 'headers': {'ETag': '"v1"'}})
+        http_client = base_client.HTTPClient('user', 'password', 'project',
+                                             'http://auth/v3')
+        http_client.management_url = 'http://cinder/v3/project'
+        http_client.auth_token = 'token'
+        http_client.response_cache = cache.ResponseCache()
+
+        http_client.get('/volumes/1234')
+        http_client.api_version = api_versions.APIVersion('3.10')
+        http_client.get('/volumes/1234')
+
+        self.assertNotIn('If-None-Match', mock_request.call_args[1]['headers'])
+
+    def test_session_client(self):
+        http_client = base_client.SessionClient(session=mock.Mock())
+        http_client.response_cache = cache.ResponseCache()
+        responses = [
+            (utils.TestResponse({'status_code': 200,
+                                 'headers': {'ETag': '"v1"'}}), {'a': 1}),
+            (utils.TestResponse({'status_code': 304,
+                                 'headers': {'ETag': '"v1"'}}), None)]
+        with mock.patch.object(http_client, 'request',
+                               side_effect=responses) as mock_request:
+            self.assertEqual({'a': 1}, http_client.get('/volumes/1')[1])
+            self.assertEqual({'a': 1}, http_client.get('/volumes/1')[1])
+        mock_request.assert_called_with(
+            '/volumes/1', 'GET', authenticated=True,
+            headers={'If-None-Match': '"v1"'})
+
+    def test_client_option(self):
+        cs = client.Client(response_cache=True, response_cache_size=10)
+        self.assertEqual(10, cs.response_cache.max_entries)
+        self.assertIs(cs.response_cache, cs.client.response_cache)
+        self.assertIsNone(client.Client().response_cache)
+
+
+class CatalogCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(CatalogCacheTest, self).setUp()
+        self.cs = fakes.FakeClient()
+        self.cs.catalog_cache = cache.CatalogCache(
+            ttl={'availability_zones': 10})
+
+    def test_cached(self):
+        for _ in range(2):
+            self.assertEqual([1, 2],
+                             [t.id for t in self.cs.volume_types.list()])
+            self.cs.volume_types.get('1')
+            self.cs.availability_zones.list()
+        self.assertEqual(3, len(self.cs.client.callstack))
+        # Other arguments are other requests.
+        self.cs.volume_types.list(is_public=True)
+        self.cs.volume_types.get(volumes.Volume(None, {'id': '1'}))
+        self.assertEqual(4, len(self.cs.client.callstack))
+        self.assertEqual({'hits': 4, 'misses': 4},
+                         self.cs.catalog_cache.get_stats())
+
+    def test_copies(self):
+        volume_type = self.cs.volume_types.get('1')
+        volume_type.name = 'changed'
+        volume_types = self.cs.volume_types.list()
+        volume_types[0].name = 'changed'
+        volume_types.append(volume_type)
+        self.assertNotEqual('changed', self.cs.volume_types.get('1').name)
+        volume_types = self.cs.volume_types.list()
+        self.assertEqual(2, len(volume_types))
+        self.assertNotEqual('changed', volume_types[0].name)
+        self.assertIs(self.cs.volume_types, volume_types[0].manager)
+        self.assertEqual(2, len(self.cs.client.callstack))
+
+    def test_per_microversion(self):
+        self.cs.api_version = api_versions.APIVersion('3.0')
+        self.cs.volume_types.list()
+        self.cs.volume_types.list()
+        self.cs.api_version = api_versions.APIVersion('3.52')
+        self.cs.volume_types.list()
+        self.assertEqual(2, len(self.cs.client.callstack))
+
+    def test_ttl(self):
+        with mock.patch('time.monotonic', return_value=100):
+            self.cs.availability_zones.list()
+            self.cs.volume_types.list()
+        with mock.patch('time.monotonic', return_value=110):
+            self.cs.availability_zones.list()
+            self.cs.volume_types.list()
+        self.assertEqual(3, len(self.cs.client.callstack))
+
+    def test_invalidated(self):
+        volume_type = self.cs.volume_types.get('1')
+        self.cs.qos_specs.list()
+        volume_type.set_keys({'k': 'v'})
+        self.cs.volume_types.get('1')
+        self.cs.qos_specs.list()
+        self.assertEqual(4, len(self.cs.client.callstack))
+
+        self.cs.qos_specs.associate('1B6B6A04-A927-4AEB-810B-B7BAAD49F57C',
+                                    '1')
+        self.cs.volume_types.get('1')
+        self.cs.qos_specs.list()
+        self.assertEqual(7, len(self.cs.client.callstack))
+
+    def test_invalidated_by_default_types(self):
+        self.cs.api_version = api_versions.APIVersion('3.62')
+        project_id = '629632e7-99d2-4c40-9ae3-106fa3b1c9b7'
+        self.cs.volume_types.default()
+        self.cs.default_types.create('1', project_id)
+        self.cs.volume_types.default()
+        self.cs.default_types.delete(project_id)
+        self.cs.volume_types.default()
+        self.assertEqual(5, len(self.cs.client.callstack))
+        self.assertEqual(3, [c[:2] for c in self.cs.client.callstack].count(
+            ('GET', '/types/default')))
+
+    def test_refresh(self):
+        self.cs.volume_types.default()
+        self.cs.catalog_cache.refresh('qos_specs')
+        self.cs.volume_types.default()
+        self.cs.catalog_cache.refresh()
+        self.cs.volume_types.default()
+        self.assertEqual(2, len(self.cs.client.callstack))
+
+    def test_client_option(self):
+        cs = client.Client(catalog_cache=True, catalog_cache_ttl=60)
+        self.assertEqual(60, cs.catalog_cache.get_ttl('volume_types'))
+        self.assertIsNone(client.Client().catalog_cache)
+        self.assertIsNone(client.Client().volume_types.catalog_cache)
@@ -11,8 +11,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.metadata
 import json
 import logging
+import os
+import sys
 from unittest import mock
 
 import ddt
@@ -24,8 +27,13 @@ from oslo_serialization import jsonutils
 from cinderclient import api_versions
 import cinderclient.client
 from cinderclient import exceptions
+import cinderclient.extension
+from cinderclient import ratelimit
+from cinderclient.tests.unit import fake_actions_module
 from cinderclient.tests.unit import utils
 from cinderclient.tests.unit.v3 import fakes
+from cinderclient.v3 import client as v3_client
+from cinderclient.v3 import volumes
 
 
 @ddt.ddt
@@ -53,6 +61,16 @@ class ClientTest(utils.TestCase):
                          httpclient_mock.call_args[1].get('os_endpoint'))
         session_mock.assert_not_called()
 
+    def test_construct_http_client_pool_options(self):
+        cs = cinderclient.client.Client('3.0', 'user', 'password',
+                                        'project_id', 'http://auth/v3',
+                                        pool_connections=2, pool_maxsize=20,
+                                        keep_alive=False)
+        http_adapter = cs.client.http.get_adapter('http://example.com')
+        self.assertEqual(2, http_adapter._pool_connections)
+        self.assertEqual(20, http_adapter._pool_maxsize)
+        self.assertFalse(cs.client.keep_alive)
+
     def test_log_req(self):
         self.logger = self.useFixture(
             fixtures.FakeLogger(
@@ -217,6 +235,43 @@ class ClientTest(utils.TestCase):
                           mock.sentinel.url, 'GET')
         self.assertIsNotNone(session_client._logger)
 
+    @mock.patch.object(cinderclient.client, 'sleep')
+    @mock.patch.object(cinderclient.client.SessionClient, 'request')
+    def test_sessionclient_retries(self, mock_request, mock_sleep):
+        mock_request.side_effect = [
+            exceptions.ClientException(500),
+            exceptions.ClientException(502),
+            (mock.sentinel.resp, mock.sentinel.body)]
+        session_client = cinderclient.client.SessionClient(
+            session=mock.Mock(), retries=2)
+
+        self.assertEqual((mock.sentinel.resp, mock.sentinel.body),
+                         session_client.get('/volumes'))
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(2, session_client.retry_policy.get_stats()['retries'])
+
+        # POST is not idempotent, it is not sent again.
+        mock_request.side_effect = [exceptions.ClientException(500)]
+        self.assertRaises(exceptions.ClientException, session_client.post,
+                          '/volumes')
+
+    @mock.patch.object(cinderclient.client, 'sleep')
+    @mock.patch.object(cinderclient.client.SessionClient, 'request')
+    def test_sessionclient_rate_limiter(self, mock_request, mock_sleep):
+        mock_request.return_value = (mock.sentinel.resp, mock.sentinel.body)
+        limiter = ratelimit.RateLimiter()
+        limiter.add_limit('POST', '^/volumes', 60, 'MINUTE', remaining=1)
+        session_client = cinderclient.client.SessionClient(
+            session=mock.Mock(), rate_limiter=limiter)
+
+        session_client.post('/volumes')
+        session_client.get('/volumes')
+        mock_sleep.assert_not_called()
+
+        session_client.post('/volumes')
+        mock_sleep.assert_called_once_with(mock.ANY)
+        self.assertAlmostEqual(1, mock_sleep.call_args[0][0], places=2)
+
     @mock.patch.object(exceptions, 'from_response')
     def test_keystone_request_raises_auth_failure_exception(
             self, mock_from_resp):
@@ -269,6 +324,112 @@ class ClientTest(utils.TestCase):
         self.assertEqual(mock_request.return_value, res)
 
 
+class LazyManagersTest(utils.TestCase):
+
+    def test_built_on_first_access(self):
+        cs = v3_client.Client()
+        self.assertNotIn('volumes', vars(cs))
+        manager = cs.volumes
+        self.assertIsInstance(manager, volumes.VolumeManager)
+        self.assertIs(cs, manager.api)
+        self.assertIs(manager, vars(cs)['volumes'])
+        self.assertIs(manager, cs.volumes)
+        self.assertIsNot(manager, v3_client.Client().volumes)
+
+    def test_extension_managers(self):
+        extensions = [mock.Mock(manager_class=mock.Mock(name='foo')),
+                      mock.Mock(manager_class=mock.Mock(name='volumes')),
+                      mock.Mock(manager_class=None)]
+        for extension, name in zip(extensions, ('foo', 'volumes', 'bar')):
+            extension.name = name
+        cs = v3_client.Client(extensions=extensions)
+        extensions[0].manager_class.assert_not_called()
+
+        self.assertIs(cs.foo, cs.foo)
+        extensions[0].manager_class.assert_called_once_with(cs)
+        self.assertEqual(extensions[1].manager_class.return_value,
+                         cs.volumes)
+        self.assertRaises(AttributeError, getattr, cs, 'bar')
+
+
+class DiscoverExtensionsTest(utils.TestCase):
+
+    def _discover(self, use_manifest=True):
+        return cinderclient.client.discover_extensions(
+            '3', use_manifest=use_manifest)
+
+    def test_manifest_reused(self):
+        extensions = self._discover()
+        self.assertEqual(['list_extensions'], [e.name for e in extensions])
+
+        with mock.patch('pkgutil.iter_modules') as iter_modules:
+            extensions = self._discover()
+        iter_modules.assert_not_called()
+        self.assertEqual(['list_extensions'], [e.name for e in extensions])
+        extension = extensions[0]
+        self.assertIsInstance(extension,
+                              cinderclient.extension.LazyExtension)
+        self.assertTrue(extension.has_attr('do_list_extensions'))
+        self.assertFalse(extension.has_attr('do_list'))
+        self.assertIsNone(extension._module)
+        self.assertEqual('ListExtManager',
+                         extension.manager_class.__name__)
+        self.assertTrue(callable(extension.module.do_list_extensions))
+
+    def test_manifest_invalidated(self):
+        self._discover()
+        path = self.useFixture(fixtures.TempDir()).path
+        with mock.patch('sys.path', sys.path + [path]), \
+                mock.patch('pkgutil.iter_modules',
+                           return_value=[]) as iter_modules:
+            extensions = self._discover()
+        iter_modules.assert_called_once_with()
+        self.assertIsInstance(extensions[0], cinderclient.extension.Extension)
+        self.assertNotIsInstance(extensions[0],
+                                 cinderclient.extension.LazyExtension)
+
+    @mock.patch('cinderclient.cache.store_manifest')
+    @mock.patch('cinderclient.cache.load_manifest')
+    def test_no_manifest_by_default(self, mock_load, mock_store):
+        self.useFixture(fixtures.EnvironmentVariable(
+            'CINDERCLIENT_UUID_CACHE_DIR'))
+        extensions = self._discover(use_manifest=False)
+        self.assertEqual(['list_extensions'], [e.name for e in extensions])
+        mock_load.assert_not_called()
+        mock_store.assert_not_called()
+
+    def test_manifest_with_cache_dir(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.EnvironmentVariable(
+            'CINDERCLIENT_UUID_CACHE_DIR', cache_dir))
+        self._discover(use_manifest=False)
+        self.assertEqual(['extensions-v3.json'], os.listdir(cache_dir))
+
+    def test_manifest_not_writable(self):
+        self.useFixture(fixtures.EnvironmentVariable(
+            'CINDERCLIENT_UUID_CACHE_DIR', '/proc/no/such/dir'))
+        with mock.patch('os.makedirs', side_effect=OSError):
+            extensions = self._discover()
+        self.assertEqual(['list_extensions'], [e.name for e in extensions])
+
+    def test_entry_points(self):
+        entry_point = importlib.metadata.EntryPoint(
+            name='fake', group='cinderclient.extension',
+            value='cinderclient.tests.unit.fake_actions_module')
+        entry_points = mock.Mock()
+        entry_points.select.return_value = [entry_point]
+        with mock.patch('importlib.metadata.entry_points',
+                        return_value=entry_points):
+            extensions = self._discover()
+        entry_points.select.assert_called_once_with(
+            group='cinderclient.extension')
+        self.assertIn('fake', [e.name for e in extensions])
+
+        extensions = dict((e.name, e) for e in self._discover())
+        self.assertTrue(extensions['fake'].has_attr('do_fake_action'))
+        self.assertIs(fake_actions_module, extensions['fake'].module)
+
+
 class ClientTestSensitiveInfo(utils.TestCase):
     def test_req_does_not_log_sensitive_info(self):
         self.logger = self.useFixture(
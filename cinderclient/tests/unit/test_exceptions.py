@@ -63,3 +63,21 @@ class ExceptionsTest(utils.TestCase):
         ex = exceptions.from_response(response, body)
         self.assertEqual(0, ex.retry_after)
         self.assertIs(exceptions.OverLimit, type(ex))
+
+    def test_from_response_retry_after(self):
+        for status, cls in ((429, exceptions.TooManyRequests),
+                            (503, exceptions.ServiceUnavailable)):
+            response = requests.Response()
+            response.status_code = status
+            response.headers = {"Retry-After": '3'}
+            ex = exceptions.from_response(response, {'keys': ({})})
+            self.assertEqual(3, ex.retry_after)
+            self.assertIs(cls, type(ex))
+
+    def test_from_response_retry_after_malformed(self):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers = {"Retry-After": 'soon'}
+        ex = exceptions.from_response(response, {'keys': ({})})
+        self.assertEqual(0, ex.retry_after)
+        self.assertIs(exceptions.TooManyRequests, type(ex))
@@ -12,6 +12,8 @@
 # limitations under the License.
 
 import json
+import threading
+import time
 from unittest import mock
 import uuid
 
@@ -19,6 +21,7 @@ import requests
 
 from cinderclient import client
 from cinderclient import exceptions
+from cinderclient import ratelimit
 from cinderclient.tests.unit import utils
 
 
@@ -121,7 +124,7 @@ class ClientTest(utils.TestCase):
     def test_get(self):
         cl = get_authed_client()
 
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -143,7 +146,7 @@ class ClientTest(utils.TestCase):
         global_id = "req-%s" % uuid.uuid4()
         cl = get_authed_client(global_request_id=global_id)
 
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -162,6 +165,69 @@ class ClientTest(utils.TestCase):
 
         test_get_call()
 
+    def test_session_is_reused(self):
+        cl = get_authed_client()
+
+        @mock.patch.object(requests, "request")
+        @mock.patch.object(requests.Session, "request", mock_request)
+        def test_get_call(module_request):
+            cl.get("/hi")
+            cl.get("/hi")
+            self.assertFalse(module_request.called)
+
+        test_get_call()
+        self.assertIsInstance(cl.http, requests.Session)
+
+    def test_pool_size(self):
+        cl = get_authed_client(pool_connections=4, pool_maxsize=32)
+        http_adapter = cl.http.get_adapter("https://example.com")
+        self.assertEqual(4, http_adapter._pool_connections)
+        self.assertEqual(32, http_adapter._pool_maxsize)
+
+    def test_pool_size_default(self):
+        cl = get_authed_client()
+        http_adapter = cl.http.get_adapter("http://example.com")
+        self.assertEqual(client.DEFAULT_POOL_CONNECTIONS,
+                         http_adapter._pool_connections)
+        self.assertEqual(client.DEFAULT_POOL_MAXSIZE,
+                         http_adapter._pool_maxsize)
+
+    def test_get_no_keep_alive(self):
+        cl = get_authed_client(keep_alive=False)
+
+        @mock.patch.object(requests.Session, "request", mock_request)
+        def test_get_call():
+            cl.get("/hi")
+            headers = {"X-Auth-Token": "token",
+                       "X-Auth-Project-Id": "project_id",
+                       "User-Agent": cl.USER_AGENT,
+                       "Connection": "close",
+                       'Accept': 'application/json', }
+            mock_request.assert_called_with(
+                "GET",
+                "http://example.com/hi",
+                headers=headers,
+                **self.TEST_REQUEST_BASE)
+
+        test_get_call()
+
+    def test_get_pool_stats(self):
+        cl = get_authed_client()
+        self.assertEqual({'requests': 0, 'handshakes': 0,
+                          'reuse_ratio': 0.0, 'open_connections': 0},
+                         cl.get_pool_stats())
+
+        open_conn = mock.Mock(sock=mock.Mock())
+        closed_conn = mock.Mock(sock=None)
+        pool = mock.Mock(num_requests=8, num_connections=2)
+        pool.pool.queue = [open_conn, closed_conn, None]
+        http_adapter = cl.http.get_adapter("https://example.com")
+        http_adapter.poolmanager.pools['example.com'] = pool
+
+        self.assertEqual({'requests': 8, 'handshakes': 2,
+                          'reuse_ratio': 0.75, 'open_connections': 1},
+                         cl.get_pool_stats())
+
     def test_get_reauth_0_retries(self):
         cl = get_authed_client(retries=0)
 
@@ -176,7 +242,7 @@ class ClientTest(utils.TestCase):
             cl.auth_token = "token"
 
         @mock.patch.object(cl, 'authenticate', reauth)
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -184,6 +250,38 @@ class ClientTest(utils.TestCase):
         test_get_call()
         self.assertEqual([], self.requests)
 
+    def test_concurrent_authentication(self):
+        cl = get_client()
+        started = threading.Event()
+
+        def authenticate():
+            started.set()
+            # Let the other threads reach the authentication.
+            time.sleep(0.05)
+            cl.management_url = "http://example.com"
+            cl.auth_token = "token"
+
+        cl.authenticate = mock.Mock(side_effect=authenticate)
+        with mock.patch.object(requests.Session, "request", mock_request):
+            threads = [threading.Thread(target=cl.get, args=('/hi',))
+                       for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertTrue(started.is_set())
+        cl.authenticate.assert_called_once_with()
+
+    def test_reauth_keeps_new_token(self):
+        cl = get_authed_client()
+        # Another thread authenticated again since the token was rejected.
+        cl._discard_token("old-token")
+        self.assertEqual("token", cl.auth_token)
+        self.assertEqual("http://example.com", cl.management_url)
+        cl._discard_token("token")
+        self.assertIsNone(cl.auth_token)
+        self.assertIsNone(cl.management_url)
+
     def test_get_retry_500(self):
         cl = get_authed_client(retries=1)
 
@@ -193,7 +291,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -211,7 +309,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -232,7 +330,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -249,7 +347,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -260,6 +358,19 @@ class ClientTest(utils.TestCase):
         self.assertEqual(200, resp.status_code)
         self.assertEqual([], self.requests)
 
+    @mock.patch.object(client, 'sleep')
+    def test_rate_limiter_absolute_url(self, mock_sleep):
+        limiter = ratelimit.RateLimiter()
+        limiter.add_limit('GET', '^/volumes', 1, 'HOUR', remaining=1)
+        cl = get_authed_client(rate_limiter=limiter)
+
+        with mock.patch.object(requests.Session, "request", mock_request):
+            cl.get('/volumes')
+            mock_sleep.assert_not_called()
+            # A next link of the listing.
+            cl.get('http://example.com/volumes?marker=1')
+        mock_sleep.assert_called_once_with(mock.ANY)
+
     def test_retry_limit(self):
         cl = get_authed_client(retries=1)
 
@@ -269,7 +380,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -287,7 +398,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         def test_get_call():
             resp, body = cl.get("/hi")
@@ -295,7 +406,7 @@ class ClientTest(utils.TestCase):
         self.assertRaises(exceptions.BadRequest, test_get_call)
         self.assertEqual([mock_request], self.requests)
 
-    def test_get_retry_400_socket(self):
+    def test_get_no_retry_400_with_retries(self):
         cl = get_authed_client(retries=1)
 
         self.requests = [bad_400_request, mock_request]
@@ -304,14 +415,32 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
             resp, body = cl.get("/hi")
 
-        test_get_call()
-        self.assertEqual([], self.requests)
+        self.assertRaises(exceptions.BadRequest, test_get_call)
+        self.assertEqual([mock_request], self.requests)
+
+    def test_post_no_retry_500(self):
+        cl = get_authed_client(retries=1)
+
+        self.requests = [bad_500_request, mock_request]
+
+        def request(*args, **kwargs):
+            next_request = self.requests.pop(0)
+            return next_request(*args, **kwargs)
+
+        @mock.patch.object(requests.Session, "request", request)
+        @mock.patch('time.time', mock.Mock(return_value=1234))
+        @mock.patch.object(client, 'sleep', mock.Mock())
+        def test_post_call():
+            cl.post("/hi", body=[1, 2, 3])
+
+        self.assertRaises(exceptions.ClientException, test_post_call)
+        self.assertEqual([mock_request], self.requests)
 
     def test_get_no_auth_url(self):
         client.HTTPClient("username", "password",
@@ -320,7 +449,7 @@ class ClientTest(utils.TestCase):
     def test_post(self):
         cl = get_authed_client()
 
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         def test_post_call():
             cl.post("/hi", body=[1, 2, 3])
             headers = {
@@ -348,7 +477,7 @@ class ClientTest(utils.TestCase):
         cl = get_client()
 
         # response must not have x-server-management-url header
-        @mock.patch.object(requests, "request", mock_request)
+        @mock.patch.object(requests.Session, "request", mock_request)
         def test_auth_call():
             self.assertRaises(exceptions.AuthorizationFailure,
                               cl.authenticate)
@@ -359,7 +488,7 @@ class ClientTest(utils.TestCase):
         cl = get_authed_client()
         cl.auth_url = 'http://example.com:5000/v3'
 
-        @mock.patch.object(requests, "request", mock_201_request)
+        @mock.patch.object(requests.Session, "request", mock_201_request)
         def test_auth_call():
             cl.authenticate()
             headers = {
@@ -410,7 +539,7 @@ class ClientTest(utils.TestCase):
             next_request = self.requests.pop(0)
             return next_request(*args, **kwargs)
 
-        @mock.patch.object(requests, "request", request)
+        @mock.patch.object(requests.Session, "request", request)
         @mock.patch('time.time', mock.Mock(return_value=1234))
         @mock.patch.object(client, 'sleep', mock.Mock())
         def test_get_call():
@@ -0,0 +1,129 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from cinderclient import ratelimit
+from cinderclient.tests.unit import utils
+from cinderclient.v3 import limits
+
+
+@mock.patch('cinderclient.ratelimit.time')
+class RateLimiterTest(utils.TestCase):
+
+    def test_reserve(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limiter = ratelimit.RateLimiter()
+        limiter.add_limit('POST', '^/volumes', 2, 'SECOND')
+
+        # The bucket is full at first, then requests are queued.
+        self.assertEqual([0, 0, 0.5, 1.0],
+                         [limiter.reserve('post', '/volumes')
+                          for i in range(4)])
+        # Unmatched requests are not delayed.
+        self.assertEqual(0, limiter.reserve('GET', '/volumes'))
+        self.assertEqual(0, limiter.reserve('POST', '/snapshots'))
+
+        # Tokens are added back over time.
+        mock_time.monotonic.return_value = 10
+        self.assertEqual(0, limiter.reserve('POST', '/volumes/detail'))
+        self.assertEqual({'requests': 7, 'delayed': 2, 'delay': 1.5},
+                         limiter.get_stats())
+
+    def test_reserve_many_limits(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limiter = ratelimit.RateLimiter()
+        limiter.add_limit('*', '.*', 60, 'MINUTE', remaining=1)
+        limiter.add_limit('DELETE', '^/volumes', 1, 'HOUR', remaining=0)
+
+        self.assertEqual(0, limiter.reserve('GET', '/volumes'))
+        self.assertEqual(3600, limiter.reserve('DELETE', '/volumes/1'))
+
+    def test_from_limits(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        info = {'rate': [
+            {'uri': '*', 'regex': '.*', 'limit': [
+                {'verb': 'POST', 'value': 10, 'remaining': 2,
+                 'unit': 'MINUTE', 'next-available': None}]}],
+            'absolute': {}}
+        limiter = ratelimit.RateLimiter.from_limits(
+            limits.Limits(None, info))
+
+        self.assertEqual([0, 0, 6.0],
+                         [limiter.reserve('POST', '/volumes')
+                          for i in range(3)])
+
+    def test_reserve_absolute_url(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limiter = ratelimit.RateLimiter()
+        limiter.add_limit('GET', '^/volumes', 4, 'HOUR')
+        endpoint = 'http://cinder:8776/v3/project'
+        get_endpoint = mock.Mock(return_value=endpoint + '/')
+
+        self.assertEqual(0, limiter.reserve('GET', '/volumes',
+                                            endpoint=get_endpoint))
+        get_endpoint.assert_not_called()
+        # Next links, and requests of clients that prefix the endpoint.
+        self.assertEqual(0, limiter.reserve(
+            'GET', endpoint + '/volumes/detail?marker=1',
+            endpoint=get_endpoint))
+        get_endpoint.assert_called_once_with()
+        self.assertEqual(0, limiter.reserve(
+            'GET', 'https://proxy/v3/project/volumes', endpoint=endpoint))
+        self.assertEqual(0, limiter.reserve(
+            'GET', endpoint + '/volumes', endpoint=endpoint))
+        self.assertEqual(900, limiter.reserve(
+            'GET', endpoint + '/volumes', endpoint=endpoint))
+        self.assertEqual(0, limiter.reserve(
+            'GET', endpoint + '/snapshots', endpoint=endpoint))
+
+    def test_unknown_unit(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limiter = ratelimit.RateLimiter()
+        self.assertRaisesRegex(ValueError, "Unknown rate limit unit 'WEEK'",
+                               limiter.add_limit, 'POST', '.*', 10, 'WEEK')
+
+    def test_from_limits_unknown_unit(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        info = {'rate': [
+            {'uri': '*', 'regex': '.*', 'limit': [
+                {'verb': 'POST', 'value': 1, 'remaining': 1,
+                 'unit': 'WEEK', 'next-available': None},
+                {'verb': 'POST', 'value': 10, 'remaining': 1,
+                 'unit': 'MINUTE', 'next-available': None}]}],
+            'absolute': {}}
+        with self.assertLogs('cinderclient.ratelimit', 'WARNING') as logs:
+            limiter = ratelimit.RateLimiter.from_limits(
+                limits.Limits(None, info))
+        self.assertIn("Unknown rate limit unit 'WEEK'", logs.output[0])
+        self.assertEqual([0, 6.0], [limiter.reserve('POST', '/volumes')
+                                    for i in range(2)])
+
+    def test_non_positive_value(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limiter = ratelimit.RateLimiter()
+        for value in (0, -1):
+            self.assertRaisesRegex(ValueError, "must be positive",
+                                   limiter.add_limit, 'POST', '.*', value)
+
+    def test_from_limits_non_positive_value(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        info = {'rate': [
+            {'uri': '*', 'regex': '.*', 'limit': [
+                {'verb': 'POST', 'value': 0, 'remaining': 0,
+                 'unit': 'MINUTE', 'next-available': None}]}],
+            'absolute': {}}
+        with self.assertLogs('cinderclient.ratelimit', 'WARNING') as logs:
+            limiter = ratelimit.RateLimiter.from_limits(
+                limits.Limits(None, info))
+        self.assertIn("must be positive", logs.output[0])
+        self.assertEqual(0, limiter.reserve('POST', '/volumes'))
@@ -0,0 +1,97 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import ddt
+from keystoneauth1 import exceptions as ksa_exceptions
+import requests
+
+from cinderclient import exceptions
+from cinderclient import retry
+from cinderclient.tests.unit import utils
+
+
+def _error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = {}
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return exceptions.from_response(response, None)
+
+
+@ddt.ddt
+@mock.patch('cinderclient.retry.random.uniform', side_effect=max)
+class RetryPolicyTest(utils.TestCase):
+
+    @ddt.data(('GET', _error(500)),
+              ('DELETE', _error(503)),
+              ('PUT', requests.exceptions.ConnectionError()),
+              ('GET', requests.exceptions.Timeout()),
+              ('HEAD', ksa_exceptions.ConnectFailure()))
+    @ddt.unpack
+    def test_backoff(self, method, error, mock_uniform):
+        policy = retry.RetryPolicy(retries=4, max_delay=5)
+        self.assertEqual([1, 2, 4, 5, None],
+                         [policy.get_delay(method, attempt, error)
+                          for attempt in range(1, 6)])
+        self.assertEqual({'retries': 4, 'retries_exhausted': 1,
+                          'budget_exhausted': 0}, policy.get_stats())
+
+    @ddt.data(('POST', _error(500)),
+              ('POST', requests.exceptions.ConnectionError()),
+              ('GET', _error(400)),
+              ('GET', _error(404)),
+              ('GET', _error(501)),
+              ('GET', _error(413)),
+              ('GET', ValueError()))
+    @ddt.unpack
+    def test_no_retry(self, method, error, mock_uniform):
+        policy = retry.RetryPolicy(retries=1)
+        self.assertIsNone(policy.get_delay(method, 1, error))
+        self.assertEqual(0, policy.get_stats()['retries'])
+
+    @ddt.data(413, 429, 503)
+    def test_retry_after(self, status, mock_uniform):
+        policy = retry.RetryPolicy(retries=1)
+        self.assertEqual(7, policy.get_delay('POST', 1, _error(status, 7)))
+        self.assertIsNone(policy.get_delay('POST', 2, _error(status, 7)))
+
+    def test_retry_after_malformed(self, mock_uniform):
+        policy = retry.RetryPolicy(retries=2)
+        self.assertEqual([1, 2], [policy.get_delay('GET', attempt,
+                                                   _error(503, 'soon'))
+                                  for attempt in range(1, 3)])
+
+    def test_retries_disabled(self, mock_uniform):
+        policy = retry.RetryPolicy()
+        self.assertIsNone(policy.get_delay('GET', 1, _error(500)))
+        self.assertEqual({'retries': 0, 'retries_exhausted': 0,
+                          'budget_exhausted': 0}, policy.get_stats())
+
+    @mock.patch('cinderclient.retry.time.monotonic')
+    def test_budget(self, mock_monotonic, mock_uniform):
+        mock_monotonic.return_value = 100
+        policy = retry.RetryPolicy(
+            retries=5, budget=retry.RetryBudget(capacity=2, refill_rate=0.5))
+
+        self.assertEqual(1, policy.get_delay('GET', 1, _error(500)))
+        self.assertEqual(1, policy.get_delay('GET', 1, _error(500)))
+        self.assertIsNone(policy.get_delay('GET', 1, _error(500)))
+        # A token is added back every other second.
+        mock_monotonic.return_value = 102
+        self.assertEqual(1, policy.get_delay('GET', 1, _error(500)))
+        self.assertIsNone(policy.get_delay('GET', 1, _error(500)))
+
+        self.assertEqual({'retries': 3, 'retries_exhausted': 0,
+                          'budget_exhausted': 2}, policy.get_stats())
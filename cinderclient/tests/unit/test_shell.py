@@ -219,6 +219,50 @@ class ShellTest(utils.TestCase):
         _shell = shell.OpenStackCinderShell()
         _shell.main(['list'])
 
+    @requests_mock.Mocker()
+    def test_auth_cache(self, mocker):
+        os_auth_url = "http://multiple.service.names/v2.0"
+        mocker.register_uri('POST', os_auth_url + "/tokens",
+                            text=keystone_client.keystone_request_callback)
+        mocker.register_uri('GET', "http://cinder1.api.com/",
+                            text=json.dumps(fakes.fake_request_get()))
+        mocker.register_uri('GET', "http://cinder1.api.com/v3/volumes/detail",
+                            text='{"volumes": []}')
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.make_env(include={'OS_AUTH_URL': os_auth_url,
+                               'CINDER_SERVICE_NAME': 'cinder1',
+                               'CINDERCLIENT_AUTH_CACHE': 'true',
+                               'CINDERCLIENT_UUID_CACHE_DIR': cache_dir})
+
+        for _ in range(3):
+            shell.OpenStackCinderShell().main(['list'])
+
+        token_requests = [r for r in mocker.request_history
+                          if r.method == 'POST']
+        self.assertEqual(1, len(token_requests))
+
+    @requests_mock.Mocker()
+    def test_version_cache(self, mocker):
+        os_auth_url = "http://multiple.service.names/v2.0"
+        mocker.register_uri('POST', os_auth_url + "/tokens",
+                            text=keystone_client.keystone_request_callback)
+        mocker.register_uri('GET', "http://cinder1.api.com/",
+                            text=json.dumps(fakes.fake_request_get()))
+        mocker.register_uri('GET', "http://cinder1.api.com/v3/volumes/detail",
+                            text='{"volumes": []}')
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.make_env(include={'OS_AUTH_URL': os_auth_url,
+                               'CINDER_SERVICE_NAME': 'cinder1',
+                               'CINDERCLIENT_VERSION_CACHE_TTL': '60',
+                               'CINDERCLIENT_UUID_CACHE_DIR': cache_dir})
+
+        for _ in range(3):
+            shell.OpenStackCinderShell().main(['list'])
+
+        version_requests = [r for r in mocker.request_history
+                            if r.url == "http://cinder1.api.com/"]
+        self.assertEqual(1, len(version_requests))
+
     def test_duplicate_filters(self):
         _shell = shell.OpenStackCinderShell()
         self.assertRaises(exceptions.CommandError,
@@ -553,6 +597,34 @@ class TestLoadVersionedActions(utils.TestCase):
         self.assertIn(mock.call('--foo', help="second foo"),
                       mock_add_arg.call_args_list)
 
+    def test_lazy_subcommand_parser(self):
+        shell = cinderclient.shell.OpenStackCinderShell()
+        shell.get_subcommand_parser(api_versions.APIVersion("3.0"),
+                                    input_args=['list', '--all-tenants'])
+        self.assertEqual({'list', 'bash_completion'},
+                         set(shell.subcommands))
+        self.assertEqual(
+            cinderclient.v3.shell.do_list,
+            shell.subcommands['list'].get_default('func'))
+
+    def test_lazy_subcommand_parser_extension(self):
+        shell = cinderclient.shell.OpenStackCinderShell()
+        shell.extensions = [mock.Mock(module=fake_actions_module)]
+        shell.get_subcommand_parser(api_versions.APIVersion("3.2"),
+                                    input_args=['fake-action'])
+        self.assertEqual({'fake-action', 'bash_completion'},
+                         set(shell.subcommands))
+
+    def test_lazy_subcommand_parser_fallback(self):
+        shell = cinderclient.shell.OpenStackCinderShell()
+        for input_args in (['no-such-command'], ['bash-completion'],
+                           ['bash_completion'], ['group-list'], []):
+            shell.get_subcommand_parser(api_versions.APIVersion("3.0"),
+                                        input_args=input_args)
+            self.assertIn('create', shell.subcommands)
+            # group-list requires 3.13
+            self.assertNotIn('group-list', shell.subcommands)
+
 
 class ShellUtilsTest(utils.TestCase):
 
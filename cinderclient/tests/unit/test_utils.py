@@ -11,9 +11,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import argparse
 import collections
 import io
 import sys
+import time
 from unittest import mock
 
 import ddt
@@ -146,6 +148,113 @@ class FindResourceTestCase(test_utils.TestCase):
                          output)
 
 
+class FindResourcesTestCase(test_utils.TestCase):
+
+    def setUp(self):
+        super(FindResourcesTestCase, self).setUp()
+        self.manager = FakeManager(None)
+        self.manager.get = mock.Mock(side_effect=self.manager.get)
+        self.manager.list = mock.Mock(side_effect=self.manager.list)
+
+    def test_find_ids_and_names(self):
+        found = utils.find_resources(
+            self.manager, ['1234', UUID, 'entity_one', '9876', '1234'])
+        self.assertEqual(self.manager.resources[0], found['1234'])
+        self.assertEqual(self.manager.resources[1], found[UUID])
+        self.assertEqual(self.manager.resources[0], found['entity_one'])
+        # '9876' is not an existing ID but is the name of a resource.
+        self.assertEqual(self.manager.resources[2], found['9876'])
+        self.assertEqual({}, found.errors)
+        # find_resource() tries '9876' as an ID again before its name.
+        self.assertEqual(4, self.manager.get.call_count)
+
+    def test_find_missing_and_ambiguous(self):
+        self.manager.resources = self.manager.resources + [
+            FakeResource('4321', {'name': 'entity_one'})]
+        found = utils.find_resources(self.manager,
+                                     ['entity_one', 'entity_two', 'asdf'])
+        self.assertEqual(self.manager.resources[1], found['entity_two'])
+        self.assertEqual({'entity_one', 'asdf'}, set(found.errors))
+        self.assertRaisesRegex(exceptions.CommandError, 'Multiple',
+                               found.__getitem__, 'entity_one')
+        self.assertRaisesRegex(exceptions.CommandError, 'No fakeresource',
+                               found.__getitem__, 'asdf')
+        self.assertRaises(KeyError, found.__getitem__, 'other')
+
+    def test_find_single_name(self):
+        self.manager.find = mock.Mock(side_effect=self.manager.find)
+        found = utils.find_resources(self.manager, ['entity_two'])
+        self.assertEqual(self.manager.resources[1], found['entity_two'])
+        self.manager.find.assert_called_once_with(name='entity_two')
+
+    def test_find_names_below_threshold(self):
+        self.manager.find = mock.Mock(side_effect=self.manager.find)
+        utils.find_resources(self.manager, ['entity_one', 'entity_two'])
+        self.assertEqual(2, self.manager.find.call_count)
+        # find() lists with its own filters, never without them.
+        for call in self.manager.list.call_args_list:
+            self.assertIn('name', call[1]['search_opts'])
+
+    @mock.patch.object(utils, 'FIND_RESOURCES_LIST_THRESHOLD', 1)
+    def test_find_names_listing(self):
+        self.manager.resources = self.manager.resources + [
+            FakeResource('4321', {'name': 'entity_one'})]
+        self.manager.find = mock.Mock(side_effect=self.manager.find)
+        found = utils.find_resources(self.manager,
+                                     ['entity_one', 'entity_two', '9876'])
+        self.assertEqual(self.manager.resources[1], found['entity_two'])
+        self.assertEqual(self.manager.resources[2], found['9876'])
+        self.assertRaisesRegex(exceptions.CommandError, 'Multiple',
+                               found.__getitem__, 'entity_one')
+        self.manager.list.assert_called_once_with(search_opts=None)
+        self.assertFalse(self.manager.find.called)
+
+    @mock.patch.object(utils, 'FIND_RESOURCES_LIST_THRESHOLD', 1)
+    def test_find_names_listing_all_tenants(self):
+        utils.find_resources(self.manager, ['entity_one', 'entity_two'],
+                             all_tenants=True)
+        self.manager.list.assert_called_once_with(
+            search_opts={'all_tenants': 1})
+
+    @mock.patch.object(utils, 'FIND_RESOURCES_LIST_THRESHOLD', 1)
+    def test_find_names_not_listed(self):
+        self.manager.find = mock.Mock(side_effect=self.manager.find)
+        found = utils.find_resources(self.manager, ['entity_one', 'asdf'])
+        self.assertEqual(self.manager.resources[0], found['entity_one'])
+        self.assertRaisesRegex(exceptions.CommandError, 'No fakeresource',
+                               found.__getitem__, 'asdf')
+        # Only the name missing from the listing is looked up.
+        self.assertEqual(
+            [mock.call(name='asdf'), mock.call(human_id='asdf')],
+            self.manager.find.call_args_list)
+
+    @mock.patch.object(utils, 'FIND_RESOURCES_LIST_THRESHOLD', 1)
+    def test_find_names_listing_error(self):
+        self.manager.find = mock.Mock(side_effect=self.manager.find)
+        self.manager.list.side_effect = exceptions.ClientException(500)
+
+        def find(name):
+            if name == 'entity_one':
+                return self.manager.resources[0]
+            raise exceptions.ClientException(500)
+
+        self.manager.find = mock.Mock(side_effect=find)
+        found = utils.find_resources(self.manager,
+                                     ['entity_one', 'entity_two'])
+        # Each name is looked up and fails on its own.
+        self.assertEqual(2, self.manager.find.call_count)
+        self.assertEqual(self.manager.resources[0], found['entity_one'])
+        self.assertRaises(exceptions.ClientException,
+                          found.__getitem__, 'entity_two')
+
+    def test_find_id_error(self):
+        self.manager.get.side_effect = exceptions.ClientException(500)
+        found = utils.find_resources(self.manager, ['1234'])
+        self.assertRaises(exceptions.ClientException,
+                          found.__getitem__, '1234')
+        self.assertFalse(self.manager.list.called)
+
+
 class CaptureStdout(object):
     """Context manager for capturing stdout from statements in its block."""
     def __enter__(self):
@@ -214,6 +323,74 @@ class ExtractFilterTestCase(test_utils.TestCase):
         self.assertEqual(expected, result)
 
 
+@ddt.ddt
+class TranslateKeysTestCase(test_utils.TestCase):
+
+    @ddt.data(False, True)
+    def test_translate_volume_keys(self, compact):
+        vol = common_base.Resource(
+            None, {'volumeType': 'lvm', 'os-vol-tenant-attr:tenant_id': 'p1'},
+            compact=compact)
+        shell_utils.translate_volume_keys([vol])
+        self.assertEqual('lvm', vol.volume_type)
+        self.assertEqual('p1', vol.tenant_id)
+
+
+class ForEachTestCase(test_utils.TestCase):
+
+    def _check(self, parallel):
+        done = []
+
+        def func(item):
+            # The later items return first when run concurrently.
+            time.sleep(0.01 * (3 - item))
+            if item == 2:
+                raise exceptions.NotFound(404)
+            done.append(item)
+
+        result = list(shell_utils.for_each(func, [0, 1, 2], parallel))
+
+        self.assertEqual([0, 1, 2], [item for item, e in result])
+        self.assertEqual([None, None], [e for item, e in result[:2]])
+        self.assertIsInstance(result[2][1], exceptions.NotFound)
+        return done
+
+    def test_for_each(self):
+        self.assertEqual([0, 1], self._check(1))
+
+    def test_for_each_parallel(self):
+        self.assertEqual([1, 0], self._check(3))
+
+    def test_positive_int(self):
+        self.assertEqual(4, shell_utils._positive_int('4'))
+        for value in ('0', '-1', 'x'):
+            self.assertRaises(argparse.ArgumentTypeError,
+                              shell_utils._positive_int, value)
+
+
+class LazyImportTestCase(test_utils.TestCase):
+
+    MODULE = 'cinderclient.tests.unit.fake_actions_module'
+
+    def test_lazy_import(self):
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop(self.MODULE, None)
+            module = utils.lazy_import(self.MODULE)
+            # Not imported until an attribute is accessed.
+            self.assertNotIn(self.MODULE, sys.modules)
+            self.assertTrue(callable(module.do_fake_action))
+            self.assertIs(sys.modules[self.MODULE].do_fake_action,
+                          module.do_fake_action)
+            self.assertIs(sys.modules[self.MODULE],
+                          utils.lazy_import(self.MODULE))
+
+    def test_lazy_import_missing(self):
+        self.assertRaises(ImportError, utils.lazy_import,
+                          'no_such_package.module')
+        module = utils.lazy_import('cinderclient.no_such_module')
+        self.assertRaises(ImportError, getattr, module, 'attr')
+
+
 class PrintListTestCase(test_utils.TestCase):
 
     def test_print_list_with_list(self):
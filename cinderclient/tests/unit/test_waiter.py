@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from cinderclient.apiclient import base as common_base
+from cinderclient import exceptions
+from cinderclient.tests.unit import utils
+from cinderclient import waiter
+
+
+def _resource(id, status, request_id=None):
+    resource = common_base.Resource(None, {'id': id, 'status': status},
+                                    loaded=True)
+    if request_id:
+        resource.x_openstack_request_ids = [request_id]
+    return resource
+
+
+@mock.patch('cinderclient.waiter.random.uniform', return_value=1)
+@mock.patch('cinderclient.waiter.time')
+class WaiterTest(utils.TestCase):
+
+    def setUp(self):
+        super(WaiterTest, self).setUp()
+        self.manager = mock.Mock(spec=['get', 'iter'])
+        self.messages = mock.Mock(spec=['list'])
+
+    def _set_statuses(self, *cycles):
+        """Make each listing or get() return the statuses of one cycle."""
+        def get(res_id):
+            if cycles[self.cycle][res_id] is None:
+                raise exceptions.NotFound(404)
+            return _resource(res_id, cycles[self.cycle][res_id])
+
+        def iter(**kwargs):
+            for res_id, status in cycles[self.cycle].items():
+                if status is not None:
+                    yield _resource(res_id, status)
+
+        def sleep(delay):
+            self.cycle += 1
+
+        self.cycle = -1
+        self.manager.get.side_effect = get
+        self.manager.iter.side_effect = iter
+        return sleep
+
+    def test_wait(self, mock_time, mock_uniform):
+        mock_time.monotonic.return_value = 0
+        mock_time.sleep.side_effect = self._set_statuses(
+            {'a': 'creating', 'b': 'creating'},
+            {'a': 'creating', 'b': 'creating'},
+            {'a': 'creating', 'b': 'available'},
+            {'a': 'Available'})
+
+        results = waiter.Waiter(self.manager).wait(['a', 'b'])
+
+        self.assertEqual(['a', 'b'], [r.id for r in results])
+        self.assertEqual([waiter.READY] * 2, [r.state for r in results])
+        self.assertEqual('Available', results[0].resource.status)
+        # The interval grows while nothing changes.
+        self.assertEqual([mock.call(2), mock.call(2), mock.call(3.0),
+                          mock.call(2)], mock_time.sleep.call_args_list)
+        self.assertEqual(7, self.manager.get.call_count)
+        self.manager.iter.assert_not_called()
+
+    def test_wait_listing(self, mock_time, mock_uniform):
+        mock_time.monotonic.return_value = 0
+        mock_time.sleep.side_effect = self._set_statuses(
+            {'a': 'creating', 'b': 'available', 'c': None},
+            {'a': 'available'})
+
+        results = waiter.Waiter(self.manager, list_threshold=2).wait(
+            [_resource('a', 'creating'), 'b', 'c'])
+
+        self.assertEqual([waiter.READY, waiter.READY, waiter.ERROR],
+                         [r.state for r in results])
+        self.assertIsNone(results[2].resource)
+        self.assertEqual(1, self.manager.iter.call_count)
+        self.manager.iter.assert_called_with(search_opts=None,
+                                             sort='created_at:desc')
+        # c is not listed, a alone is below the threshold.
+        self.assertEqual([mock.call('c'), mock.call('a')],
+                         self.manager.get.call_args_list)
+
+    def test_wait_error(self, mock_time, mock_uniform):
+        mock_time.monotonic.return_value = 0
+        mock_time.sleep.side_effect = self._set_statuses(
+            {'a': 'error', 'b': 'error', 'c': 'error'})
+        self.messages.list.side_effect = [
+            [],
+            [mock.Mock(resource_uuid='c', user_message='No host.'),
+             mock.Mock(resource_uuid='b', user_message='No space.')]]
+
+        results = waiter.Waiter(self.manager, messages=self.messages,
+                                request_id='req-1').wait(
+            [_resource('a', 'creating', 'req-2'),
+             _resource('b', 'creating'),
+             _resource('c', 'creating')])
+
+        self.assertEqual([waiter.ERROR] * 3, [r.state for r in results])
+        self.assertEqual([None, 'No space.', 'No host.'],
+                         [r.message for r in results])
+        self.assertEqual(
+            [mock.call(search_opts={'request_id': 'req-2'}),
+             mock.call(search_opts={'request_id': 'req-1'})],
+            self.messages.list.call_args_list)
+
+    def test_wait_timeout(self, mock_time, mock_uniform):
+        mock_time.monotonic.side_effect = [0, 0, 2, 2, 3]
+        mock_time.sleep.side_effect = self._set_statuses(
+            {'a': 'creating', 'b': 'available'},
+            {'a': 'creating'})
+
+        results = waiter.Waiter(self.manager).wait(['a', 'b'], timeout=3)
+
+        self.assertEqual([waiter.TIMEOUT, waiter.READY],
+                         [r.state for r in results])
+        self.assertEqual('creating', results[0].resource.status)
+        # The last sleep is cut short by the timeout.
+        self.assertEqual([mock.call(2), mock.call(1)],
+                         mock_time.sleep.call_args_list)
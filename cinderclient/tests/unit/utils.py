@@ -41,6 +41,11 @@ class TestCase(testtools.TestCase):
             stderr = self.useFixture(fixtures.StringStream('stderr')).stream
             self.useFixture(fixtures.MonkeyPatch('sys.stderr', stderr))
 
+        # Keep the client side caches out of the home directory.
+        self.useFixture(fixtures.MonkeyPatch(
+            'cinderclient.cache.DEFAULT_CACHE_DIR',
+            self.useFixture(fixtures.TempDir()).path))
+
         # FIXME(eharney) - this should only be needed for shell tests
         self.mock_completion()
 
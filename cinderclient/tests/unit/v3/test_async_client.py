@@ -0,0 +1,394 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import json
+from unittest import mock
+
+import fixtures
+
+from cinderclient import api_versions
+from cinderclient import cache
+from cinderclient import client as base_client
+from cinderclient import exceptions
+from cinderclient.tests.unit import utils
+from cinderclient.tests.unit.v3 import fakes
+from cinderclient import utils as cinderclient_utils
+from cinderclient.v3 import async_client
+from cinderclient.v3 import volumes
+
+
+class FakeAsyncHTTPClient(object):
+
+    def __init__(self, sync_http_client):
+        self.sync_http_client = sync_http_client
+        self.requests = []
+        self.closed = False
+
+    async def request(self, url, method, base_url=False, **kwargs):
+        self.requests.append((method, url))
+        await asyncio.sleep(0)
+        resp, body = self.sync_http_client._cs_request(url, method, **kwargs)
+        if resp.status_code >= 400:
+            raise exceptions.from_response(resp, body)
+        return resp, body
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncClientTest(utils.TestCase):
+
+    def setUp(self):
+        super(AsyncClientTest, self).setUp()
+        self.cs = fakes.FakeClient(api_versions.APIVersion('3.0'))
+        self.http = FakeAsyncHTTPClient(self.cs.client)
+        self.acs = async_client.AsyncClient.from_client(self.cs,
+                                                        http=self.http)
+
+    def test_manager_methods_are_coroutines(self):
+        self.assertTrue(asyncio.iscoroutinefunction(self.acs.volumes.get))
+        self.assertIs(self.acs.volumes, self.acs.volumes)
+        self.assertIsInstance(self.acs.volumes.manager, volumes.VolumeManager)
+        self.assertIsNot(self.cs.volumes, self.acs.volumes.manager)
+
+    def test_get(self):
+        vol = asyncio.run(self.acs.volumes.get('1234'))
+        self.assertIsInstance(vol, volumes.Volume)
+        self.assertEqual(1234, vol.id)
+        self.cs.assert_called('GET', '/volumes/1234')
+        self.assertEqual([('GET', '/volumes/1234')], self.http.requests)
+        self._assert_request_id(vol)
+
+    def test_sync_client_unchanged(self):
+        sync_http_client = self.cs.client
+        asyncio.run(self.acs.volumes.get('1234'))
+        self.assertIs(sync_http_client, self.cs.client)
+        self.assertIs(self.cs, self.cs.volumes.api)
+        self.assertEqual([], self.http.requests[1:])
+
+    def test_list(self):
+        vols = asyncio.run(self.acs.volumes.list())
+        self.assertEqual(1, len(vols))
+        self.cs.assert_called('GET', '/volumes/detail')
+
+    def _paginate(self, total, **kw):
+        """Serve /volumes/detail by pages of 2, with markers or offsets."""
+        start = int(kw.get('marker', kw.get('offset', 0)))
+        ids = list(range(start + 1, min(start + 2, total) + 1))
+        body = {'volumes': [{'id': str(i)} for i in ids]}
+        if ids[-1] < total:
+            body['volumes_links'] = [
+                {'rel': 'next',
+                 'href': '/volumes/detail?limit=2&marker=%s' % ids[-1]}]
+        if kw.get('with_count'):
+            body['count'] = total
+        return 200, {}, body
+
+    def _count_runs(self, func):
+        runs = []
+
+        def run():
+            runs.append(1)
+            return func()
+        return run, runs
+
+    def test_list_pages(self):
+        self.cs.client.get_volumes_detail = mock.Mock(
+            side_effect=lambda **kw: self._paginate(5, **kw))
+        run, runs = self._count_runs(self.acs.volumes.manager.list)
+
+        vols = asyncio.run(self.acs.call(run))
+
+        self.assertEqual(['1', '2', '3', '4', '5'], [v.id for v in vols])
+        self.assertEqual(3, len(self.http.requests))
+        self.assertEqual(1, len(runs))
+
+    def test_list_pages_limit(self):
+        self.cs.client.get_volumes_detail = mock.Mock(
+            side_effect=lambda **kw: self._paginate(9, **kw))
+        vols = asyncio.run(self.acs.volumes.list(limit=3))
+        self.assertEqual(['1', '2', '3'], [v.id for v in vols])
+        self.assertEqual(2, len(self.http.requests))
+
+    def test_parallel_list(self):
+        self.cs.api_version = api_versions.APIVersion('3.45')
+        self.cs.client.get_volumes_detail = mock.Mock(
+            side_effect=lambda **kw: self._paginate(7, **kw))
+        run, runs = self._count_runs(
+            lambda: self.acs.volumes.manager.parallel_list(page_size=2,
+                                                          workers=3))
+
+        vols = asyncio.run(self.acs.call(run))
+
+        self.assertEqual([str(i) for i in range(1, 8)],
+                         [v.id for v in vols])
+        self.assertEqual(4, len(self.http.requests))
+        self.assertEqual(1, len(runs))
+
+    def test_generator_methods_unavailable(self):
+        self.assertRaises(AttributeError, getattr, self.acs.volumes, 'iter')
+
+    def test_requests_from_event_loop(self):
+        async def get():
+            return self.acs.volumes.manager.get('1234')
+
+        self.assertRaises(RuntimeError, asyncio.run, get())
+        self.assertEqual([], self.http.requests)
+
+    def test_name_cache(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cs.client.tenant_id = 'project'
+        self.cs.name_cache = cache.NameCache(self.cs._get_cache_scope,
+                                             cache_dir=cache_dir)
+
+        with mock.patch.object(self.cs.name_cache, 'add',
+                               wraps=self.cs.name_cache.add) as mock_add:
+            vol = asyncio.run(self.acs.call(
+                cinderclient_utils.find_resource, self.acs.volumes.manager,
+                'sample-volume'))
+        self.assertEqual(1234, vol.id)
+        # Side effects of the manager methods happen once.
+        self.assertEqual(1, mock_add.call_count)
+        self.assertEqual('1234',
+                         self.cs.name_cache.get('volume', 'sample-volume'))
+
+        asyncio.run(self.acs.volumes.delete('1234'))
+        self.cs.assert_called('DELETE', '/volumes/1234')
+        self.assertIsNone(self.cs.name_cache.get('volume', 'sample-volume'))
+
+    def test_version_cache(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.cs.version_cache = cache.VersionCache(self.cs._get_endpoint,
+                                                   cache_dir=cache_dir)
+        self.cs.version_cache.set('3.0', '3.60')
+
+        version = asyncio.run(self.acs.call(
+            api_versions.get_highest_version, self.acs.volumes.manager.api))
+
+        self.assertEqual(api_versions.APIVersion('3.60'), version)
+        self.assertEqual([], self.http.requests)
+
+    def test_microversioned_method(self):
+        self.cs.api_version = api_versions.APIVersion('3.3')
+        self.cs.client.api_version = self.cs.api_version
+        asyncio.run(self.acs.messages.list())
+        self.cs.assert_called('GET', '/messages')
+
+    def test_microversioned_method_unsupported(self):
+        self.assertRaises(exceptions.VersionNotFoundForAPIMethod,
+                          asyncio.run, self.acs.messages.list())
+
+    def test_concurrent_calls(self):
+        async def get_all():
+            return await asyncio.gather(self.acs.volumes.get('1234'),
+                                        self.acs.volumes.get('5678'))
+
+        vols = asyncio.run(get_all())
+        self.assertEqual([1234, 5678], [v.id for v in vols])
+
+    def test_call(self):
+        vol = asyncio.run(self.acs.call(cinderclient_utils.find_resource,
+                                        self.acs.volumes.manager, '1234'))
+        self.assertEqual(1234, vol.id)
+
+    def test_call_errors(self):
+        self.cs.client.get_volumes_0 = mock.Mock(
+            return_value=(404, {}, {'itemNotFound': {'message': 'no'}}))
+        self.assertRaises(exceptions.CommandError, asyncio.run,
+                          self.acs.call(cinderclient_utils.find_resource,
+                                        self.acs.volumes.manager, '0000'))
+        self.assertEqual(
+            [('GET', '/volumes/0'),
+             ('GET', '/volumes/detail?all_tenants=1&limit=2&name=0000'),
+             ('GET', '/volumes/detail?all_tenants=1')],
+            self.http.requests)
+
+    def test_call_error(self):
+        self.cs.client.get_volumes_0000 = mock.Mock(
+            return_value=(404, {}, {'itemNotFound': {'message': 'no'}}))
+        self.assertRaises(exceptions.NotFound, asyncio.run,
+                          self.acs.volumes.get('0000'))
+
+    def test_context_manager(self):
+        async def use_client():
+            async with self.acs as cs:
+                await cs.volumes.get('1234')
+
+        asyncio.run(use_client())
+        self.assertTrue(self.http.closed)
+
+    def test_non_manager_attributes(self):
+        self.assertEqual(self.cs.api_version, self.acs.api_version)
+        self.assertEqual(self.cs.version, self.acs.version)
+
+
+class FakeAiohttpResponse(object):
+
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.reason = 'reason'
+        self.headers = headers or {}
+        self.charset = 'utf-8'
+        self.content = b'' if body is None else json.dumps(body).encode()
+
+    async def read(self):
+        return self.content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeAiohttpSession(object):
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, headers=None, data=None):
+        self.requests.append((method, url, headers, data))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeConnectionError(Exception):
+    pass
+
+
+class AsyncHTTPClientTest(utils.TestCase):
+
+    def _get_client(self, *responses):
+        self.session = FakeAiohttpSession(responses)
+        aiohttp = mock.Mock(ClientConnectionError=FakeConnectionError)
+        aiohttp.ClientSession.return_value = self.session
+        self.useFixture(fixtures.MockPatchObject(base_client, 'aiohttp',
+                                                 aiohttp))
+        self.http_client = base_client.HTTPClient(
+            'user', 'password', 'project', 'http://auth/v3', insecure=True,
+            timeout=30)
+        self.http_client.management_url = 'http://example.com/v3/project'
+        self.http_client.auth_token = 'token'
+        return base_client.AsyncHTTPClient(
+            self.http_client, api_version=api_versions.APIVersion('3.10'))
+
+    def test_request(self):
+        cl = self._get_client(FakeAiohttpResponse(202, {'volume': {}}))
+
+        resp, body = asyncio.run(cl.request('/volumes', 'POST',
+                                            body={'volume': {'size': 1}}))
+
+        self.assertEqual(202, resp.status_code)
+        self.assertEqual({'volume': {}}, body)
+        method, url, headers, data = self.session.requests[0]
+        self.assertEqual(('POST', 'http://example.com/v3/project/volumes'),
+                         (method, url))
+        self.assertEqual('application/json', headers['Content-Type'])
+        self.assertEqual('volume 3.10', headers['OpenStack-API-Version'])
+        self.assertEqual({'volume': {'size': 1}}, json.loads(data))
+        base_client.aiohttp.TCPConnector.assert_called_once_with(
+            limit=base_client.DEFAULT_ASYNC_CONNECTION_LIMIT, ssl=False)
+
+    def test_request_urls(self):
+        cl = self._get_client(FakeAiohttpResponse(200, {'versions': []}),
+                              FakeAiohttpResponse(200, {'volumes': []}))
+
+        asyncio.run(cl.request('', 'GET', base_url=True))
+        asyncio.run(cl.request(
+            'http://example.com/v3/project/volumes?marker=1', 'GET'))
+
+        self.assertEqual(['http://example.com/',
+                          'http://example.com/v3/project/volumes?marker=1'],
+                         [request[1] for request in self.session.requests])
+
+    def test_auth_header(self):
+        cl = self._get_client(FakeAiohttpResponse(401),
+                              FakeAiohttpResponse(200, {'volumes': []}))
+
+        def authenticate():
+            self.http_client.management_url = 'http://example.com/v3/new'
+            self.http_client.auth_token = 'new-token'
+        self.http_client.authenticate = mock.Mock(side_effect=authenticate)
+
+        resp, body = asyncio.run(cl.request('/volumes', 'GET'))
+
+        self.assertEqual({'volumes': []}, body)
+        self.assertEqual(['token', 'new-token'],
+                         [request[2]['X-Auth-Token']
+                          for request in self.session.requests])
+        self.assertEqual('http://example.com/v3/new/volumes',
+                         self.session.requests[1][1])
+        self.http_client.authenticate.assert_called_once_with()
+
+    def test_error(self):
+        cl = self._get_client(FakeAiohttpResponse(
+            404, {'itemNotFound': {'message': 'Volume not found.'}},
+            headers={'x-compute-request-id': 'req-1'}))
+
+        ex = self.assertRaises(exceptions.NotFound, asyncio.run,
+                               cl.request('/volumes/1', 'GET'))
+
+        self.assertEqual('Volume not found.', ex.message)
+        self.assertEqual('req-1', ex.request_id)
+
+    def test_connection_error(self):
+        cl = self._get_client(FakeConnectionError('refused'))
+        self.assertRaises(exceptions.ConnectionError, asyncio.run,
+                          cl.request('/volumes', 'GET'))
+
+    def test_close(self):
+        cl = self._get_client(FakeAiohttpResponse(200, {'volumes': []}))
+        asyncio.run(cl.request('/volumes', 'GET'))
+
+        asyncio.run(cl.close())
+
+        self.assertTrue(self.session.closed)
+        self.assertIsNone(cl._session)
+        # Closing again, or before any request, does nothing.
+        asyncio.run(cl.close())
+
+    @mock.patch.object(base_client, 'aiohttp', None)
+    def test_aiohttp_required(self):
+        http_client = base_client.HTTPClient('user', 'password', 'project',
+                                             'http://auth/v3')
+        self.assertRaises(ImportError, base_client.AsyncHTTPClient,
+                          http_client)
+
+    @mock.patch.object(base_client, 'aiohttp', mock.Mock())
+    def test_endpoint_and_headers(self):
+        http_client = base_client.HTTPClient(
+            'user', 'password', 'project', 'http://auth/v3',
+            global_request_id='req-1')
+        http_client.management_url = 'http://example.com/v3/project'
+        http_client.auth_token = 'token'
+        api_version = api_versions.APIVersion('3.10')
+        cl = base_client.AsyncHTTPClient(http_client, api_version=api_version)
+
+        endpoint, headers = cl._get_endpoint_and_headers()
+
+        self.assertEqual('http://example.com/v3/project', endpoint)
+        self.assertEqual({'User-Agent': 'python-cinderclient',
+                          'Accept': 'application/json',
+                          'X-Auth-Token': 'token',
+                          'X-Auth-Project-Id': 'project',
+                          'X-OpenStack-Request-ID': 'req-1',
+                          'OpenStack-API-Version': 'volume 3.10'}, headers)
+        self.assertEqual('http://example.com/',
+                         cl._get_base_url(endpoint))
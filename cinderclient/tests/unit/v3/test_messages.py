@@ -47,6 +47,12 @@ class MessagesTest(utils.TestCase):
         cs = fakes.FakeClient(api_versions.APIVersion('3.5'))
         self.assertRaises(ValueError, cs.messages.list, sort=sort_string)
 
+    def test_iter_messages(self):
+        cs = fakes.FakeClient(api_versions.APIVersion('3.5'))
+        messages = list(cs.messages.iter(sort='id'))
+        cs.assert_called('GET', '/messages?sort=id')
+        self.assertEqual(2, len(messages))
+
     def test_get_messages(self):
         cs = fakes.FakeClient(api_versions.APIVersion('3.3'))
         fake_id = '1234'
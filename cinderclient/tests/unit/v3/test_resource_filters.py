@@ -10,9 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 import ddt
 
 from cinderclient import api_versions
+from cinderclient import cache
+from cinderclient import exceptions
 from cinderclient.tests.unit import utils
 from cinderclient.tests.unit.v3 import fakes
 
@@ -31,3 +35,80 @@ class ResourceFilterTests(utils.TestCase):
         if resource is not None:
             url += query_url
         cs.assert_called('GET', url)
+
+    def _client(self, version='3.33'):
+        client = fakes.FakeClient(api_versions.APIVersion(version))
+        client.client.get_resource_filters = mock.Mock(return_value=(
+            200, {}, {'resource_filters': [
+                {'resource': 'volume', 'filters': ['name', 'status']},
+                {'resource': 'backup', 'filters': ['name']}]}))
+        return client
+
+    def test_get_filters_cached(self):
+        client = self._client()
+        self.assertEqual({'name', 'status'},
+                         client.resource_filters.get_filters('volume'))
+        self.assertEqual({'name'},
+                         client.resource_filters.get_filters('backup'))
+        self.assertEqual(set(), client.resource_filters.get_filters('pool'))
+        client.client.get_resource_filters.assert_called_once_with()
+
+    def test_get_filters_catalog_cache(self):
+        client = self._client()
+        client.catalog_cache = cache.CatalogCache()
+        self.assertEqual({'name'},
+                         client.resource_filters.get_filters('backup'))
+        self.assertEqual(2, len(client.resource_filters.list()))
+        self.assertEqual({'name', 'status'},
+                         client.resource_filters.get_filters('volume'))
+        client.client.get_resource_filters.assert_called_once_with()
+
+        client.catalog_cache.refresh('resource_filters')
+        self.assertEqual({'name'},
+                         client.resource_filters.get_filters('backup'))
+        self.assertEqual(2, client.client.get_resource_filters.call_count)
+
+    @mock.patch('time.monotonic')
+    def test_get_filters_ttl(self, mock_monotonic):
+        client = self._client()
+        mock_monotonic.return_value = 100
+        client.resource_filters.get_filters('volume')
+        mock_monotonic.return_value = 100 + cache.DEFAULT_CATALOG_CACHE_TTL
+        client.resource_filters.get_filters('volume')
+        self.assertEqual(2, client.client.get_resource_filters.call_count)
+
+    def test_get_filters_not_supported(self):
+        client = self._client('3.32')
+        self.assertEqual(set(), client.resource_filters.get_filters('volume'))
+        self.assertFalse(client.client.get_resource_filters.called)
+
+    @ddt.data(exceptions.NotFound(404), exceptions.BadRequest(400))
+    def test_get_filters_api_missing(self, error):
+        client = self._client()
+        client.client.get_resource_filters.side_effect = error
+        self.assertEqual(set(), client.resource_filters.get_filters('volume'))
+        self.assertEqual(set(), client.resource_filters.get_filters('volume'))
+        client.client.get_resource_filters.assert_called_once_with()
+
+    @ddt.data(exceptions.ClientException(500),
+              exceptions.ServiceUnavailable(503),
+              exceptions.TooManyRequests(429))
+    def test_get_filters_transient_error(self, error):
+        client = self._client()
+        response = client.client.get_resource_filters.return_value
+        client.client.get_resource_filters.side_effect = [error, response]
+        self.assertEqual(set(), client.resource_filters.get_filters('volume'))
+        self.assertEqual({'name', 'status'},
+                         client.resource_filters.get_filters('volume'))
+        self.assertEqual(2, client.client.get_resource_filters.call_count)
+
+    def test_findall_pushes_filters_down(self):
+        client = self._client()
+        client.volumes.findall(status='available', size=1, bootable=False)
+        client.assert_called('GET',
+                             '/volumes/detail?all_tenants=1&status=available')
+
+    def test_findall_without_filters(self):
+        client = self._client('3.32')
+        client.volumes.findall(status='available')
+        client.assert_called('GET', '/volumes/detail?all_tenants=1')
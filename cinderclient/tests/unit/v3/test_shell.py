@@ -38,6 +38,7 @@
 #                                                   'volume_id': '1234'})
 #             return original(manager, name_or_id, **kwargs)
 
+import io
 from unittest import mock
 from urllib import parse
 
@@ -598,6 +599,22 @@ class ShellTest(utils.TestCase):
                          'attachment-delete 1234')
         self.assert_called('DELETE', '/attachments/1234')
 
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    def test_attachment_delete_failure(self, mock_stdout):
+        self.assertRaisesRegex(exceptions.CommandError,
+                               'Unable to delete 1 of the 2',
+                               self.run_command,
+                               '--os-volume-api-version 3.27 '
+                               'attachment-delete --parallel 2 5678 1234')
+        self.assert_called_anytime('DELETE', '/attachments/1234')
+        self.assertIn('Delete for attachment 5678 failed',
+                      mock_stdout.getvalue())
+        self.assertRaisesRegex(exceptions.CommandError,
+                               'Unable to delete 1 of the 1',
+                               self.run_command,
+                               '--os-volume-api-version 3.27 '
+                               'attachment-delete 5678')
+
     def test_upload_to_image(self):
         expected = {'os-volume_upload_image': {'force': False,
                                                'container_format': 'bare',
@@ -1236,6 +1253,44 @@ class ShellTest(utils.TestCase):
         self.assert_called_anytime('DELETE', '/messages/1234')
         self.assert_called_anytime('DELETE', '/messages/12345')
 
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    def test_delete_parallel(self, mock_stdout):
+        self.run_command('delete --parallel 4 5678 1234')
+        self.assert_called_anytime('DELETE', '/volumes/1234')
+        self.assert_called_anytime('DELETE', '/volumes/5678')
+        self.assertEqual(
+            'Request to delete volume 5678 has been accepted.\n'
+            'Request to delete volume 1234 has been accepted.\n',
+            mock_stdout.getvalue())
+
+    def test_delete_parallel_invalid(self):
+        self.assertRaises(SystemExit, self.run_command,
+                          'delete --parallel 0 1234')
+
+    @mock.patch.object(cinderclient_utils, 'FIND_RESOURCES_LIST_THRESHOLD', 0)
+    def test_delete_volumes_by_name(self):
+        self.run_command('delete sample-volume')
+        # Only the volumes of the project are listed.
+        self.assert_called_anytime('GET', '/volumes/detail')
+        self.assert_called('DELETE', '/volumes/1234')
+        self.assertEqual(
+            1, len([c for c in self.shell.cs.client.callstack
+                    if c[1].startswith('/volumes/detail')]))
+
+    @mock.patch('cinderclient.utils.find_resource')
+    def test_delete_volumes_lookup_error(self, mock_find):
+        def find(manager, name):
+            if name == 'sample-volume':
+                raise exceptions.ClientException(503)
+            return volumes.Volume(manager, {'id': '1234'})
+
+        mock_find.side_effect = find
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.run_command('delete sample-volume other-volume')
+        self.assertIn('Delete for volume sample-volume failed',
+                      stdout.getvalue())
+        self.assert_called('DELETE', '/volumes/1234')
+
     @mock.patch('cinderclient.utils.find_resource')
     def test_delete_metadata(self, mock_find_volume):
         mock_find_volume.return_value = volumes.Volume(self,
@@ -1366,7 +1421,7 @@ class ShellTest(utils.TestCase):
                          '--prefix %s' % (level, binary, server, prefix))
         set_levels_mock.assert_called_once_with(level, binary, server, prefix)
 
-    @mock.patch('cinderclient.shell_utils._poll_for_status')
+    @mock.patch('cinderclient.shell_utils.wait_for_status')
     def test_create_with_poll(self, poll_method):
         self.run_command('create --poll 1')
         self.assert_called_anytime('GET', '/volumes/1234')
@@ -1375,63 +1430,52 @@ class ShellTest(utils.TestCase):
         info.update(volume._info)
         self.assertEqual(1, poll_method.call_count)
         timeout_period = 3600
-        poll_method.assert_has_calls([mock.call(self.shell.cs.volumes.get,
-            1234, info, 'creating', ['available'], timeout_period,
+        poll_method.assert_has_calls([mock.call(self.shell.cs.volumes,
+            volume, info, 'creating', ['available'], timeout_period,
             self.shell.cs.client.global_request_id,
             self.shell.cs.messages)])
 
-    @mock.patch('cinderclient.shell_utils.time')
-    def test_poll_for_status(self, mock_time):
-        poll_period = 2
-        some_id = "some-id"
-        global_request_id = "req-someid"
-        action = "some"
-        updated_objects = (
-            base.Resource(None, info={"not_default_field": "creating"}),
-            base.Resource(None, info={"not_default_field": "available"}))
-        poll_fn = mock.MagicMock(side_effect=updated_objects)
-        cinderclient.shell_utils._poll_for_status(
-            poll_fn = poll_fn,
-            obj_id = some_id,
-            global_request_id = global_request_id,
-            messages = base.Resource(None, {}),
-            info = {},
-            action = action,
-            status_field = "not_default_field",
-            final_ok_states = ['available'],
-            timeout_period=3600)
-        self.assertEqual([mock.call(poll_period)] * 2,
-                mock_time.sleep.call_args_list)
-        self.assertEqual([mock.call(some_id)] * 2, poll_fn.call_args_list)
-
-    @mock.patch('cinderclient.v3.messages.MessageManager.list')
-    @mock.patch('cinderclient.shell_utils.time')
-    def test_poll_for_status_error(self, mock_time, mock_message_list):
-        poll_period = 2
-        some_id = "some_id"
-        global_request_id = "req-someid"
-        action = "some"
-        updated_objects = (
-            base.Resource(None, info={"not_default_field": "creating"}),
-            base.Resource(None, info={"not_default_field": "error"}))
-        poll_fn = mock.MagicMock(side_effect=updated_objects)
-        msg_object = base.Resource(cinderclient.v3.messages.MessageManager,
-                info = {"user_message": "ERROR!"})
-        mock_message_list.return_value = (msg_object,)
-        self.assertRaises(exceptions.ResourceInErrorState,
-                cinderclient.shell_utils._poll_for_status,
-                poll_fn=poll_fn,
-                obj_id=some_id,
-                global_request_id=global_request_id,
-                messages=cinderclient.v3.messages.MessageManager(api=3.34),
-                info=dict(),
-                action=action,
-                final_ok_states=['available'],
-                status_field="not_default_field",
-                timeout_period=3600)
-        self.assertEqual([mock.call(poll_period)] * 2,
-                mock_time.sleep.call_args_list)
-        self.assertEqual([mock.call(some_id)] * 2, poll_fn.call_args_list)
+    @mock.patch('cinderclient.waiter.time')
+    def test_wait_for_status(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        manager = mock.Mock(spec=['get'])
+        manager.get.side_effect = [
+            base.Resource(None, {'id': 'some-id',
+                                 'not_default_field': 'creating'}),
+            base.Resource(None, {'id': 'some-id',
+                                 'not_default_field': 'available'})]
+        info = {}
+        cinderclient.shell_utils.wait_for_status(
+            manager, 'some-id', info, 'some', ['available'], 3600,
+            global_request_id='req-someid',
+            messages=mock.Mock(spec=['list']),
+            status_field='not_default_field')
+        self.assertEqual({'not_default_field': 'available'}, info)
+        self.assertEqual([mock.call('some-id')] * 2,
+                         manager.get.call_args_list)
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('cinderclient.waiter.time')
+    def test_wait_for_status_error(self, mock_time, mock_stdout):
+        mock_time.monotonic.return_value = 0
+        manager = mock.Mock(spec=['get'])
+        manager.get.side_effect = [
+            base.Resource(None, {'id': 'some-id',
+                                 'not_default_field': 'creating'}),
+            base.Resource(None, {'id': 'some-id',
+                                 'not_default_field': 'error'})]
+        messages = mock.Mock(spec=['list'])
+        messages.list.return_value = [
+            mock.Mock(resource_uuid='some-id', user_message='ERROR!')]
+        self.assertRaisesRegex(exceptions.ResourceInErrorState, 'ERROR!',
+                               cinderclient.shell_utils.wait_for_status,
+                               manager, 'some-id', {}, 'some',
+                               ['available'], 3600,
+                               global_request_id='req-someid',
+                               messages=messages,
+                               status_field='not_default_field')
+        messages.list.assert_called_once_with(
+            search_opts={'request_id': 'req-someid'})
 
     def test_backup(self):
         self.run_command('--os-volume-api-version 3.42 backup-create '
@@ -2013,3 +2057,57 @@ class ShellTest(utils.TestCase):
         expected = {'os-reimage': {'image_id': '1',
                                    'reimage_reserved': reimage_reserved}}
         self.assert_called('POST', '/volumes/1234/action', body=expected)
+
+    @mock.patch('sys.stdin', io.StringIO('# runbook\n'
+                                         'show 1234\n'
+                                         '\n'
+                                         'reset-state --state error 1234\n'))
+    def test_batch(self):
+        self.run_command('batch')
+        self.assert_called('GET', '/volumes/1234', pos=-3)
+        self.assert_called('POST', '/volumes/1234/action',
+                           body={'os-reset_status': {'status': 'error'}})
+
+    def test_batch_file(self):
+        path = self.useFixture(fixtures.TempDir()).join('runbook')
+        with open(path, 'w') as f:
+            f.write("metadata 1234 set 'key=a value'\n")
+        self.run_command('batch %s' % path)
+        self.assert_called('POST', '/volumes/1234/metadata',
+                           body={'metadata': {'key': 'a value'}})
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('sys.stdin', io.StringIO('# runbook\n'
+                                         'show\n'
+                                         '\n'
+                                         'batch\n'
+                                         'reset-state --state error 1234\n'))
+    def test_batch_errors(self, mock_stderr):
+        self.assertRaisesRegex(exceptions.CommandError,
+                               '2 of 3 commands failed',
+                               self.run_command, 'batch')
+        self.assert_called('POST', '/volumes/1234/action',
+                           body={'os-reset_status': {'status': 'error'}})
+        self.assertIn("ERROR (line 4): 'batch' cannot be run",
+                      mock_stderr.getvalue())
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('sys.stdin', io.StringIO('show\n'
+                                         'reset-state --state error 1234\n'))
+    def test_batch_stop_on_error(self, mock_stderr):
+        self.assertRaisesRegex(exceptions.CommandError,
+                               '1 of 1 commands failed',
+                               self.run_command, 'batch --stop-on-error')
+        self.assertEqual([], self.shell.cs.client.callstack)
+
+    @mock.patch('builtins.input',
+                side_effect=['show 1234', 'nosuchcommand', '',
+                             'reset-state --state error 1234', 'exit',
+                             'show 5678'])
+    def test_shell(self, mock_input):
+        with mock.patch('sys.stderr', new_callable=io.StringIO):
+            self.run_command('shell')
+        self.assertEqual(5, mock_input.call_count)
+        self.assert_called('GET', '/volumes/1234', pos=-3)
+        self.assert_called('POST', '/volumes/1234/action',
+                           body={'os-reset_status': {'status': 'error'}})
@@ -67,6 +67,19 @@ class VolumeBackupsTest(utils.TestCase):
         cs.assert_called('GET', '/backups/detail?limit=2&marker=100')
         self._assert_request_id(lst)
 
+    def test_iter(self):
+        backups = cs.backups.iter(limit=2, marker=100)
+        cs.client.callstack = []
+        self.assertEqual(2, len(list(backups)))
+        cs.assert_called('GET', '/backups/detail?limit=2&marker=100')
+
+    def test_iter_pages(self):
+        pages = list(cs.backups.iter(pages=True))
+        cs.assert_called('GET', '/backups/detail')
+        self.assertEqual(1, len(pages))
+        self.assertEqual(2, len(pages[0]))
+        self._assert_request_id(pages[0])
+
     def test_sorted_list(self):
         lst = cs.backups.list(sort="id")
         cs.assert_called('GET', '/backups/detail?sort=id')
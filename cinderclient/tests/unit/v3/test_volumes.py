@@ -158,6 +158,27 @@ class VolumesTest(utils.TestCase):
                     % parse.quote_plus("{'key1': 'val1'}"))
         cs.assert_called('GET', expected)
 
+    def test_iter(self):
+        cs = fakes.FakeClient(api_versions.APIVersion('3.0'))
+        vols = list(cs.volumes.iter(search_opts={'status': 'available'}))
+        cs.assert_called('GET', '/volumes/detail?status=available')
+        self.assertEqual(1, len(vols))
+        self.assertIsInstance(vols[0], volumes.Volume)
+
+    def test_list_raw_fields(self):
+        cs = fakes.FakeClient(api_versions.APIVersion('3.0'))
+        vols = cs.volumes.list(fields=['id', 'status', 'missing'], raw=True)
+        cs.assert_called('GET', '/volumes/detail')
+        self.assertEqual([{'id': 1234, 'status': 'available'}], vols)
+        self._assert_request_id(vols)
+
+    def test_list_fields(self):
+        cs = fakes.FakeClient(api_versions.APIVersion('3.0'))
+        vols = cs.volumes.list(fields=['id', 'name'])
+        self.assertIsInstance(vols[0], volumes.Volume)
+        self.assertEqual({'id': 1234, 'name': 'sample-volume'},
+                         vols[0].to_dict())
+
     @ddt.data(True, False)
     def test_get_pools_filter_by_name(self, detail):
         cs = fakes.FakeClient(api_version=api_versions.APIVersion('3.33'))
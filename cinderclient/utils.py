@@ -14,14 +14,21 @@
 #    under the License.
 
 import collections
+from concurrent import futures
+import importlib.util
 import os
+import sys
 from urllib import parse
 import uuid
 
-import stevedore
-
 from cinderclient import exceptions
 
+# Number of lookups sent concurrently by find_resources().
+FIND_RESOURCES_WORKERS = 8
+# Number of names above which find_resources() matches them against a
+# single listing instead of looking each of them up.
+FIND_RESOURCES_LIST_THRESHOLD = 10
+
 
 def arg(*args, **kwargs):
     """Decorator for CLI args."""
@@ -84,6 +91,39 @@ def add_exclusive_arg(f, group_name, required, *args, **kwargs):
             f.exclusive_args['__required__'][group_name] = required
 
 
+class _LazyModule(object):
+    """Stand-in for a module, imported on first attribute access."""
+
+    def __init__(self, name):
+        self.__name = name
+
+    def __getattr__(self, attr):
+        # NOTE: import_module() returns sys.modules[name] once imported.
+        return getattr(importlib.import_module(self.__name), attr)
+
+    def __repr__(self):
+        return "<lazily imported module %r>" % self.__name
+
+
+def lazy_import(name):
+    """Return a module that is only imported when an attribute is accessed.
+
+    Used for dependencies that are slow to import and not needed by every
+    command or library call. ``sys.modules`` is left alone until the first
+    access, which imports the module normally, so other importers of the
+    module are not affected. A missing top-level package is reported right
+    away, a missing submodule on first access.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    # NOTE: find_spec() would import the parent packages of a submodule.
+    package = name.partition('.')[0]
+    if importlib.util.find_spec(package) is None:
+        raise ImportError("No module named %r" % package, name=package)
+    return _LazyModule(name)
+
+
 def unauthenticated(f):
     """
     Adds 'unauthenticated' attribute to decorated function.
@@ -156,6 +196,11 @@ def find_resource(manager, name_or_id, **kwargs):
         except (ValueError, exceptions.NotFound):
             pass
 
+    if not is_group:
+        resource = _find_cached_name(manager, name_or_id)
+        if resource is not None:
+            return resource
+
     try:
         try:
             resource = getattr(manager, 'resource_class', None)
@@ -174,15 +219,164 @@ def find_resource(manager, name_or_id, **kwargs):
                 return manager.find(**kwargs)
             return manager.find(human_id=name_or_id)
         except exceptions.NotFound:
-            msg = "No %s with a name or ID of '%s' exists." % \
-                (manager.resource_class.__name__.lower(), name_or_id)
-            raise exceptions.CommandError(msg)
+            raise _not_found_error(manager, name_or_id)
 
     except exceptions.NoUniqueMatch:
-        msg = ("Multiple %s matches found for '%s', use an ID to be more"
-               " specific." % (manager.resource_class.__name__.lower(),
-                               name_or_id))
-        raise exceptions.CommandError(msg)
+        raise _no_unique_match_error(manager, name_or_id)
+
+
+def _find_cached_name(manager, name):
+    """Get the resource cached for a name, validated with a GET."""
+    name_cache = getattr(manager, 'name_cache', None)
+    if name_cache is None:
+        return None
+    resource_type = manager.resource_class.__name__.lower()
+    resource_id = name_cache.get(resource_type, name)
+    if resource_id is None:
+        return None
+    try:
+        resource = manager.get(resource_id)
+    except exceptions.NotFound:
+        resource = None
+    if getattr(resource, manager.resource_class.NAME_ATTR, None) == name:
+        return resource
+    name_cache.discard(resource_type, resource_id)
+    return None
+
+
+def _not_found_error(manager, name_or_id):
+    msg = "No %s with a name or ID of '%s' exists." % \
+        (manager.resource_class.__name__.lower(), name_or_id)
+    return exceptions.CommandError(msg)
+
+
+def _no_unique_match_error(manager, name_or_id):
+    msg = ("Multiple %s matches found for '%s', use an ID to be more"
+           " specific." % (manager.resource_class.__name__.lower(),
+                           name_or_id))
+    return exceptions.CommandError(msg)
+
+
+class FoundResources(dict):
+    """Resources found by :func:`find_resources`, keyed by name or ID.
+
+    Looking up an item that could not be resolved raises the exception
+    explaining why, a :class:`exceptions.CommandError` for missing and
+    ambiguous items as :func:`find_resource` would have. The errors are
+    also available in the ``errors`` attribute.
+    """
+
+    def __init__(self):
+        super(FoundResources, self).__init__()
+        self.errors = {}
+
+    def __missing__(self, name_or_id):
+        if name_or_id in self.errors:
+            raise self.errors[name_or_id]
+        raise KeyError(name_or_id)
+
+
+def _map_concurrently(func, items):
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    workers = min(len(items), FIND_RESOURCES_WORKERS)
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _find_in_listing(manager, names, found, all_tenants):
+    """Match names against a single listing.
+
+    :returns: the names that are still to be looked up
+    """
+    search_opts = {'all_tenants': 1} if all_tenants else None
+    try:
+        listing = manager.list(search_opts=search_opts)
+    except Exception:
+        # The names are looked up one by one instead, which reports the
+        # errors per item.
+        return names
+    resource = getattr(manager, 'resource_class', None)
+    name_attr = resource.NAME_ATTR if resource else 'name'
+    by_name = collections.defaultdict(list)
+    by_human_id = collections.defaultdict(list)
+    for obj in listing:
+        by_name[getattr(obj, name_attr, None)].append(obj)
+        by_human_id[getattr(obj, 'human_id', None)].append(obj)
+
+    left = []
+    for name in names:
+        matches = by_name.get(name) or by_human_id.get(name) or []
+        if not matches:
+            # May belong to another project, find_resource() looks there.
+            left.append(name)
+        elif len(matches) > 1:
+            found.errors[name] = _no_unique_match_error(manager, name)
+        else:
+            found[name] = matches[0]
+    return left
+
+
+def find_resources(manager, names_or_ids, all_tenants=False):
+    """Find several resources by name or ID with as few requests as possible.
+
+    The IDs are fetched concurrently. The names, and the IDs that were not
+    found, are then looked up concurrently with :func:`find_resource`.
+    Past ``FIND_RESOURCES_LIST_THRESHOLD`` names, they are first matched
+    against a single listing of the resources of the project, or of all the
+    projects with ``all_tenants``. Items that are missing, ambiguous or
+    failed to be fetched are reported per item, see
+    :class:`FoundResources`, this function doesn't raise them.
+
+    :rtype: :class:`FoundResources`
+    """
+    found = FoundResources()
+    pending = list(collections.OrderedDict.fromkeys(names_or_ids))
+
+    def get(name_or_id):
+        try:
+            if isinstance(name_or_id, int) or name_or_id.isdigit():
+                return manager.get(int(name_or_id))
+            return manager.get(name_or_id)
+        except exceptions.NotFound:
+            # Might be a name after all.
+            return None
+        except Exception as e:
+            # Reported for this item only, like the other lookup errors.
+            return e
+
+    def find(name):
+        try:
+            return find_resource(manager, name)
+        except Exception as e:
+            return e
+
+    ids = [x for x in pending if _is_id(x)]
+    for name_or_id, result in zip(ids, _map_concurrently(get, ids)):
+        if isinstance(result, Exception):
+            found.errors[name_or_id] = result
+        elif result is not None:
+            found[name_or_id] = result
+
+    names = [x for x in pending if x not in found and x not in found.errors]
+    if len(names) > FIND_RESOURCES_LIST_THRESHOLD:
+        names = _find_in_listing(manager, names, found, all_tenants)
+    for name, result in zip(names, _map_concurrently(find, names)):
+        if isinstance(result, Exception):
+            found.errors[name] = result
+        else:
+            found[name] = result
+    return found
+
+
+def _is_id(name_or_id):
+    if isinstance(name_or_id, int) or name_or_id.isdigit():
+        return True
+    try:
+        uuid.UUID(name_or_id)
+    except ValueError:
+        return False
+    return True
 
 
 def find_volume(cs, volume):
@@ -204,6 +398,10 @@ def safe_issubclass(*args):
 
 def _load_entry_point(ep_name, name=None):
     """Try to load the entry point ep_name that matches name."""
+    # NOTE: stevedore scans every installed distribution when imported, only
+    # pay for it when an entry point is actually loaded.
+    import stevedore
+
     mgr = stevedore.NamedExtensionManager(
         namespace=ep_name,
         names=[name],
@@ -14,4 +14,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from cinderclient.v3.client import Client  # noqa
+import importlib
+
+
+def __getattr__(name):
+    # NOTE: the client imports every manager module, only import it when it is
+    # used rather than whenever a module of this package is.
+    if name == 'Client':
+        return importlib.import_module('cinderclient.v3.client').Client
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
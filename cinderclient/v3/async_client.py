@@ -0,0 +1,228 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Asynchronous (asyncio) access to the OpenStack Volume API."""
+
+import asyncio
+from concurrent import futures
+import functools
+import inspect
+
+from cinderclient import base
+from cinderclient import client as base_client
+from cinderclient.v3 import client
+
+
+class _BridgeHTTPClient(object):
+    """Synchronous transport sending its requests on an event loop.
+
+    Manager methods are run in worker threads by :class:`AsyncClient`. Their
+    requests are sent by the asynchronous transport on the event loop while
+    the thread waits for the response. The other attributes, such as
+    ``management_url``, are those of the wrapped synchronous transport.
+    """
+
+    def __init__(self, http_client, async_http_client):
+        self.http_client = http_client
+        self.async_http_client = async_http_client
+        self.loop = None
+
+    def __getattr__(self, name):
+        return getattr(self.http_client, name)
+
+    def _cs_request(self, url, method, **kwargs):
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if self.loop is None or running_loop is not None:
+            raise RuntimeError("Requests of the asynchronous client can't "
+                               "be sent from the event loop, await the "
+                               "methods of its managers instead.")
+        return asyncio.run_coroutine_threadsafe(
+            self.async_http_client.request(url, method, **kwargs),
+            self.loop).result()
+
+    def get(self, url, **kwargs):
+        return self._cs_request(url, 'GET', **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._cs_request(url, 'POST', **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._cs_request(url, 'PUT', **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._cs_request(url, 'DELETE', **kwargs)
+
+    def get_with_base_url(self, url, **kwargs):
+        return self._cs_request(url, 'GET', base_url=True, **kwargs)
+
+    def create_update_with_base_url(self, url, **kwargs):
+        return self._cs_request(url, 'PUT', base_url=True, **kwargs)
+
+    def delete_with_base_url(self, url, **kwargs):
+        return self._cs_request(url, 'DELETE', base_url=True, **kwargs)
+
+
+class _BridgedClient(object):
+    """The synchronous ``Client`` seen by the managers of an AsyncClient.
+
+    Attributes are those of the wrapped client, e.g. its caches and API
+    version, except for the transport and the managers, which are bound to
+    this object. The caches keep resolving their scope with the transport
+    of the wrapped client.
+    """
+
+    def __init__(self, sync_client, http_client):
+        self._sync_client = sync_client
+        self.client = http_client
+
+    def __getattr__(self, name):
+        attr = getattr(self._sync_client, name)
+        if isinstance(attr, base.Manager):
+            # NOTE: setdefault keeps the first manager if two threads race.
+            attr = self.__dict__.setdefault(name, type(attr)(self))
+        return attr
+
+
+class AsyncManager(object):
+    """Expose the public methods of a manager as coroutines.
+
+    The wrapped manager is used unchanged, so URL building, microversion
+    dispatch and error mapping are exactly those of the synchronous client.
+    Methods returning generators, such as ``iter()``, are not available as
+    the generators would send their requests from the event loop,
+    ``list()`` fetches the pages of a listing without blocking instead.
+    """
+
+    # Methods whose generators would send requests from the event loop
+    # once returned.
+    GENERATOR_METHODS = frozenset(['iter'])
+
+    def __init__(self, async_client, manager):
+        self.async_client = async_client
+        self.manager = manager
+
+    def __getattr__(self, name):
+        attr = getattr(self.manager, name)
+        if name.startswith('_') or not inspect.ismethod(attr):
+            return attr
+        if name in self.GENERATOR_METHODS:
+            raise AttributeError(
+                "%s() of %s is not available asynchronously, use list() "
+                "instead." % (name, self.manager.__class__.__name__))
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.async_client.call(attr, *args, **kwargs)
+
+        setattr(self, name, method)
+        return method
+
+    def __repr__(self):
+        return "<AsyncManager %s>" % self.manager.__class__.__name__
+
+
+class AsyncClient(object):
+    """Top-level object to access the OpenStack Volume API from asyncio.
+
+    It accepts the same arguments as :class:`cinderclient.v3.client.Client`
+    (plus ``connection_limit``) and exposes the same managers, whose public
+    methods become coroutines::
+
+        >>> async with AsyncClient(session=sess, api_version=ver) as cs:
+        ...     volumes = await cs.volumes.list()
+
+    Resources returned by the managers are the regular synchronous
+    resources; use the managers of this client to act on them without
+    blocking the event loop. The ``aiohttp`` library is required.
+    """
+
+    def __init__(self, *args, **kwargs):
+        connection_limit = kwargs.pop('connection_limit', None)
+        sync_client = client.Client(*args, **kwargs)
+        self._setup(sync_client, connection_limit=connection_limit)
+
+    @classmethod
+    def from_client(cls, sync_client, connection_limit=None, http=None):
+        """Build an asynchronous client on top of an existing ``Client``."""
+        async_client = cls.__new__(cls)
+        async_client._setup(sync_client, connection_limit=connection_limit,
+                            http=http)
+        return async_client
+
+    def _setup(self, sync_client, connection_limit=None, http=None):
+        self.sync_client = sync_client
+        self.connection_limit = (connection_limit or
+                                 base_client.DEFAULT_ASYNC_CONNECTION_LIMIT)
+        self.http = http or base_client.AsyncHTTPClient(
+            sync_client.client,
+            api_version=sync_client.api_version,
+            connection_limit=connection_limit)
+        self._bridge = _BridgeHTTPClient(sync_client.client, self.http)
+        self._client = _BridgedClient(sync_client, self._bridge)
+        self._executor = None
+        self._managers = {}
+
+    @property
+    def api_version(self):
+        return self.sync_client.api_version
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name in ('sync_client', 'http',
+                                            'connection_limit'):
+            raise AttributeError(name)
+        try:
+            return self._managers[name]
+        except KeyError:
+            pass
+        attr = getattr(self._client, name)
+        if not isinstance(attr, base.Manager):
+            return attr
+        manager = AsyncManager(self, attr)
+        self._managers[name] = manager
+        return manager
+
+    async def call(self, func, *args, **kwargs):
+        """Run a synchronous client function without blocking the loop.
+
+        ``func`` is run once in a worker thread. The requests made by the
+        managers of this client are sent by the asynchronous transport on
+        the running event loop, and the thread waits for their responses.
+        Requests sent from several threads, e.g. by ``parallel_list()``, are
+        in flight at the same time. Helpers such as
+        :func:`cinderclient.utils.find_resource` can be used this way::
+
+            >>> vol = await cs.call(utils.find_resource,
+            ...                     cs.volumes.manager, 'myvol')
+        """
+        loop = asyncio.get_running_loop()
+        self._bridge.loop = loop
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=self.connection_limit,
+                thread_name_prefix='cinderclient-async')
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        await self.http.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
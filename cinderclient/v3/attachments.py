@@ -25,6 +25,7 @@ class VolumeAttachment(base.Resource):
 
 class VolumeAttachmentManager(base.ManagerWithFind):
     resource_class = VolumeAttachment
+    filter_resource = 'attachment'
 
     @api_versions.wraps('3.27')
     def create(self, volume_id, connector, instance_id=None, mode='null'):
@@ -46,8 +47,34 @@ class VolumeAttachmentManager(base.ManagerWithFind):
 
     @api_versions.wraps('3.27')
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort=None):
-        """List all attachments."""
+             sort=None, fields=None, raw=False):
+        """List all attachments.
+
+        :param fields: Keys to keep in each record, the other ones are
+                       dropped as each page is received.
+        :param raw: Return plain dicts instead of attachment objects.
+        """
+        resource_type = "attachments"
+        url = self._build_list_url(resource_type,
+                                   detailed=detailed,
+                                   search_opts=search_opts,
+                                   marker=marker,
+                                   limit=limit,
+                                   sort=sort)
+        return self._list(url, resource_type, limit=limit, fields=fields,
+                          raw=raw)
+
+    @api_versions.wraps('3.27')
+    def iter(self, detailed=False, search_opts=None, marker=None, limit=None,
+             sort=None, pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over attachments, fetching one page at a time.
+
+        :param pages: Yield whole pages instead of attachments.
+        :param prefetch: Number of pages to fetch ahead in background while
+                         the current one is consumed.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Yield plain dicts, see :meth:`list`.
+        """
         resource_type = "attachments"
         url = self._build_list_url(resource_type,
                                    detailed=detailed,
@@ -55,7 +82,8 @@ class VolumeAttachmentManager(base.ManagerWithFind):
                                    marker=marker,
                                    limit=limit,
                                    sort=sort)
-        return self._list(url, resource_type, limit=limit)
+        return self._iter(url, resource_type, limit=limit, pages=pages,
+                          prefetch=prefetch, fields=fields, raw=raw)
 
     @api_versions.wraps('3.27')
     def show(self, id):
@@ -30,6 +30,7 @@ class AvailabilityZoneManager(base.ManagerWithFind):
     """Manage :class:`AvailabilityZone` resources."""
     resource_class = AvailabilityZone
 
+    @base.cached('availability_zones')
     def list(self, detailed=False):
         """Lists all availability zones.
 
@@ -13,35 +13,37 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import importlib
+
 from cinderclient import api_versions
+from cinderclient import cache
 from cinderclient import client
-from cinderclient.v3 import attachments
-from cinderclient.v3 import availability_zones
-from cinderclient.v3 import capabilities
-from cinderclient.v3 import cgsnapshots
-from cinderclient.v3 import clusters
-from cinderclient.v3 import consistencygroups
-from cinderclient.v3 import default_types
-from cinderclient.v3 import group_snapshots
-from cinderclient.v3 import group_types
-from cinderclient.v3 import groups
-from cinderclient.v3 import limits
-from cinderclient.v3 import messages
-from cinderclient.v3 import pools
-from cinderclient.v3 import qos_specs
-from cinderclient.v3 import quota_classes
-from cinderclient.v3 import quotas
-from cinderclient.v3 import resource_filters
-from cinderclient.v3 import services
-from cinderclient.v3 import volume_backups
-from cinderclient.v3 import volume_backups_restore
-from cinderclient.v3 import volume_encryption_types
-from cinderclient.v3 import volume_snapshots
-from cinderclient.v3 import volume_transfers
-from cinderclient.v3 import volume_type_access
-from cinderclient.v3 import volume_types
-from cinderclient.v3 import volumes
-from cinderclient.v3 import workers
+
+
+class _LazyManager(object):
+    """Manager attribute of :class:`Client` built on first access.
+
+    The manager module is imported then, and the manager is stored on the
+    instance so that later accesses are plain attribute lookups.
+    """
+
+    def __init__(self, module, class_name):
+        self.module = 'cinderclient.v3.%s' % module
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        extension = instance._extensions.get(self.name)
+        manager_class = extension and extension.manager_class
+        if manager_class is None:
+            manager_class = getattr(importlib.import_module(self.module),
+                                    self.class_name)
+        # NOTE: setdefault keeps the first manager if two threads race.
+        return instance.__dict__.setdefault(self.name, manager_class(instance))
 
 
 class Client(object):
@@ -57,6 +59,40 @@ class Client(object):
         ...
     """
 
+    limits = _LazyManager('limits', 'LimitsManager')
+    volumes = _LazyManager('volumes', 'VolumeManager')
+    volume_snapshots = _LazyManager('volume_snapshots', 'SnapshotManager')
+    volume_types = _LazyManager('volume_types', 'VolumeTypeManager')
+    group_types = _LazyManager('group_types', 'GroupTypeManager')
+    volume_type_access = _LazyManager('volume_type_access',
+                                      'VolumeTypeAccessManager')
+    volume_encryption_types = _LazyManager('volume_encryption_types',
+                                           'VolumeEncryptionTypeManager')
+    default_types = _LazyManager('default_types', 'DefaultVolumeTypeManager')
+    qos_specs = _LazyManager('qos_specs', 'QoSSpecsManager')
+    quota_classes = _LazyManager('quota_classes', 'QuotaClassSetManager')
+    quotas = _LazyManager('quotas', 'QuotaSetManager')
+    backups = _LazyManager('volume_backups', 'VolumeBackupManager')
+    messages = _LazyManager('messages', 'MessageManager')
+    resource_filters = _LazyManager('resource_filters',
+                                    'ResourceFilterManager')
+    restores = _LazyManager('volume_backups_restore',
+                            'VolumeBackupRestoreManager')
+    transfers = _LazyManager('volume_transfers', 'VolumeTransferManager')
+    services = _LazyManager('services', 'ServiceManager')
+    clusters = _LazyManager('clusters', 'ClusterManager')
+    workers = _LazyManager('workers', 'WorkerManager')
+    consistencygroups = _LazyManager('consistencygroups',
+                                     'ConsistencygroupManager')
+    groups = _LazyManager('groups', 'GroupManager')
+    cgsnapshots = _LazyManager('cgsnapshots', 'CgsnapshotManager')
+    group_snapshots = _LazyManager('group_snapshots', 'GroupSnapshotManager')
+    availability_zones = _LazyManager('availability_zones',
+                                      'AvailabilityZoneManager')
+    pools = _LazyManager('pools', 'PoolManager')
+    capabilities = _LazyManager('capabilities', 'CapabilitiesManager')
+    attachments = _LazyManager('attachments', 'VolumeAttachmentManager')
+
     def __init__(self, username=None, api_key=None, project_id=None,
                  auth_url='', insecure=False, timeout=None, tenant_id=None,
                  proxy_tenant_id=None, proxy_token=None, region_name=None,
@@ -65,52 +101,24 @@ class Client(object):
                  volume_service_name=None, os_endpoint=None, retries=0,
                  http_log_debug=False, cacert=None, cert=None,
                  auth_system='keystone', auth_plugin=None, session=None,
-                 api_version=None, logger=None, **kwargs):
+                 api_version=None, logger=None, compact_resources=False,
+                 name_cache=False, name_cache_ttl=None, version_cache=False,
+                 version_cache_ttl=None, response_cache=False,
+                 response_cache_size=None, catalog_cache=False,
+                 catalog_cache_ttl=None, **kwargs):
         # FIXME(comstud): Rename the api_key argument above when we
         # know it's not being used as keyword argument
         password = api_key
         self.version = '3.0'
-        self.limits = limits.LimitsManager(self)
+        # NOTE: resources returned by listings keep their attributes in
+        # their _info dict only, see apiclient.base.Resource.
+        self.compact_resources = compact_resources
         self.api_version = api_version or api_versions.APIVersion(self.version)
 
-        self.volumes = volumes.VolumeManager(self)
-        self.volume_snapshots = volume_snapshots.SnapshotManager(self)
-        self.volume_types = volume_types.VolumeTypeManager(self)
-        self.group_types = group_types.GroupTypeManager(self)
-        self.volume_type_access = \
-            volume_type_access.VolumeTypeAccessManager(self)
-        self.volume_encryption_types = \
-            volume_encryption_types.VolumeEncryptionTypeManager(self)
-        self.default_types = default_types.DefaultVolumeTypeManager(self)
-        self.qos_specs = qos_specs.QoSSpecsManager(self)
-        self.quota_classes = quota_classes.QuotaClassSetManager(self)
-        self.quotas = quotas.QuotaSetManager(self)
-        self.backups = volume_backups.VolumeBackupManager(self)
-        self.messages = messages.MessageManager(self)
-        self.resource_filters = resource_filters.ResourceFilterManager(self)
-        self.restores = volume_backups_restore.VolumeBackupRestoreManager(self)
-        self.transfers = volume_transfers.VolumeTransferManager(self)
-        self.services = services.ServiceManager(self)
-        self.clusters = clusters.ClusterManager(self)
-        self.workers = workers.WorkerManager(self)
-        self.consistencygroups = consistencygroups.\
-            ConsistencygroupManager(self)
-        self.groups = groups.GroupManager(self)
-        self.cgsnapshots = cgsnapshots.CgsnapshotManager(self)
-        self.group_snapshots = group_snapshots.GroupSnapshotManager(self)
-        self.availability_zones = \
-            availability_zones.AvailabilityZoneManager(self)
-        self.pools = pools.PoolManager(self)
-        self.capabilities = capabilities.CapabilitiesManager(self)
-        self.attachments = \
-            attachments.VolumeAttachmentManager(self)
-
-        # Add in any extensions...
-        if extensions:
-            for extension in extensions:
-                if extension.manager_class:
-                    setattr(self, extension.name,
-                            extension.manager_class(self))
+        # Managers are built on first access, see _LazyManager. Extension
+        # modules are only loaded then, see client.discover_extensions().
+        self._extensions = dict((extension.name, extension)
+                                for extension in extensions or [])
 
         self.client = client._construct_http_client(
             username=username,
@@ -139,6 +147,61 @@ class Client(object):
             logger=logger,
             **kwargs)
 
+        # NOTE: find_resource() looks names up in this persistent index
+        # before listing, see cinderclient.cache.NameCache.
+        self.name_cache = None
+        if name_cache:
+            self.name_cache = cache.NameCache(self._get_cache_scope,
+                                              ttl=name_cache_ttl)
+
+        # NOTE: api_versions.discover_version() reads the microversions the
+        # endpoint supports from this cache, which the HTTP client discards
+        # when the server rejects a microversion.
+        self.version_cache = None
+        if version_cache:
+            self.version_cache = cache.VersionCache(self._get_endpoint,
+                                                    ttl=version_cache_ttl)
+            self.client.version_cache = self.version_cache
+
+        # NOTE: GET responses are revalidated with their ETag, see
+        # cinderclient.cache.ResponseCache.
+        self.response_cache = None
+        if response_cache:
+            self.response_cache = cache.ResponseCache(response_cache_size)
+            self.client.response_cache = self.response_cache
+
+        # NOTE: volume types, QoS specs, availability zones, extensions,
+        # resource filters and pools are read from this cache, see
+        # cinderclient.cache.CatalogCache.
+        self.catalog_cache = None
+        if catalog_cache:
+            self.catalog_cache = cache.CatalogCache(ttl=catalog_cache_ttl)
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, i.e. extension managers that
+        # were not built yet.
+        extension = self.__dict__.get('_extensions', {}).get(name)
+        manager_class = extension and extension.manager_class
+        if manager_class is None:
+            raise AttributeError("%r object has no attribute %r" %
+                                 (type(self).__name__, name))
+        return self.__dict__.setdefault(name, manager_class(self))
+
+    def _get_endpoint(self):
+        if isinstance(self.client, client.SessionClient):
+            return self.client.get_endpoint()
+        if not self.client.management_url:
+            self.client.authenticate()
+        return self.client.management_url
+
+    def _get_cache_scope(self):
+        """Identify the endpoint and project the caches are valid for."""
+        if isinstance(self.client, client.SessionClient):
+            return '%s %s' % (self._get_endpoint(),
+                              self.client.get_project_id())
+        return '%s %s' % (self._get_endpoint(),
+                          self.client.tenant_id or self.client.projectid)
+
     def authenticate(self):
         """Authenticate against the server.
 
@@ -33,6 +33,7 @@ class ListExtResource(base.Resource):
 class ListExtManager(base.Manager):
     resource_class = ListExtResource
 
+    @base.cached('extensions')
     def show_all(self):
         return self._list("/extensions", 'extensions')
 
@@ -27,6 +27,7 @@ class DefaultVolumeTypeManager(base.ManagerWithFind):
     """Manage :class:`DefaultVolumeType` resources."""
     resource_class = DefaultVolumeType
 
+    @base.invalidates('volume_types')
     def create(self, volume_type, project_id):
         """Creates a default volume type for a project
 
@@ -56,6 +57,7 @@ class DefaultVolumeTypeManager(base.ManagerWithFind):
 
         return self._get_all_with_base_url(url, response_key)
 
+    @base.invalidates('volume_types')
     def delete(self, project_id):
         """Removes the default volume type for a project
 
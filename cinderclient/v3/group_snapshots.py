@@ -43,6 +43,7 @@ class GroupSnapshot(base.Resource):
 class GroupSnapshotManager(base.ManagerWithFind):
     """Manage :class:`GroupSnapshot` resources."""
     resource_class = GroupSnapshot
+    filter_resource = 'group_snapshot'
 
     @api_versions.wraps('3.14')
     def create(self, group_id, name=None, description=None,
@@ -60,6 +60,7 @@ class Group(base.Resource):
 class GroupManager(base.ManagerWithFind):
     """Manage :class:`Group` resources."""
     resource_class = Group
+    filter_resource = 'group'
 
     @api_versions.wraps('3.13')
     def create(self, group_type, volume_types, name=None,
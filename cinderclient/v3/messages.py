@@ -30,6 +30,7 @@ class Message(base.Resource):
 class MessageManager(base.ManagerWithFind):
     """Manage :class:`Message` resources."""
     resource_class = Message
+    filter_resource = 'message'
 
     @api_versions.wraps('3.3')
     def get(self, message_id):
@@ -53,7 +54,7 @@ class MessageManager(base.ManagerWithFind):
 
     @api_versions.wraps('3.5')
     def list(self, search_opts=None, marker=None, limit=None,  # noqa: F811
-             sort=None):
+             sort=None, fields=None, raw=False):
         """Lists all messages.
 
         :param search_opts: Search options to filter out volumes.
@@ -61,13 +62,37 @@ class MessageManager(base.ManagerWithFind):
                        list than that represented by this volume id.
         :param limit: Maximum number of volumes to return.
         :param sort: Sort information
-        :rtype: list of :class:`Message`
+        :param fields: Keys to keep in each record, the other ones are
+                       dropped as each page is received.
+        :param raw: Return plain dicts instead of :class:`Message` objects.
+        :rtype: list of :class:`Message` or of dict
+        """
+        resource_type = "messages"
+        url = self._build_list_url(resource_type, detailed=False,
+                                   search_opts=search_opts, marker=marker,
+                                   limit=limit, sort=sort)
+        return self._list(url, resource_type, limit=limit, fields=fields,
+                          raw=raw)
+
+    @api_versions.wraps('3.5')
+    def iter(self, search_opts=None, marker=None, limit=None, sort=None,
+             pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over messages, fetching one page at a time.
+
+        :param pages: Yield whole pages instead of messages.
+        :param prefetch: Number of pages to fetch ahead in background while
+                         the current one is consumed.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Yield plain dicts, see :meth:`list`.
+        :rtype: generator of :class:`Message` or of
+                :class:`cinderclient.base.ListPage`
         """
         resource_type = "messages"
         url = self._build_list_url(resource_type, detailed=False,
                                    search_opts=search_opts, marker=marker,
                                    limit=limit, sort=sort)
-        return self._list(url, resource_type, limit=limit)
+        return self._iter(url, resource_type, limit=limit, pages=pages,
+                          prefetch=prefetch, fields=fields, raw=raw)
 
     @api_versions.wraps('3.3')
     def delete(self, message):
@@ -29,6 +29,7 @@ class PoolManager(base.Manager):
     """Manage :class:`Pool` resources."""
     resource_class = Pool
 
+    @base.cached('pools')
     def list(self, detailed=False):
         """Lists all
 
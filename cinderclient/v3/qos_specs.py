@@ -44,6 +44,7 @@ class QoSSpecsManager(base.ManagerWithFind):
     """
     resource_class = QoSSpecs
 
+    @base.cached('qos_specs')
     def list(self, search_opts=None):
         """Get a list of all qos specs.
 
@@ -51,6 +52,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         """
         return self._list("/qos-specs", "qos_specs")
 
+    @base.cached('qos_specs')
     def get(self, qos_specs):
         """Get a specific qos specs.
 
@@ -59,6 +61,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         """
         return self._get("/qos-specs/%s" % base.getid(qos_specs), "qos_specs")
 
+    @base.invalidates('qos_specs')
     def delete(self, qos_specs, force=False):
         """Delete a specific qos specs.
 
@@ -69,6 +72,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         return self._delete("/qos-specs/%s?force=%s" %
                             (base.getid(qos_specs), force))
 
+    @base.invalidates('qos_specs')
     def create(self, name, specs):
         """Create a qos specs.
 
@@ -86,6 +90,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         body["qos_specs"].update(specs)
         return self._create("/qos-specs", body, "qos_specs")
 
+    @base.invalidates('qos_specs')
     def set_keys(self, qos_specs, specs):
         """Add/Update keys in qos specs.
 
@@ -101,6 +106,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         body["qos_specs"].update(specs)
         return self._update("/qos-specs/%s" % qos_specs, body)
 
+    @base.invalidates('qos_specs')
     def unset_keys(self, qos_specs, specs):
         """Remove keys from a qos specs.
 
@@ -123,6 +129,7 @@ class QoSSpecsManager(base.ManagerWithFind):
         return self._list("/qos-specs/%s/associations" % base.getid(qos_specs),
                           "qos_associations")
 
+    @base.invalidates('qos_specs', 'volume_types')
     def associate(self, qos_specs, vol_type_id):
         """Associate a volume type with specific qos specs.
 
@@ -134,6 +141,7 @@ class QoSSpecsManager(base.ManagerWithFind):
             (base.getid(qos_specs), vol_type_id))
         return common_base.TupleWithMeta((resp, body), resp)
 
+    @base.invalidates('qos_specs', 'volume_types')
     def disassociate(self, qos_specs, vol_type_id):
         """Disassociate qos specs from volume type.
 
@@ -145,6 +153,7 @@ class QoSSpecsManager(base.ManagerWithFind):
             (base.getid(qos_specs), vol_type_id))
         return common_base.TupleWithMeta((resp, body), resp)
 
+    @base.invalidates('qos_specs', 'volume_types')
     def disassociate_all(self, qos_specs):
         """Disassociate all entities from specific qos specs.
 
@@ -14,6 +14,8 @@
 
 from cinderclient import api_versions
 from cinderclient import base
+from cinderclient import cache
+from cinderclient import exceptions
 
 
 class ResourceFilter(base.Resource):
@@ -28,6 +30,12 @@ class ResourceFilterManager(base.ManagerWithFind):
 
     resource_class = ResourceFilter
 
+    def __init__(self, api):
+        super(ResourceFilterManager, self).__init__(api)
+        # NOTE: get_filters() uses this cache when the client has none.
+        self._catalog_cache = cache.CatalogCache()
+
+    @base.cached('resource_filters')
     @api_versions.wraps('3.33')
     def list(self, resource=None):
         """List all resource filters."""
@@ -35,3 +43,35 @@ class ResourceFilterManager(base.ManagerWithFind):
         if resource is not None:
             url += '?resource=%s' % resource
         return self._list(url, "resource_filters")
+
+    def get_filters(self, resource):
+        """Get the filters the server accepts for a resource.
+
+        All the resource filters are read through :meth:`list` and kept in
+        the catalog cache of the client, or in one of this manager when the
+        client has none, see :class:`cinderclient.cache.CatalogCache`. An
+        empty set is returned before microversion 3.33 or when the filters
+        can't be retrieved. It is only cached when the server lacks the API,
+        other errors are retried by the next call.
+
+        :param resource: resource name, e.g. ``volume`` or ``snapshot``.
+        :rtype: frozenset
+        """
+        if not self.api_version.matches(base.RESOURCE_FILTERS_VERSION):
+            return frozenset()
+        catalog_cache = self.catalog_cache
+        if catalog_cache is None:
+            catalog_cache = self._catalog_cache
+        key = ('get_filters', self.api_version.ver_major,
+               self.api_version.ver_minor)
+        hit, filters = catalog_cache.get('resource_filters', key)
+        if not hit:
+            try:
+                filters = {f.resource: frozenset(f.filters)
+                           for f in self.list()}
+            except (exceptions.NotFound, exceptions.BadRequest):
+                filters = {}
+            except exceptions.ClientException:
+                return frozenset()
+            catalog_cache.set('resource_filters', key, filters)
+        return filters.get(resource, frozenset())
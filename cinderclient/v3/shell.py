@@ -18,8 +18,6 @@ import argparse
 import collections
 import os
 
-from oslo_utils import strutils
-
 import cinderclient
 from cinderclient import api_versions
 from cinderclient import base
@@ -30,6 +28,8 @@ from cinderclient import utils
 from cinderclient.v3.shell_base import *  # noqa
 from cinderclient.v3.shell_base import CheckSizeArgForCreate
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+
 FILTER_DEPRECATED = ("This option is deprecated and will be removed in "
                      "newer release. Please use '--filters' option which "
                      "is introduced since 3.33 instead.")
@@ -325,6 +325,10 @@ RESET_STATE_RESOURCES = {'volume': utils.find_volume,
                          'snapshot': shell_utils.find_volume_snapshot,
                          'group': shell_utils.find_group,
                          'group-snapshot': shell_utils.find_group_snapshot}
+RESET_STATE_MANAGERS = {'volume': 'volumes',
+                        'backup': 'backups',
+                        'snapshot': 'volume_snapshots',
+                        'group-snapshot': 'group_snapshots'}
 
 
 @utils.arg('--group_id',
@@ -551,6 +555,7 @@ def do_list(cs, args):
                  'status of the volume in the DataBase that indicates the '
                  'volume is source or destination of volume migration, '
                  'with no regard to the actual status.'))
+@shell_utils.parallel_arg
 def do_reset_state(cs, args):
     """Explicitly updates the entity state in the Cinder database.
 
@@ -568,10 +573,23 @@ def do_reset_state(cs, args):
     if args.type == 'volume':
         argument += (args.attach_status, migration_status)
 
-    for entity in args.entity:
-        try:
-            collector(cs, entity).reset_state(*argument)
-        except Exception as e:
+    if args.type in RESET_STATE_MANAGERS:
+        manager = getattr(cs, RESET_STATE_MANAGERS[args.type])
+        entities = utils.find_resources(manager, args.entity)
+    else:
+        # Groups are looked up with is_group, one at a time.
+        entities = None
+
+    def reset_state(entity):
+        if entities is None:
+            resource = collector(cs, entity)
+        else:
+            resource = entities[entity]
+        resource.reset_state(*argument)
+
+    for entity, e in shell_utils.for_each(reset_state, args.entity,
+                                          args.parallel):
+        if e is not None:
             print(e)
             failure_count += 1
             msg = "Reset state for entity %s failed: %s" % (entity, e)
@@ -741,8 +759,8 @@ def do_create(cs, args):
 
     if args.poll:
         timeout_period = os.environ.get("POLL_TIMEOUT_PERIOD", 3600)
-        shell_utils._poll_for_status(
-            cs.volumes.get, volume.id, info, 'creating', ['available'],
+        shell_utils.wait_for_status(
+            cs.volumes, volume, info, 'creating', ['available'],
             timeout_period, cs.client.global_request_id, cs.messages)
         volume = cs.volumes.get(volume.id)
         info.update(volume._info)
@@ -1573,13 +1591,16 @@ def do_group_create_from_src(cs, args):
                 'If the group is not empty, the delete-volumes '
                 'flag is required for it to be deleted. If True, '
                 'all volumes in the group will also be deleted.')
+@shell_utils.parallel_arg
 def do_group_delete(cs, args):
     """Removes one or more groups."""
     failure_count = 0
-    for group in args.group:
-        try:
-            shell_utils.find_group(cs, group).delete(args.delete_volumes)
-        except Exception as e:
+
+    def delete(group):
+        shell_utils.find_group(cs, group).delete(args.delete_volumes)
+
+    for group, e in shell_utils.for_each(delete, args.group, args.parallel):
+        if e is not None:
             failure_count += 1
             print("Delete for group %s failed: %s" %
                   (group, e))
@@ -1797,9 +1818,11 @@ def do_group_snapshot_create(cs, args):
 def do_group_snapshot_delete(cs, args):
     """Removes one or more group snapshots."""
     failure_count = 0
+    group_snapshots = utils.find_resources(cs.group_snapshots,
+                                           args.group_snapshot)
     for group_snapshot in args.group_snapshot:
         try:
-            shell_utils.find_group_snapshot(cs, group_snapshot).delete()
+            group_snapshots[group_snapshot].delete()
         except Exception as e:
             failure_count += 1
             print("Delete for group snapshot %s failed: %s" %
@@ -2032,13 +2055,18 @@ def do_message_show(cs, args):
 @utils.arg('message',
            metavar='<message>', nargs='+',
            help='ID of one or more message to be deleted.')
+@shell_utils.parallel_arg
 def do_message_delete(cs, args):
     """Removes one or more messages."""
     failure_count = 0
-    for message in args.message:
-        try:
-            shell_utils.find_message(cs, message).delete()
-        except Exception as e:
+    messages = utils.find_resources(cs.messages, args.message)
+
+    def delete(message):
+        messages[message].delete()
+
+    for message, e in shell_utils.for_each(delete, args.message,
+                                           args.parallel):
+        if e is not None:
             failure_count += 1
             print("Delete for message %s failed: %s" % (message, e))
     if failure_count == len(args.message):
@@ -2567,10 +2595,19 @@ def do_attachment_update(cs, args):
 @utils.arg('attachment',
            metavar='<attachment>', nargs='+',
            help='ID of attachment or attachments to delete.')
+@shell_utils.parallel_arg
 def do_attachment_delete(cs, args):
     """Delete an attachment for a cinder volume."""
-    for attachment in args.attachment:
-        cs.attachments.delete(attachment)
+    failure_count = 0
+    for attachment, e in shell_utils.for_each(cs.attachments.delete,
+                                              args.attachment, args.parallel):
+        if e is not None:
+            failure_count += 1
+            print("Delete for attachment %s failed: %s" % (attachment, e))
+    if failure_count:
+        raise exceptions.CommandError("Unable to delete %d of the %d "
+                                      "specified attachments." %
+                                      (failure_count, len(args.attachment)))
 
 
 @api_versions.wraps('3.44')
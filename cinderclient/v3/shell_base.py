@@ -19,14 +19,14 @@ import collections
 import copy
 import os
 
-from oslo_utils import strutils
-
 from cinderclient import base
 from cinderclient import exceptions
 from cinderclient import shell_utils
 from cinderclient import utils
 from cinderclient.v3 import availability_zones
 
+strutils = utils.lazy_import('oslo_utils.strutils')
+
 
 def _translate_attachments(info):
     attachments = []
@@ -335,14 +335,19 @@ def do_create(cs, args):
 @utils.arg('volume',
            metavar='<volume>', nargs='+',
            help='Name or ID of volume or volumes to delete.')
+@shell_utils.parallel_arg
 def do_delete(cs, args):
     """Removes one or more volumes."""
     failure_count = 0
-    for volume in args.volume:
-        try:
-            utils.find_volume(cs, volume).delete(cascade=args.cascade)
+    volumes = utils.find_resources(cs.volumes, args.volume)
+
+    def delete(volume):
+        volumes[volume].delete(cascade=args.cascade)
+
+    for volume, e in shell_utils.for_each(delete, args.volume, args.parallel):
+        if e is None:
             print("Request to delete volume %s has been accepted." % (volume))
-        except Exception as e:
+        else:
             failure_count += 1
             print("Delete for volume %s failed: %s" % (volume, e))
     if failure_count == len(args.volume):
@@ -353,13 +358,18 @@ def do_delete(cs, args):
 @utils.arg('volume',
            metavar='<volume>', nargs='+',
            help='Name or ID of volume or volumes to delete.')
+@shell_utils.parallel_arg
 def do_force_delete(cs, args):
     """Attempts force-delete of volume, regardless of state."""
     failure_count = 0
-    for volume in args.volume:
-        try:
-            utils.find_volume(cs, volume).force_delete()
-        except Exception as e:
+    volumes = utils.find_resources(cs.volumes, args.volume)
+
+    def force_delete(volume):
+        volumes[volume].force_delete()
+
+    for volume, e in shell_utils.for_each(force_delete, args.volume,
+                                          args.parallel):
+        if e is not None:
             failure_count += 1
             print("Delete for volume %s failed: %s" % (volume, e))
     if failure_count == len(args.volume):
@@ -403,11 +413,11 @@ def do_reset_state(cs, args):
         # Nothing specified, default to resetting state
         args.state = 'available'
 
+    volumes = utils.find_resources(cs.volumes, args.volume)
     for volume in args.volume:
         try:
-            utils.find_volume(cs, volume).reset_state(args.state,
-                                                      args.attach_status,
-                                                      migration_status)
+            volumes[volume].reset_state(args.state, args.attach_status,
+                                        migration_status)
         except Exception as e:
             failure_flag = True
             msg = "Reset state for volume %s failed: %s" % (volume, e)
@@ -603,14 +613,19 @@ def do_snapshot_show(cs, args):
            help='Allows deleting snapshot of a volume '
            'when its status is other than "available" or "error". '
            'Default=False.')
+@shell_utils.parallel_arg
 def do_snapshot_delete(cs, args):
     """Removes one or more snapshots."""
     failure_count = 0
 
-    for snapshot in args.snapshot:
-        try:
-            shell_utils.find_volume_snapshot(cs, snapshot).delete(args.force)
-        except Exception as e:
+    snapshots = utils.find_resources(cs.volume_snapshots, args.snapshot)
+
+    def delete(snapshot):
+        snapshots[snapshot].delete(args.force)
+
+    for snapshot, e in shell_utils.for_each(delete, args.snapshot,
+                                            args.parallel):
+        if e is not None:
             failure_count += 1
             print("Delete for snapshot %s failed: %s" % (snapshot, e))
     if failure_count == len(args.snapshot):
@@ -666,10 +681,10 @@ def do_snapshot_reset_state(cs, args):
 
     single = (len(args.snapshot) == 1)
 
+    snapshots = utils.find_resources(cs.volume_snapshots, args.snapshot)
     for snapshot in args.snapshot:
         try:
-            shell_utils.find_volume_snapshot(
-                cs, snapshot).reset_state(args.state)
+            snapshots[snapshot].reset_state(args.state)
         except Exception as e:
             failure_count += 1
             msg = "Reset state for snapshot %s failed: %s" % (snapshot, e)
@@ -1221,14 +1236,19 @@ def do_backup_list(cs, args):
            'Default=False.')
 @utils.arg('backup', metavar='<backup>', nargs='+',
            help='Name or ID of backup(s) to delete.')
+@shell_utils.parallel_arg
 def do_backup_delete(cs, args):
     """Removes one or more backups."""
     failure_count = 0
-    for backup in args.backup:
-        try:
-            shell_utils.find_backup(cs, backup).delete(args.force)
+    backups = utils.find_resources(cs.backups, args.backup)
+
+    def delete(backup):
+        backups[backup].delete(args.force)
+
+    for backup, e in shell_utils.for_each(delete, args.backup, args.parallel):
+        if e is None:
             print("Request to delete backup %s has been accepted." % (backup))
-        except Exception as e:
+        else:
             failure_count += 1
             print("Delete for backup %s failed: %s" % (backup, e))
     if failure_count == len(args.backup):
@@ -1308,9 +1328,10 @@ def do_backup_reset_state(cs, args):
 
     single = (len(args.backup) == 1)
 
+    backups = utils.find_resources(cs.backups, args.backup)
     for backup in args.backup:
         try:
-            shell_utils.find_backup(cs, backup).reset_state(args.state)
+            backups[backup].reset_state(args.state)
             print("Request to update backup '%s' has been accepted." % backup)
         except Exception as e:
             failure_count += 1
@@ -1350,14 +1371,18 @@ def do_transfer_create(cs, args):
 
 @utils.arg('transfer', metavar='<transfer>', nargs='+',
            help='Name or ID of transfer to delete.')
+@shell_utils.parallel_arg
 def do_transfer_delete(cs, args):
     """Undoes a transfer."""
     failure_count = 0
-    for t in args.transfer:
-        try:
-            transfer = shell_utils.find_transfer(cs, t)
-            transfer.delete()
-        except Exception as e:
+    transfers = utils.find_resources(cs.transfers, args.transfer)
+
+    def delete(t):
+        transfer = transfers[t]
+        transfer.delete()
+
+    for t, e in shell_utils.for_each(delete, args.transfer, args.parallel):
+        if e is not None:
             failure_count += 1
             print("Delete for volume transfer %s failed: %s" % (t, e))
     if failure_count == len(args.transfer):
@@ -2090,10 +2115,11 @@ def do_consisgroup_create_from_src(cs, args):
 def do_consisgroup_delete(cs, args):
     """Removes one or more consistency groups."""
     failure_count = 0
+    consistencygroups = utils.find_resources(cs.consistencygroups,
+                                             args.consistencygroup)
     for consistencygroup in args.consistencygroup:
         try:
-            shell_utils.find_consistencygroup(
-                cs, consistencygroup).delete(args.force)
+            consistencygroups[consistencygroup].delete(args.force)
         except Exception as e:
             failure_count += 1
             print("Delete for consistency group %s failed: %s" %
@@ -2227,9 +2253,10 @@ def do_cgsnapshot_create(cs, args):
 def do_cgsnapshot_delete(cs, args):
     """Removes one or more cgsnapshots."""
     failure_count = 0
+    cgsnapshots = utils.find_resources(cs.cgsnapshots, args.cgsnapshot)
     for cgsnapshot in args.cgsnapshot:
         try:
-            shell_utils.find_cgsnapshot(cs, cgsnapshot).delete()
+            cgsnapshots[cgsnapshot].delete()
         except Exception as e:
             failure_count += 1
             print("Delete for cgsnapshot %s failed: %s" % (cgsnapshot, e))
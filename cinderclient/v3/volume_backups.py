@@ -43,6 +43,7 @@ class VolumeBackup(base.Resource):
 class VolumeBackupManager(base.ManagerWithFind):
     """Manage :class:`VolumeBackup` resources."""
     resource_class = VolumeBackup
+    filter_resource = 'backup'
 
     @api_versions.wraps("3.9")
     def update(self, backup, **kwargs):
@@ -152,16 +153,58 @@ class VolumeBackupManager(base.ManagerWithFind):
         return self._get("/backups/%s" % backup_id, "backup")
 
     def list(self, detailed=True, search_opts=None, marker=None, limit=None,
-             sort=None):
+             sort=None, fields=None, raw=False):
         """Get a list of all volume backups.
 
-        :rtype: list of :class:`VolumeBackup`
+        :param fields: Keys to keep in each record, the other ones are
+                       dropped as each page is received.
+        :param raw: Return plain dicts instead of backup objects.
+        :rtype: list of :class:`VolumeBackup` or of dict
+        """
+        resource_type = "backups"
+        url = self._build_list_url(resource_type, detailed=detailed,
+                                   search_opts=search_opts, marker=marker,
+                                   limit=limit, sort=sort)
+        return self._list(url, resource_type, limit=limit, fields=fields,
+                          raw=raw)
+
+    def iter(self, detailed=True, search_opts=None, marker=None, limit=None,
+             sort=None, pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over volume backups, fetching one page at a time.
+
+        :param pages: Yield whole pages instead of backups.
+        :param prefetch: Number of pages to fetch ahead in background while
+                         the current one is consumed.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Yield plain dicts, see :meth:`list`.
+        :rtype: generator of :class:`VolumeBackup` or of
+                :class:`cinderclient.base.ListPage`
         """
         resource_type = "backups"
         url = self._build_list_url(resource_type, detailed=detailed,
                                    search_opts=search_opts, marker=marker,
                                    limit=limit, sort=sort)
-        return self._list(url, resource_type, limit=limit)
+        return self._iter(url, resource_type, limit=limit, pages=pages,
+                          prefetch=prefetch, fields=fields, raw=raw)
+
+    def parallel_list(self, detailed=True, search_opts=None, sort=None,
+                      page_size=None, workers=None, fields=None, raw=False):
+        """List all backups, fetching pages concurrently.
+
+        The total is requested first (with ``with_count``, microversion 3.45
+        and later) and the remaining pages are then fetched in parallel
+        using ``offset``. Without a total, pages are followed one by one.
+
+        :param page_size: Number of backups requested per page.
+        :param workers: Number of pages fetched concurrently.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Return plain dicts, see :meth:`list`.
+        :rtype: list of :class:`VolumeBackup`
+        """
+        return self._parallel_list("backups", detailed=detailed,
+                                   search_opts=search_opts, sort=sort,
+                                   page_size=page_size, workers=workers,
+                                   with_count=True, fields=fields, raw=raw)
 
     def delete(self, backup, force=False):
         """Delete a volume backup.
@@ -15,11 +15,12 @@
 
 """Volume snapshot interface (v3 extension)."""
 
-from oslo_utils import strutils
-
 from cinderclient import api_versions
 from cinderclient.apiclient import base as common_base
 from cinderclient import base
+from cinderclient import utils
+
+strutils = utils.lazy_import('oslo_utils.strutils')
 
 MV_3_66_FORCE_FLAG_ERROR = (
     "Since microversion 3.66 of the Block Storage API,  the 'force' option is "
@@ -87,6 +88,7 @@ class Snapshot(base.Resource):
 class SnapshotManager(base.ManagerWithFind):
     """Manage :class:`Snapshot` resources."""
     resource_class = Snapshot
+    filter_resource = 'snapshot'
 
     @api_versions.wraps("3.0", "3.65")
     def create(self, volume_id, force=False,
@@ -174,16 +176,58 @@ class SnapshotManager(base.ManagerWithFind):
         return self._get("/snapshots/%s" % snapshot_id, "snapshot")
 
     def list(self, detailed=True, search_opts=None, marker=None, limit=None,
-             sort=None):
+             sort=None, fields=None, raw=False):
         """Get a list of all snapshots.
 
-        :rtype: list of :class:`Snapshot`
+        :param fields: Keys to keep in each record, the other ones are
+                       dropped as each page is received.
+        :param raw: Return plain dicts instead of :class:`Snapshot` objects.
+        :rtype: list of :class:`Snapshot` or of dict
         """
         resource_type = "snapshots"
         url = self._build_list_url(resource_type, detailed=detailed,
                                    search_opts=search_opts, marker=marker,
                                    limit=limit, sort=sort)
-        return self._list(url, resource_type, limit=limit)
+        return self._list(url, resource_type, limit=limit, fields=fields,
+                          raw=raw)
+
+    def iter(self, detailed=True, search_opts=None, marker=None, limit=None,
+             sort=None, pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over snapshots, fetching one page at a time.
+
+        :param pages: Yield whole pages instead of snapshots.
+        :param prefetch: Number of pages to fetch ahead in background while
+                         the current one is consumed.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Yield plain dicts, see :meth:`list`.
+        :rtype: generator of :class:`Snapshot` or of
+                :class:`cinderclient.base.ListPage`
+        """
+        resource_type = "snapshots"
+        url = self._build_list_url(resource_type, detailed=detailed,
+                                   search_opts=search_opts, marker=marker,
+                                   limit=limit, sort=sort)
+        return self._iter(url, resource_type, limit=limit, pages=pages,
+                          prefetch=prefetch, fields=fields, raw=raw)
+
+    def parallel_list(self, detailed=True, search_opts=None, sort=None,
+                      page_size=None, workers=None, fields=None, raw=False):
+        """List all snapshots, fetching pages concurrently.
+
+        The total is requested first (with ``with_count``, microversion 3.45
+        and later) and the remaining pages are then fetched in parallel
+        using ``offset``. Without a total, pages are followed one by one.
+
+        :param page_size: Number of snapshots requested per page.
+        :param workers: Number of pages fetched concurrently.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Return plain dicts, see :meth:`list`.
+        :rtype: list of :class:`Snapshot`
+        """
+        return self._parallel_list("snapshots", detailed=detailed,
+                                   search_opts=search_opts, sort=sort,
+                                   page_size=page_size, workers=workers,
+                                   with_count=True, fields=fields, raw=raw)
 
     def delete(self, snapshot, force=False):
         """Delete a snapshot.
@@ -34,11 +34,13 @@ class VolumeTypeAccessManager(base.ManagerWithFind):
             '/types/%s/os-volume-type-access' % base.getid(volume_type),
             'volume_type_access')
 
+    @base.invalidates('volume_types')
     def add_project_access(self, volume_type, project):
         """Add a project to the given volume type access list."""
         info = {'project': project}
         return self._action('addProjectAccess', volume_type, info)
 
+    @base.invalidates('volume_types')
     def remove_project_access(self, volume_type, project):
         """Remove a project from the given volume type access list."""
         info = {'project': project}
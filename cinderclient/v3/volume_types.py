@@ -44,6 +44,7 @@ class VolumeType(base.Resource):
             base.getid(self))
         return body["extra_specs"]
 
+    @base.invalidates('volume_types')
     def set_keys(self, metadata):
         """Set extra specs on a volume type.
 
@@ -57,6 +58,7 @@ class VolumeType(base.Resource):
             "extra_specs",
             return_raw=True)
 
+    @base.invalidates('volume_types')
     def unset_keys(self, keys):
         """Unset extra specs on a volue type.
 
@@ -82,6 +84,7 @@ class VolumeTypeManager(base.ManagerWithFind):
     """Manage :class:`VolumeType` resources."""
     resource_class = VolumeType
 
+    @base.cached('volume_types')
     def list(self, search_opts=None, is_public=None):
         """Lists all volume types.
 
@@ -105,6 +108,7 @@ class VolumeTypeManager(base.ManagerWithFind):
         query_string = "?%s" % parse.urlencode(search_opts)
         return self._list("/types%s" % query_string, "volume_types")
 
+    @base.cached('volume_types')
     def get(self, volume_type):
         """Get a specific volume type.
 
@@ -113,6 +117,7 @@ class VolumeTypeManager(base.ManagerWithFind):
         """
         return self._get("/types/%s" % base.getid(volume_type), "volume_type")
 
+    @base.cached('volume_types')
     def default(self):
         """Get the default volume type.
 
@@ -120,6 +125,7 @@ class VolumeTypeManager(base.ManagerWithFind):
         """
         return self._get("/types/default", "volume_type")
 
+    @base.invalidates('volume_types')
     def delete(self, volume_type):
         """Deletes a specific volume_type.
 
@@ -127,6 +133,7 @@ class VolumeTypeManager(base.ManagerWithFind):
         """
         return self._delete("/types/%s" % base.getid(volume_type))
 
+    @base.invalidates('volume_types')
     def create(self, name, description=None, is_public=True):
         """Creates a volume type.
 
@@ -146,6 +153,7 @@ class VolumeTypeManager(base.ManagerWithFind):
 
         return self._create("/types", body, "volume_type")
 
+    @base.invalidates('volume_types')
     def update(self, volume_type, name=None, description=None, is_public=None):
         """Update the name and/or description for a volume type.
 
@@ -193,6 +193,7 @@ class Volume(base.Resource):
 class VolumeManager(base.ManagerWithFind):
     """Manage :class:`Volume` resources."""
     resource_class = Volume
+    filter_resource = 'volume'
 
     def get(self, volume_id):
         """Get a volume.
@@ -203,7 +204,7 @@ class VolumeManager(base.ManagerWithFind):
         return self._get("/volumes/%s" % volume_id, "volume")
 
     def list(self, detailed=True, search_opts=None, marker=None, limit=None,
-             sort=None):
+             sort=None, fields=None, raw=False):
         """Lists all volumes.
 
         :param detailed: Whether to return detailed volume info.
@@ -212,14 +213,57 @@ class VolumeManager(base.ManagerWithFind):
                        list than that represented by this volume id.
         :param limit: Maximum number of volumes to return.
         :param sort: Sort information
-        :rtype: list of :class:`Volume`
+        :param fields: Keys of the volume info to keep, e.g.
+                       ``['id', 'status', 'size']``; the other ones are
+                       dropped as each page is received.
+        :param raw: Return plain dicts instead of :class:`Volume` objects.
+        :rtype: list of :class:`Volume` or of dict
         """
 
         resource_type = "volumes"
         url = self._build_list_url(resource_type, detailed=detailed,
                                    search_opts=search_opts, marker=marker,
                                    limit=limit, sort=sort)
-        return self._list(url, resource_type, limit=limit)
+        return self._list(url, resource_type, limit=limit, fields=fields,
+                          raw=raw)
+
+    def iter(self, detailed=True, search_opts=None, marker=None, limit=None,
+             sort=None, pages=False, prefetch=None, fields=None, raw=False):
+        """Iterate over volumes, fetching one page at a time.
+
+        Takes the same arguments as :meth:`list`.
+
+        :param pages: Yield whole pages instead of volumes.
+        :param prefetch: Number of pages to fetch ahead in background while
+                         the current one is consumed.
+        :rtype: generator of :class:`Volume` or of
+                :class:`cinderclient.base.ListPage`
+        """
+        resource_type = "volumes"
+        url = self._build_list_url(resource_type, detailed=detailed,
+                                   search_opts=search_opts, marker=marker,
+                                   limit=limit, sort=sort)
+        return self._iter(url, resource_type, limit=limit, pages=pages,
+                          prefetch=prefetch, fields=fields, raw=raw)
+
+    def parallel_list(self, detailed=True, search_opts=None, sort=None,
+                      page_size=None, workers=None, fields=None, raw=False):
+        """List all volumes, fetching pages concurrently.
+
+        The total is requested first (with ``with_count``, microversion 3.45
+        and later) and the remaining pages are then fetched in parallel
+        using ``offset``. Without a total, pages are followed one by one.
+
+        :param page_size: Number of volumes requested per page.
+        :param workers: Number of pages fetched concurrently.
+        :param fields: Keys to keep in each record, see :meth:`list`.
+        :param raw: Return plain dicts, see :meth:`list`.
+        :rtype: list of :class:`Volume`
+        """
+        return self._parallel_list("volumes", detailed=detailed,
+                                   search_opts=search_opts, sort=sort,
+                                   page_size=page_size, workers=workers,
+                                   with_count=True, fields=fields, raw=raw)
 
     def delete(self, volume, cascade=False):
         """Delete a volume.
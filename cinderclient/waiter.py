@@ -0,0 +1,216 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Wait for many resources of one type to reach a final status."""
+
+import collections
+import random
+import time
+
+from cinderclient import exceptions
+
+# Below this number of pending resources, they are fetched one by one instead
+# of being looked up in a listing.
+LIST_THRESHOLD = 10
+
+READY = 'ready'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+
+
+class WaitResult(object):
+    """Outcome of waiting for one resource.
+
+    :ivar id: ID of the resource
+    :ivar resource: last version of the resource that was fetched, or None
+    :ivar state: READY, ERROR or TIMEOUT
+    :ivar message: user message explaining an error, or None
+    """
+
+    def __init__(self, id, resource, state, message=None):
+        self.id = id
+        self.resource = resource
+        self.state = state
+        self.message = message
+
+    def __repr__(self):
+        return "<WaitResult %s: %s>" % (self.id, self.state)
+
+
+class Waiter(object):
+    """Poll the status of many resources of one manager at once.
+
+    Each poll cycle looks the pending resources up in a single listing of
+    the manager, newest first, which stops as soon as all of them were seen.
+    The resources that are not listed, and all of them when there are fewer
+    than ``list_threshold``, are fetched one by one. The poll interval grows
+    by ``backoff`` while no status changes, up to ``max_interval``, and is
+    randomized by ``jitter`` so that concurrent waiters don't poll in sync::
+
+        >>> waiter = Waiter(cs.volumes, messages=cs.messages)
+        >>> for result in waiter.wait(volumes, timeout=600):
+        ...     print(result.id, result.state, result.message)
+
+    :param manager: manager of the resources, with ``get()`` and ``iter()``
+                    or ``list()`` methods
+    :param ready_states: statuses meaning success
+    :param error_states: statuses meaning failure
+    :param status_field: attribute holding the status of the resources
+    :param search_opts: filters of the listing, to narrow it down
+    :param messages: :class:`cinderclient.v3.messages.MessageManager` used to
+                     explain errors, or None
+    :param request_id: request ID of the messages about the resources that
+                       do not carry the IDs of the requests that made them
+    """
+
+    def __init__(self, manager, ready_states=('available',),
+                 error_states=('error',), status_field='status',
+                 search_opts=None, messages=None, request_id=None,
+                 interval=2, max_interval=30, backoff=1.5, jitter=0.1,
+                 list_threshold=LIST_THRESHOLD):
+        self.manager = manager
+        self.ready_states = set(s.lower() for s in ready_states)
+        self.error_states = set(s.lower() for s in error_states)
+        self.status_field = status_field
+        self.search_opts = search_opts
+        self.messages = messages
+        self.request_id = request_id
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.list_threshold = list_threshold
+
+    def wait(self, resources, timeout=3600):
+        """Wait until each resource has a final status or times out.
+
+        :param resources: resources or resource IDs
+        :param timeout: seconds after which the pending resources time out
+        :returns: list of :class:`WaitResult`, in the order of ``resources``
+        """
+        pending = collections.OrderedDict()
+        for resource in resources:
+            if hasattr(resource, 'id'):
+                pending[resource.id] = resource
+            else:
+                pending[resource] = None
+        ids = list(pending)
+        request_ids = dict((res_id, self._get_request_id(resource))
+                           for res_id, resource in pending.items())
+        statuses = {}
+        results = {}
+        interval = self.interval
+        deadline = time.monotonic() + timeout
+
+        while pending:
+            delay = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            time.sleep(max(0, min(delay, deadline - time.monotonic())))
+
+            changed = False
+            failed = []
+            for res_id, resource in self._poll(list(pending)).items():
+                if isinstance(resource, exceptions.NotFound):
+                    results[res_id] = WaitResult(res_id, pending.pop(res_id),
+                                                 ERROR, str(resource))
+                    changed = True
+                    continue
+                pending[res_id] = resource
+                status = getattr(resource, self.status_field, None)
+                status = status.lower() if status else status
+                if status != statuses.get(res_id):
+                    statuses[res_id] = status
+                    changed = True
+                if status in self.ready_states:
+                    results[res_id] = WaitResult(res_id, pending.pop(res_id),
+                                                 READY)
+                elif status in self.error_states:
+                    failed.append(pending.pop(res_id))
+
+            if failed:
+                faults = self._get_fault_messages(failed, request_ids)
+                for resource in failed:
+                    results[resource.id] = WaitResult(
+                        resource.id, resource, ERROR, faults.get(resource.id))
+
+            if pending and time.monotonic() >= deadline:
+                for res_id, resource in pending.items():
+                    results[res_id] = WaitResult(res_id, resource, TIMEOUT)
+                break
+
+            if changed:
+                interval = self.interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+
+        return [results[res_id] for res_id in ids]
+
+    def _poll(self, ids):
+        """Return a dict mapping each ID to its resource or NotFound error."""
+        found = {}
+        if len(ids) >= self.list_threshold:
+            wanted = set(ids)
+            for resource in self._listing():
+                if resource.id in wanted:
+                    found[resource.id] = resource
+                    if len(found) == len(wanted):
+                        break
+        for res_id in ids:
+            if res_id not in found:
+                try:
+                    found[res_id] = self.manager.get(res_id)
+                except exceptions.NotFound as e:
+                    found[res_id] = e
+        return found
+
+    def _listing(self):
+        if hasattr(self.manager, 'iter'):
+            return self.manager.iter(search_opts=self.search_opts,
+                                     sort='created_at:desc')
+        return self.manager.list(search_opts=self.search_opts)
+
+    def _get_request_id(self, resource):
+        request_ids = getattr(resource, 'request_ids', None)
+        if isinstance(request_ids, list) and request_ids:
+            return request_ids[0]
+        return self.request_id
+
+    def _get_fault_messages(self, resources, request_ids):
+        """Map resource IDs to the user message explaining their error.
+
+        The messages are listed once per request that created resources,
+        or once per resource when the request is unknown.
+        """
+        if self.messages is None:
+            return {}
+        by_request = collections.defaultdict(list)
+        for resource in resources:
+            by_request[request_ids[resource.id]].append(resource.id)
+
+        faults = {}
+        for request_id, res_ids in by_request.items():
+            if request_id:
+                searches = [{'request_id': request_id}]
+            else:
+                searches = [{'resource_uuid': res_id} for res_id in res_ids]
+            for search_opts in searches:
+                try:
+                    messages = self.messages.list(search_opts=search_opts)
+                except (exceptions.ClientException,
+                        exceptions.VersionNotFoundForAPIMethod):
+                    # Messages are only available since 3.3.
+                    continue
+                for message in messages:
+                    res_id = getattr(message, 'resource_uuid', None)
+                    if len(res_ids) == 1:
+                        res_id = res_ids[0]
+                    faults.setdefault(res_id, message.user_message)
+        return faults
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the time taken to build a v3 client, alone, with one manager used
+and with every manager used, which is what building a client used to cost.
+
+Usage: tools/bench_client_construction.py [--count N]
+"""
+
+import argparse
+import timeit
+
+from keystoneauth1 import session
+
+from cinderclient.v3 import client
+
+MANAGERS = [name for name, value in vars(client.Client).items()
+            if isinstance(value, client._LazyManager)]
+
+
+def construct(sess):
+    client.Client(session=sess)
+
+
+def construct_and_use_volumes(sess):
+    client.Client(session=sess).volumes
+
+
+def construct_and_use_all(sess):
+    cs = client.Client(session=sess)
+    for name in MANAGERS:
+        getattr(cs, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000,
+                        help='Number of clients built per case.')
+    args = parser.parse_args()
+
+    sess = session.Session()
+    for func in (construct, construct_and_use_volumes, construct_and_use_all):
+        # Import the manager modules before timing.
+        func(sess)
+        best = min(timeit.repeat(lambda: func(sess), number=args.count,
+                                 repeat=5))
+        print('%-28s %8.1f us/client' % (func.__name__,
+                                         best / args.count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
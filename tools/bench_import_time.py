@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the import time of the client modules with ``python -X importtime``
+and the time ``cinder --version`` takes.
+
+The best of several runs is reported. With --max-ms the script fails when a
+module takes longer to import, so that it can guard against regressions.
+
+Usage: tools/bench_import_time.py [--repeat N] [--top N] [--max-ms MS]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+MODULES = ['cinderclient', 'cinderclient.client', 'cinderclient.v3.client',
+           'cinderclient.shell']
+VERSION_CMD = ("import sys; sys.argv[1:] = ['--version']; "
+               "from cinderclient import shell; shell.main()")
+
+
+def import_times(module):
+    """Return {module: (self us, cumulative us)} for one fresh import."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True,
+        universal_newlines=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def version_time():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', VERSION_CMD],
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of runs per measurement.')
+    parser.add_argument('--top', type=int, default=0,
+                        help='Also show the modules with the highest self '
+                             'import time.')
+    parser.add_argument('--max-ms', type=float,
+                        help='Fail if a module takes longer to import.')
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[module][1])
+        cumulative_ms = best[module][1] / 1000.0
+        print('import %-24s %8.1f ms' % (module, cumulative_ms))
+        if args.top:
+            for name, (self_us, _) in sorted(
+                    best.items(), key=lambda item: -item[1][0])[:args.top]:
+                print('    %-40s %8.1f ms self' % (name, self_us / 1000.0))
+        if args.max_ms is not None and cumulative_ms > args.max_ms:
+            failed = True
+
+    best = min(version_time() for _ in range(args.repeat))
+    print('cinder --version %22.1f ms' % (best * 1000))
+
+    if failed:
+        print('Import time exceeds %.1f ms' % args.max_ms)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the time the shell takes to build its argument parser, for a
+single command and for help, which registers every command.
+
+Usage: tools/bench_shell_startup.py [--repeat N] [--command NAME]
+"""
+
+import argparse
+import time
+
+from cinderclient import api_versions
+from cinderclient import shell
+
+
+def measure(repeat, input_args, do_help):
+    version = api_versions.APIVersion(api_versions.MAX_VERSION)
+    timings = []
+    for _ in range(repeat):
+        cinder_shell = shell.OpenStackCinderShell()
+        start = time.perf_counter()
+        cinder_shell.get_subcommand_parser(version, do_help=do_help,
+                                           input_args=input_args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(cinder_shell.subcommands)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Number of parsers built per case.')
+    parser.add_argument('--command', default='list',
+                        help='Command whose parser is built.')
+    args = parser.parse_args()
+
+    for case, input_args, do_help in (
+            (args.command, [args.command], False),
+            ('help', ['help'], True)):
+        best, count = measure(args.repeat, input_args, do_help)
+        print('%-16s %8.2f ms %5d subparsers' % (case, best * 1000, count))
+
+
+if __name__ == '__main__':
+    main()
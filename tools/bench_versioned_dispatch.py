@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of calling microversioned manager methods and of parsing
+API version strings.
+
+Usage: tools/bench_versioned_dispatch.py [--count N] [--version X.Y]
+"""
+
+import argparse
+import timeit
+
+from cinderclient import api_versions
+from cinderclient import base
+
+
+class BenchManager(base.Manager):
+
+    @api_versions.wraps('3.0', '3.39')
+    def action(self):
+        pass
+
+    @api_versions.wraps('3.40')
+    def action(self):  # noqa: F811
+        pass
+
+
+class FakeAPI(object):
+
+    def __init__(self, api_version):
+        self.api_version = api_version
+        self.client = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='Number of calls per case.')
+    parser.add_argument('--version', default=api_versions.MAX_VERSION,
+                        help='API version of the calls.')
+    args = parser.parse_args()
+
+    manager = BenchManager(FakeAPI(api_versions.APIVersion(args.version)))
+    cases = [
+        ('versioned method call', manager.action),
+        ('APIVersion(%r)' % args.version,
+         lambda: api_versions.APIVersion(args.version)),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.count, repeat=5))
+        print('%-28s %8.3f us/call' % (name, best / args.count * 1e6))
+
+
+if __name__ == '__main__':
+    main()